@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi import status as status_codes
+
+from ...core import llm, logger
+from ...core.admission import admission_controller
+from ...core.metrics import metrics
+from ...services import fleet, manager
+from ...services.session_services import advice as advice_service
+from ...services.session_services import memory as memory_service
+
+log = logger.get_logger(__name__)
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"]
+)
+
+@router.get(
+    "/metrics",
+    summary="프로세스 내 지표 조회",
+    status_code=status_codes.HTTP_200_OK,
+)
+async def get_metrics():
+    return metrics.snapshot()
+
+
+@router.get(
+    "/admission",
+    summary="현재 부하와 성능 저하 수준 조회",
+    status_code=status_codes.HTTP_200_OK,
+)
+async def get_admission_status():
+    return admission_controller.status()
+
+
+@router.get(
+    "/fleet",
+    summary="진행 중인 모든 대화의 참여도, 발화 비율, 메시지 속도, 메모 수, 세션 경과 시간 분포 조회",
+    status_code=status_codes.HTTP_200_OK,
+)
+async def get_fleet_analytics(
+    conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager),
+):
+    try:
+        return fleet.fleet_analytics(conversation_manager.fleet)
+    except ImportError:
+        raise HTTPException(
+            status_code=status_codes.HTTP_501_NOT_IMPLEMENTED,
+            detail="Fleet analytics requires the numpy package.",
+        )
+
+
+@router.get(
+    "/prompt-cache",
+    summary="파이프라인별 프롬프트 캐시 적중률 조회",
+    status_code=status_codes.HTTP_200_OK,
+)
+async def get_prompt_cache_report():
+    return llm.prompt_cache_report()
+
+
+@router.get(
+    "/memory-cascade",
+    summary="메모 생성 캐스케이드(nano -> mini) 승격 비율과 절약한 지연 시간 조회",
+    status_code=status_codes.HTTP_200_OK,
+)
+async def get_memory_cascade_report():
+    return memory_service.cascade_report()
+
+
+@router.post(
+    "/advice-catalog/reload",
+    summary="조언 목록(advice_metadatas.json) 재로딩",
+    status_code=status_codes.HTTP_200_OK,
+)
+async def reload_advice_catalog():
+    reloaded = advice_service.ADVICE_CATALOG.reload(force=True)
+    return {
+        "reloaded": reloaded,
+        "version": advice_service.ADVICE_CATALOG.version,
+    }
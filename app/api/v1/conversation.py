@@ -1,19 +1,26 @@
-import asyncio
 from datetime import datetime
+from typing import Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from starlite import Response, status_codes
+from fastapi import status as status_codes
 
-from ...core import config, logger
+from ...core import cancellation, config, logger
+from ...core.metrics import metrics
+from ...utils import http_utils, json_utils
 from ...schemas.conversation import (
     InitConversationOutput,
     DeleteConversationOutput,
+    ImportConversationOutput,
     UpdateConversationInput,
     UpdateConversationOutput,
+    IngestAudioOutput,
     GetRealtimeMemoryOutput,
+    GetRealtimeMemoryDeltaOutput,
     GetRealtimeAnalysisOutput,
+    GetScoreSeriesOutput,
+    PartnerReactionCounts,
     GetBreaktimeAdviceOutput,
     RecommendBreaktimeAdviceOutput,
     GetFinalReportOutput,
@@ -23,6 +30,8 @@ from ...services.session_services import (
     advice as advice_service,
     memory as memory_service,
     score as score_service,
+    snapshot as snapshot_service,
+    speech as speech_service,
     final_report as final_report_service,
 )
 
@@ -44,7 +53,7 @@ async def init_conversation(
     conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
 ):
     conversation_manager.init_conversation(conversation_id=conversation_id)
-    log.info(f"Conversation initialized: {conversation_id}")
+    log.info("Conversation initialized: %s", conversation_id)
     
     return InitConversationOutput(
         conversation_id=conversation_id,
@@ -63,20 +72,89 @@ async def delete_conversation(
     conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
         )
         
     conversation_manager.delete_conversation(conversation_id=conversation_id)
-    log.info(f"Conversation deleted: {conversation_id}")
+    log.info("Conversation deleted: %s", conversation_id)
     return DeleteConversationOutput(
         conversation_id=conversation_id,
         deleted_at=datetime.utcnow()
     )
 
 
+@router.get(
+    "/{conversation_id}/export",
+    summary="대화 세션 내보내기 (JSONL)",
+    description=(
+        "메시지, 파트너 메모리, 점수, 점수 시계열을 한 줄에 레코드 하나인 JSONL로 스트리밍합니다. "
+        "레코드 순서는 session → message × N → partner_memory → scores → series × M → end입니다."
+    ),
+    response_class=StreamingResponse,
+    status_code=status_codes.HTTP_200_OK,
+)
+async def export_conversation(
+    conversation_id: str,
+    conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
+):
+    if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
+        log.warning("Conversation not found: %s", conversation_id)
+        raise HTTPException(
+            status_code=status_codes.HTTP_404_NOT_FOUND,
+            detail="Conversation not found."
+        )
+
+    c_m = conversation_manager.get_conversation_memory(conversation_id=conversation_id)
+    s_m = conversation_manager.get_conversation_scorer(conversation_id=conversation_id)
+    return StreamingResponse(
+        snapshot_service.iter_encode_session(
+            c_m, s_m, chunk_bytes=config.settings.SESSION_EXPORT_CHUNK_BYTES
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post(
+    "/{conversation_id}/import",
+    response_model=ImportConversationOutput,
+    summary="대화 세션 가져오기 (JSONL)",
+    description=(
+        "export로 내보낸 JSONL을 요청 본문으로 스트리밍하면 LLM 호출 없이 대화 상태를 그대로 복원합니다. "
+        "같은 ID의 대화가 있으면 덮어씁니다."
+    ),
+    status_code=status_codes.HTTP_201_CREATED,
+)
+async def import_conversation(
+    conversation_id: str,
+    request: Request,
+    conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
+):
+    decoder = snapshot_service.SessionStreamDecoder()
+    try:
+        async for line in http_utils.aiter_lines(
+            request.stream(), max_line_bytes=config.settings.SESSION_IMPORT_MAX_LINE_BYTES
+        ):
+            decoder.feed_line(line)
+        c_m, s_m = decoder.finish()
+    except ValueError as e:
+        log.warning("Invalid session stream for %s: %s", conversation_id, e)
+        raise HTTPException(
+            status_code=status_codes.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+    conversation_manager.set_conversation(conversation_id, c_m, s_m)
+    log.info("Conversation imported: %s (%d messages)", conversation_id, len(c_m.messages))
+    return ImportConversationOutput(
+        conversation_id=conversation_id,
+        n_messages=len(c_m.messages),
+        imported_at=datetime.utcnow()
+    )
+
+
 @router.post(
     "/{conversation_id}/messages",
     response_model=UpdateConversationOutput,
@@ -84,11 +162,12 @@ async def delete_conversation(
 )
 async def update_conversation(
     conversation_id: str,
-    request: UpdateConversationInput,
+    body: UpdateConversationInput,
+    request: Request,
     conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
@@ -96,43 +175,153 @@ async def update_conversation(
 
     c_m = conversation_manager.get_conversation_memory(conversation_id=conversation_id)
     s_m = conversation_manager.get_conversation_scorer(conversation_id=conversation_id)
-    c_m.add_message(message=request.message)
-    await asyncio.gather(
-        memory_service.update_partner_memory_pipeline(
-            conversation_memory=c_m
-        ),
-        score_service.update_conversation_scores_pipeline(
-            conversation_scorer=s_m,
-            conversation_memory=c_m
+    c_m.add_message(message=body.message)
+    # 새 메시지(리비전)가 이전 분석을 대체하거나, 연결이 끊기거나, 마감 시간이 지나면 파이프라인을 취소
+    # 취소된 파이프라인은 상태를 바꾸지 않으므로 현재 점수를 그대로 반환
+    await cancellation.pipeline_tracker.run(
+        scope=conversation_id,
+        revision=len(c_m.messages),
+        pipelines={
+            "memory": memory_service.update_partner_memory_pipeline(
+                conversation_memory=c_m
+            ),
+            "score": score_service.update_conversation_scores_pipeline(
+                conversation_scorer=s_m,
+                conversation_memory=c_m
+            ),
+        },
+        supersede=config.settings.CANCEL_SUPERSEDED_PIPELINES,
+        disconnected=(
+            (lambda: cancellation.wait_for_disconnect(request))
+            if config.settings.CANCEL_ON_DISCONNECT else None
         ),
+        deadline=config.settings.REALTIME_PIPELINE_DEADLINE_SECONDS or None,
     )
-    
+
     return UpdateConversationOutput(
         scores=s_m.get_scores()
     )
 
 
+@router.post(
+    "/{conversation_id}/audio",
+    response_model=IngestAudioOutput,
+    summary="음성 스트림으로 대화 메시지 추가",
+    description=(
+        "요청 본문으로 스트리밍되는 오디오에서 발화를 잘라 STT로 변환한 뒤 대화 메시지로 추가합니다. "
+        "pcm_s16le는 16-bit little-endian PCM, opus는 2바이트 big-endian 길이가 앞에 붙은 패킷의 연속입니다. "
+        "스테레오는 채널 0을 '나', 채널 1을 '파트너'의 마이크로 보고, 모노는 speaker로 화자를 지정해야 합니다."
+    ),
+    status_code=status_codes.HTTP_200_OK,
+)
+async def ingest_audio(
+    conversation_id: str,
+    request: Request,
+    encoding: Literal["pcm_s16le", "opus"] = "pcm_s16le",
+    sample_rate: int = Query(16000, ge=8000, le=48000),
+    channels: int = Query(1, ge=1, le=2),
+    speaker: Literal["나", "파트너", "auto"] = "auto",
+    conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
+):
+    if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
+        log.warning("Conversation not found: %s", conversation_id)
+        raise HTTPException(
+            status_code=status_codes.HTTP_404_NOT_FOUND,
+            detail="Conversation not found."
+        )
+
+    c_m = conversation_manager.get_conversation_memory(conversation_id=conversation_id)
+    s_m = conversation_manager.get_conversation_scorer(conversation_id=conversation_id)
+    try:
+        ingestion = speech_service.AudioIngestion(
+            conversation_memory=c_m,
+            conversation_scorer=s_m,
+            sample_rate=sample_rate,
+            channels=channels,
+            encoding=encoding,
+            speaker=None if speaker == "auto" else speaker,
+            conversation_id=conversation_id,
+        )
+    except speech_service.UnsupportedAudioError as e:
+        raise HTTPException(
+            status_code=status_codes.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+    # 처리 대기 중인 발화가 많으면 feed()가 대기하므로 본문을 더 읽지 않음 (backpressure)
+    try:
+        async for chunk in request.stream():
+            await ingestion.feed(chunk)
+        messages = await ingestion.close()
+    except BaseException:
+        await ingestion.abort()
+        raise
+
+    return IngestAudioOutput(
+        messages=messages,
+        n_segments=ingestion.n_segments,
+        audio_seconds=ingestion.audio_seconds,
+        scores=s_m.get_scores()
+    )
+
+
 @router.post(
     "/{conversation_id}/realtime-memory",
-    response_model=GetRealtimeMemoryOutput,
+    response_model=Union[GetRealtimeMemoryOutput, GetRealtimeMemoryDeltaOutput],
     summary="실시간 메모리 조회",
+    description=(
+        "응답의 ETag를 If-None-Match로 보내면 메모가 바뀌지 않은 경우 304를 반환합니다. "
+        "since에 이전 응답의 revision을 지정하면 그 이후 추가된 메모만 반환합니다."
+    ),
     status_code=status_codes.HTTP_200_OK,
+    responses={304: {"description": "Not Modified"}},
 )
 async def get_realtime_memory(
     conversation_id: str,
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
     conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
         )
         
     c_m = conversation_manager.get_conversation_memory(conversation_id=conversation_id)
-    
-    return GetRealtimeMemoryOutput(
-        partner_memory=c_m.partner_memory
+    etag = http_utils.make_etag(c_m.epoch, c_m.revision)
+    headers = {"ETag": etag}
+    if http_utils.etag_matches(request.headers.get("if-none-match"), etag):
+        metrics.increment("realtime_poll_total", endpoint="realtime-memory", result="not_modified")
+        return http_utils.not_modified(etag)
+
+    if since is not None:
+        memos = c_m.memos_since(since)
+        if memos is not None:
+            metrics.increment("realtime_poll_total", endpoint="realtime-memory", result="delta")
+            return json_utils.FastJSONResponse({
+                "revision": c_m.revision,
+                "since": since,
+                "full": False,
+                "memos": [
+                    {"revision": revision, "category": category, "content": content}
+                    for revision, category, content in memos
+                ],
+                "partner_memory": None,
+            }, headers=headers)
+        # 알 수 없는 리비전이면 전체 메모를 반환 (GetRealtimeMemoryDeltaOutput 형식)
+        metrics.increment("realtime_poll_total", endpoint="realtime-memory", result="full")
+        return json_utils.FastJSONResponse(json_utils.wrap(
+            "partner_memory", c_m.partner_memory_json(),
+            revision=c_m.revision, since=since, full=True, memos=[],
+        ), headers=headers)
+
+    # 메모가 바뀌지 않았으면 캐시된 직렬화 결과를 그대로 전송 (GetRealtimeMemoryOutput 형식)
+    metrics.increment("realtime_poll_total", endpoint="realtime-memory", result="full")
+    return json_utils.FastJSONResponse(
+        json_utils.wrap("partner_memory", c_m.partner_memory_json(), revision=c_m.revision),
+        headers=headers,
     )
     
 
@@ -140,24 +329,80 @@ async def get_realtime_memory(
 @router.get(
     "/{conversation_id}/realtime-analysis",
     response_model=GetRealtimeAnalysisOutput,
-    summary="대화 실시간 정보 조회"
+    summary="대화 실시간 정보 조회",
+    description="응답의 ETag를 If-None-Match로 보내면 점수가 바뀌지 않은 경우 304를 반환합니다.",
+    responses={304: {"description": "Not Modified"}},
 )
 async def get_realtime_analysis(
     conversation_id: str,
+    request: Request,
     conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
         )
         
     s_m = conversation_manager.get_conversation_scorer(conversation_id=conversation_id)
+    etag = http_utils.make_etag(s_m.epoch, s_m.revision)
+    if http_utils.etag_matches(request.headers.get("if-none-match"), etag):
+        metrics.increment("realtime_poll_total", endpoint="realtime-analysis", result="not_modified")
+        return http_utils.not_modified(etag)
     
-    return GetRealtimeAnalysisOutput(
-        scores=s_m.get_scores()
+    # GetRealtimeAnalysisOutput 형식
+    metrics.increment("realtime_poll_total", endpoint="realtime-analysis", result="full")
+    return json_utils.FastJSONResponse(
+        json_utils.wrap("scores", s_m.scores_json(), revision=s_m.revision),
+        headers={"ETag": etag},
+    )
+
+
+@router.get(
+    "/{conversation_id}/score-series",
+    response_model=GetScoreSeriesOutput,
+    summary="메시지별 점수 시계열 조회",
+    description=(
+        "메시지별 감정 점수와 그 시점의 참여도/발화 비율을 시간 순으로 반환합니다. "
+        "method가 lttb이면 LTTB로, bucket이면 같은 시간 간격의 평균으로 points개 이하로 다운샘플링합니다."
+    ),
+    responses={304: {"description": "Not Modified"}},
+)
+async def get_score_series(
+    conversation_id: str,
+    request: Request,
+    metric: Literal["sentiment", "user_engagement", "partner_engagement", "user_talk_share"] = "partner_engagement",
+    method: Literal["lttb", "bucket", "raw"] = "lttb",
+    points: int = Query(100, ge=3, le=2000),
+    role: Optional[Literal["나", "파트너"]] = None,
+    conversation_manager: manager.ConversationManager=Depends(manager.get_conversation_manager)
+):
+    if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
+        log.warning("Conversation not found: %s", conversation_id)
+        raise HTTPException(
+            status_code=status_codes.HTTP_404_NOT_FOUND,
+            detail="Conversation not found."
+        )
+
+    s_m = conversation_manager.get_conversation_scorer(conversation_id=conversation_id)
+    etag = http_utils.make_etag(s_m.epoch, s_m.revision, metric, method, points, score_service.ROLE_CODES.get(role, "all"))
+    if http_utils.etag_matches(request.headers.get("if-none-match"), etag):
+        return http_utils.not_modified(etag)
+
+    output = GetScoreSeriesOutput(
+        revision=s_m.revision,
+        metric=metric,
+        method=method,
+        n_total=len(s_m.series),
+        n_dropped=s_m.series.n_dropped,
+        points=s_m.get_series(metric, method=method, n_points=points, role=role),
+        partner_reactions=PartnerReactionCounts(
+            positive=s_m.n_partner_positive,
+            negative=s_m.n_partner_negative,
+        ),
     )
+    return json_utils.FastJSONResponse(output, headers={"ETag": etag})
 
 
 @router.post(
@@ -172,15 +417,17 @@ async def recommend_breaktime_advice(
 
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
         )
 
     c_m = conversation_manager.get_conversation_memory(conversation_id=conversation_id)
+    s_m = conversation_manager.get_conversation_scorer(conversation_id=conversation_id)
     advice_metadatas = await advice_service.BreaktimeAdviceRecommender.do(
-        conversation_memory=c_m
+        conversation_memory=c_m,
+        conversation_scorer=s_m
     )
     
     return RecommendBreaktimeAdviceOutput(
@@ -202,7 +449,7 @@ async def get_breaktime_advice(
 
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
@@ -233,7 +480,7 @@ async def get_final_report(
 
 ):
     if not conversation_manager.is_conversation_exists(conversation_id=conversation_id):
-        log.warning(f"Conversation not found: {conversation_id}")
+        log.warning("Conversation not found: %s", conversation_id)
         raise HTTPException(
             status_code=status_codes.HTTP_404_NOT_FOUND,
             detail="Conversation not found."
@@ -241,7 +488,8 @@ async def get_final_report(
 
     # TODO: 실제 보고서 생성 로직으로 대체
     final_report = await final_report_service.write_final_report_pipeline(
-        conversation_memory=conversation_manager.get_conversation_memory(conversation_id=conversation_id)
+        conversation_memory=conversation_manager.get_conversation_memory(conversation_id=conversation_id),
+        conversation_scorer=conversation_manager.get_conversation_scorer(conversation_id=conversation_id),
     )
     
     return GetFinalReportOutput(
@@ -0,0 +1,368 @@
+# python -m app.batch_eval --corpus transcripts.jsonl --output results.jsonl --concurrency 16
+#
+# 보관된 대화 기록(JSONL)을 HTTP를 거치지 않고 메모리/점수/조언/최종 보고서 파이프라인에 재생합니다.
+# 입력 한 줄: {"transcript_id": "...", "messages": [{"role": "나" | "파트너", "content": "..."}, ...]}
+# 결과는 대화 기록마다 한 줄씩 --output에 추가되며, 이미 결과가 있는 transcript_id는 건너뛰므로
+# 중단된 실행을 같은 명령으로 이어서 할 수 있습니다. 실패한 대화 기록은 <output>.errors.jsonl에 기록하고
+# 다음 실행에서 다시 시도합니다.
+# 결과가 동시 실행 수에 따라 달라지지 않도록 부하에 따른 성능 저하(core.admission)는 기본적으로 끄며,
+# --admission으로 켤 수 있습니다. 평가 중 도달한 성능 저하 수준은 결과와 보고서에 기록됩니다.
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .core import admission, clients, config, llm, logger
+from .services.elements import Message
+from .services.session_services import (
+    advice as advice_service,
+    final_report as final_report_service,
+    memory as memory_service,
+    score as score_service,
+)
+from .utils import json_utils
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+PIPELINES = ("memory", "score", "advice", "final_report")
+# 이 수의 결과를 쓸 때마다 진행 상황을 출력
+PROGRESS_INTERVAL = 100
+
+# === Models ===
+
+@dataclass
+class EvalStats:
+    n_transcripts: int = 0
+    n_skipped: int = 0
+    n_failed: int = 0
+    n_messages: int = 0
+    elapsed_seconds: float = 0.0
+    max_admission_level: int = admission.NORMAL
+    usage: llm.LLMUsage = field(default_factory=llm.LLMUsage)
+
+    def add(self, other: "EvalStats") -> None:
+        self.n_transcripts += other.n_transcripts
+        self.n_skipped += other.n_skipped
+        self.n_failed += other.n_failed
+        self.n_messages += other.n_messages
+        self.elapsed_seconds = max(self.elapsed_seconds, other.elapsed_seconds)
+        self.max_admission_level = max(self.max_admission_level, other.max_admission_level)
+        self.usage.n_calls += other.usage.n_calls
+        self.usage.prompt_tokens += other.usage.prompt_tokens
+        self.usage.completion_tokens += other.usage.completion_tokens
+        self.usage.cached_tokens += other.usage.cached_tokens
+
+    def report(self) -> Dict[str, float]:
+        elapsed = self.elapsed_seconds or 1e-9
+        return {
+            "n_transcripts": self.n_transcripts,
+            "n_skipped": self.n_skipped,
+            "n_failed": self.n_failed,
+            "n_messages": self.n_messages,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "transcripts_per_second": round(self.n_transcripts / elapsed, 3),
+            "messages_per_second": round(self.n_messages / elapsed, 3),
+            "llm_calls": self.usage.n_calls,
+            "llm_calls_per_message": round(self.usage.n_calls / self.n_messages, 3) if self.n_messages else 0.0,
+            "prompt_tokens": self.usage.prompt_tokens,
+            "completion_tokens": self.usage.completion_tokens,
+            "max_admission_level": admission.LEVEL_NAMES[self.max_admission_level],
+        }
+
+# === Functions ===
+
+def iter_corpus(path: pathlib.Path, shard_index: int = 0, n_shards: int = 1) -> Iterator[Dict]:
+    """
+    코퍼스를 한 줄씩 읽습니다. 줄 번호 % n_shards == shard_index인 기록만 반환합니다.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if line_no % n_shards != shard_index or not line.strip():
+                continue
+            yield json.loads(line)
+
+
+def load_completed(path: pathlib.Path) -> Set[str]:
+    """
+    결과 파일에서 이미 처리한 transcript_id를 읽습니다. 읽을 수 없는 줄과 실패한 결과는 무시해 다시 시도합니다.
+    """
+    completed: Set[str] = set()
+    if not path.exists():
+        return completed
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                result = json_utils.loads(line)
+                if "error" not in result:
+                    completed.add(result["transcript_id"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return completed
+
+
+def truncate_partial_line(path: pathlib.Path) -> None:
+    """
+    중단되며 줄바꿈 없이 끝난 마지막 줄을 잘라 다음 결과가 그 뒤에 붙지 않게 합니다.
+    """
+    if not path.exists():
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, 2)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # 마지막 줄바꿈을 뒤에서부터 찾음
+        pos = size
+        while pos > 0:
+            step = min(pos, 64 * 1024)
+            f.seek(pos - step)
+            idx = f.read(step).rfind(b"\n")
+            if idx != -1:
+                pos = pos - step + idx + 1
+                break
+            pos -= step
+        log.warning("Truncating partial result line in %s (%d bytes)", path, size - pos)
+        f.truncate(pos)
+
+
+def shard_output_path(output: pathlib.Path, shard_index: int, n_shards: int) -> pathlib.Path:
+    if n_shards == 1:
+        return output
+    return output.with_name(f"{output.stem}.shard-{shard_index}-of-{n_shards}{output.suffix}")
+
+
+def errors_path(output: pathlib.Path) -> pathlib.Path:
+    return output.with_name(f"{output.stem}.errors{output.suffix}")
+
+
+async def evaluate_transcript(transcript: Dict, pipelines: Tuple[str, ...]) -> Dict:
+    """
+    대화 기록 하나를 메시지 순서대로 재생하고 각 파이프라인의 결과를 반환합니다.
+    """
+    conversation_memory = memory_service.ConversationMemory(
+        my_info=transcript.get("my_info"),
+        partner_info=transcript.get("partner_info"),
+    )
+    conversation_scorer = score_service.ConversationScorer()
+    result: Dict = {"transcript_id": transcript["transcript_id"]}
+    start = time.perf_counter()
+    max_level = admission.NORMAL
+
+    with llm.track_usage() as usage:
+        for idx, message in enumerate(transcript["messages"]):
+            conversation_memory.add_message(Message(
+                message_id=str(message.get("message_id", idx)),
+                role=message["role"],
+                content=message["content"],
+            ))
+            # 파이프라인이 시작될 때의 성능 저하 수준 (n_consistency, 메모리 업데이트 생략 여부가 달라짐)
+            max_level = max(max_level, admission.admission_controller.level())
+            message_pipelines = []
+            if "memory" in pipelines:
+                message_pipelines.append(memory_service.update_partner_memory_pipeline(
+                    conversation_memory=conversation_memory
+                ))
+            if "score" in pipelines:
+                message_pipelines.append(score_service.update_conversation_scores_pipeline(
+                    conversation_scorer=conversation_scorer,
+                    conversation_memory=conversation_memory
+                ))
+            await asyncio.gather(*message_pipelines)
+
+        result["n_messages"] = len(conversation_memory.messages)
+        if "memory" in pipelines:
+            result["partner_memory"] = conversation_memory.partner_memory.content
+        if "score" in pipelines:
+            result["scores"] = conversation_scorer.get_scores().dict()
+            result["partner_reactions"] = {
+                "positive": conversation_scorer.n_partner_positive,
+                "negative": conversation_scorer.n_partner_negative,
+            }
+        if "advice" in pipelines:
+            max_level = max(max_level, admission.admission_controller.level())
+            advice_metadatas = await advice_service.BreaktimeAdviceRecommender.do(
+                conversation_memory=conversation_memory,
+                conversation_scorer=conversation_scorer,
+            )
+            result["advice_ids"] = [metadata.advice_id for metadata in advice_metadatas]
+        if "final_report" in pipelines:
+            result["final_report"] = await final_report_service.write_final_report_pipeline(
+                conversation_memory=conversation_memory,
+                conversation_scorer=conversation_scorer,
+            )
+
+    result["elapsed_seconds"] = round(time.perf_counter() - start, 4)
+    result["admission_level"] = admission.LEVEL_NAMES[max_level]
+    result["usage"] = {
+        "llm_calls": usage.n_calls,
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "cached_tokens": usage.cached_tokens,
+    }
+    return result
+
+
+async def run_shard(
+    corpus: pathlib.Path,
+    output: pathlib.Path,
+    pipelines: Tuple[str, ...] = PIPELINES,
+    concurrency: int = 8,
+    shard_index: int = 0,
+    n_shards: int = 1,
+    limit: Optional[int] = None,
+) -> EvalStats:
+    """
+    샤드의 대화 기록을 최대 concurrency개씩 동시에 평가하고, 끝나는 순서대로 output에 한 줄씩 추가합니다.
+    """
+    truncate_partial_line(output)
+    completed = load_completed(output)
+    stats = EvalStats()
+    start = time.perf_counter()
+    pending: Set[asyncio.Task] = set()
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    async def evaluate(transcript: Dict) -> Tuple[Dict, int]:
+        try:
+            return await evaluate_transcript(transcript, pipelines), len(transcript["messages"])
+        except Exception as e:
+            log.error("Failed to evaluate %s: %s", transcript["transcript_id"], e)
+            return {"transcript_id": transcript["transcript_id"], "error": f"{type(e).__name__}: {e}"}, 0
+
+    with open(output, "ab") as f, open(errors_path(output), "ab") as errors_f:
+        def write(done: Set[asyncio.Task]) -> None:
+            for task in done:
+                result, n_messages = task.result()
+                # 실패한 결과는 체크포인트에 남기지 않아 다음 실행에서 다시 시도
+                (errors_f if "error" in result else f).write(json_utils.dumps(result) + b"\n")
+                stats.n_transcripts += 1
+                stats.n_messages += n_messages
+                stats.n_failed += "error" in result
+                level = result.get("admission_level", admission.LEVEL_NAMES[admission.NORMAL])
+                stats.max_admission_level = max(stats.max_admission_level, admission.LEVEL_IDS[level])
+                usage = result.get("usage", {})
+                stats.usage.n_calls += usage.get("llm_calls", 0)
+                stats.usage.prompt_tokens += usage.get("prompt_tokens", 0)
+                stats.usage.completion_tokens += usage.get("completion_tokens", 0)
+                stats.usage.cached_tokens += usage.get("cached_tokens", 0)
+                if stats.n_transcripts % PROGRESS_INTERVAL == 0:
+                    stats.elapsed_seconds = time.perf_counter() - start
+                    log.info("[shard %d/%d] %s", shard_index, n_shards, stats.report())
+            # 결과 파일이 곧 체크포인트이므로 완료된 결과를 바로 기록
+            f.flush()
+            errors_f.flush()
+
+        for transcript in iter_corpus(corpus, shard_index, n_shards):
+            if transcript["transcript_id"] in completed:
+                stats.n_skipped += 1
+                continue
+            if limit is not None and stats.n_transcripts + len(pending) >= limit:
+                break
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                write(done)
+            pending.add(asyncio.ensure_future(evaluate(transcript)))
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            write(done)
+
+    stats.elapsed_seconds = time.perf_counter() - start
+    if stats.max_admission_level != admission.NORMAL:
+        log.warning(
+            "[shard %d/%d] Pipelines ran degraded (max level %s); results depend on concurrency",
+            shard_index, n_shards, admission.LEVEL_NAMES[stats.max_admission_level],
+        )
+    return stats
+
+
+def _use_stub_llm(latency_scale: float, seed: int) -> None:
+    # 개발용: 네트워크 없이 스텁 LLM으로 실행 (benchmarks 패키지 필요)
+    from benchmarks.stub_llm import StubAsyncOpenAI
+
+    clients.async_openai_client = StubAsyncOpenAI(latency_scale=latency_scale, seed=seed)
+
+
+def _run_shard_process(kwargs: Dict, stub: Optional[Tuple[float, int]], admission_enabled: bool = False) -> EvalStats:
+    if stub is not None:
+        _use_stub_llm(*stub)
+    enabled = config.settings.ADMISSION_ENABLED
+    config.settings.ADMISSION_ENABLED = admission_enabled
+    try:
+        return asyncio.run(run_shard(**kwargs))
+    finally:
+        config.settings.ADMISSION_ENABLED = enabled
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, float]:
+    parser = argparse.ArgumentParser(description="Replay a transcript corpus through the conversation pipelines.")
+    parser.add_argument("--corpus", type=pathlib.Path, required=True, help="입력 JSONL 코퍼스")
+    parser.add_argument("--output", type=pathlib.Path, required=True, help="결과 JSONL (체크포인트 겸용)")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help=f"실행할 파이프라인 ({','.join(PIPELINES)})")
+    parser.add_argument("--concurrency", type=int, default=8, help="프로세스당 동시에 평가할 대화 기록 수")
+    parser.add_argument("--processes", type=int, default=1, help="로컬에서 실행할 샤드 프로세스 수")
+    parser.add_argument("--num-shards", type=int, default=None, help="전체 샤드 수 (여러 머신에 나눠 실행할 때)")
+    parser.add_argument("--shard-index", type=int, default=None, help="이 실행이 맡을 샤드 번호 (0 ~ num-shards-1)")
+    parser.add_argument("--limit", type=int, default=None, help="샤드당 최대 평가 수")
+    parser.add_argument("--admission", action="store_true", help="서버처럼 부하에 따른 성능 저하를 적용 (기본: 끔)")
+    parser.add_argument("--stub-llm", action="store_true", help="OpenAI 대신 스텁 LLM 사용 (개발용)")
+    parser.add_argument("--stub-latency-scale", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pipelines = tuple(name.strip() for name in args.pipelines.split(",") if name.strip())
+    unknown = set(pipelines) - set(PIPELINES)
+    if unknown:
+        parser.error(f"unknown pipelines: {', '.join(sorted(unknown))}")
+
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.num_shards is not None and args.num_shards < 1:
+        parser.error("--num-shards must be at least 1")
+    if args.shard_index is not None:
+        if args.num_shards is None:
+            parser.error("--shard-index requires --num-shards")
+        if not 0 <= args.shard_index < args.num_shards:
+            parser.error(f"--shard-index must be in [0, {args.num_shards})")
+        n_shards = args.num_shards
+        shard_indices = [args.shard_index]
+    else:
+        n_shards = args.num_shards or args.processes
+        shard_indices = list(range(n_shards))
+
+    def shard_kwargs(shard_index: int) -> Dict:
+        return dict(
+            corpus=args.corpus,
+            output=shard_output_path(args.output, shard_index, n_shards),
+            pipelines=pipelines,
+            concurrency=args.concurrency,
+            shard_index=shard_index,
+            n_shards=n_shards,
+            limit=args.limit,
+        )
+
+    stub = (args.stub_latency_scale, args.seed) if args.stub_llm else None
+    total = EvalStats()
+    if len(shard_indices) == 1:
+        total.add(_run_shard_process(shard_kwargs(shard_indices[0]), stub, args.admission))
+    else:
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            futures = [executor.submit(_run_shard_process, shard_kwargs(i), stub, args.admission) for i in shard_indices]
+            for future in futures:
+                total.add(future.result())
+
+    report = total.report()
+    print(json.dumps(report, ensure_ascii=False), file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import re
+import time
+import asyncio
+import functools
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from . import logger
+from .config import settings
+from .metrics import metrics
+from ..utils import json_utils
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+# 단계적 성능 저하 수준
+NORMAL = 0
+REDUCED_CONSISTENCY = 1  # 감정 분석 n_consistency 팬아웃을 1로 줄임
+SKIP_LOW_PRIORITY_MEMORY = 2  # 우선순위가 낮은 메시지의 메모리 업데이트를 생략
+SHED_NON_REALTIME = 3  # 실시간이 아닌 엔드포인트(/final-report 등)에 503 반환
+
+LEVEL_NAMES = {
+    NORMAL: "normal",
+    REDUCED_CONSISTENCY: "reduced_consistency",
+    SKIP_LOW_PRIORITY_MEMORY: "skip_low_priority_memory",
+    SHED_NON_REALTIME: "shed_non_realtime",
+}
+LEVEL_IDS = {name: level for level, name in LEVEL_NAMES.items()}
+
+# 대화 진행 중 주기적으로 호출되는 실시간 엔드포인트 (SHED_NON_REALTIME에서도 처리)
+REALTIME_STAGES = {"messages", "audio", "realtime-memory", "realtime-analysis"}
+# 대화가 끝날 때까지 이어지는 스트리밍 요청은 동시 처리 수 제한에서 제외
+UNMETERED_STAGES = {"audio"}
+
+_ADMISSION_PATH_RE = re.compile(r"/api/v1/conversation/[^/]+(?:/(?P<stage>[^/]+))?")
+
+T = TypeVar("T")
+
+# === AdmissionController ===
+
+class AdmissionController:
+    """
+    진행 중인 파이프라인 수와 대기열 대기 시간으로 부하를 추정해 성능 저하 수준을 정하는 클래스.
+
+    동시에 처리하는 요청 수를 max_concurrent로 제한하고, 나머지는 대기열에서 기다리게 합니다.
+    부하(pressure)는 진행 중인 파이프라인 수 / 목표치와 최근 대기 시간(EWMA) / 목표치 중 큰 값이며,
+    level_thresholds를 넘을 때마다 성능 저하 수준이 한 단계씩 올라갑니다.
+    진행 중인 파이프라인은 track_pipeline으로 감싼 파이프라인 함수의 실행 수이고,
+    대기 시간 EWMA는 요청이 없어도 queue_wait_half_life마다 절반으로 줄어듭니다.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue_wait: float,
+        target_inflight_pipelines: int,
+        target_queue_wait: float,
+        level_thresholds: List[float],
+        ewma_alpha: float = 0.2,
+        queue_wait_half_life: float = 5.0,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_queue_wait = max_queue_wait
+        self.target_inflight_pipelines = target_inflight_pipelines
+        self.target_queue_wait = target_queue_wait
+        self.level_thresholds = sorted(level_thresholds)
+        self.ewma_alpha = ewma_alpha
+        self.queue_wait_half_life = queue_wait_half_life
+        self._queue_wait = 0.0
+        self._queue_wait_at = time.monotonic()
+        self.n_inflight_pipelines = 0
+        self.n_active = 0
+        self.n_waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._level = NORMAL
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphore
+
+    @property
+    def queue_wait(self) -> float:
+        if self.queue_wait_half_life <= 0:
+            return self._queue_wait
+        elapsed = time.monotonic() - self._queue_wait_at
+        return self._queue_wait * 0.5 ** (elapsed / self.queue_wait_half_life)
+
+    @queue_wait.setter
+    def queue_wait(self, value: float) -> None:
+        self._queue_wait = value
+        self._queue_wait_at = time.monotonic()
+
+    def track_pipeline(self, func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        """
+        파이프라인 함수가 실행되는 동안 진행 중인 파이프라인 수에 포함시키는 데코레이터.
+        """
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            self.n_inflight_pipelines += 1
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.n_inflight_pipelines -= 1
+        return wrapper
+
+    def pressure(self) -> float:
+        return max(
+            self.n_inflight_pipelines / self.target_inflight_pipelines if self.target_inflight_pipelines else 0.0,
+            self.queue_wait / self.target_queue_wait if self.target_queue_wait else 0.0,
+        )
+
+    def level(self) -> int:
+        # ADMISSION_ENABLED=false이면 부하와 관계없이 성능을 낮추지 않음
+        if not settings.ADMISSION_ENABLED:
+            return NORMAL
+        pressure = self.pressure()
+        level = sum(1 for threshold in self.level_thresholds if pressure >= threshold)
+        if level != self._level:
+            log.warning("Degradation level %s -> %s (pressure %.2f)", LEVEL_NAMES[self._level], LEVEL_NAMES[level], pressure)
+            metrics.increment("admission_level_changes_total", level=LEVEL_NAMES[level])
+            self._level = level
+        return level
+
+    def n_consistency(self, default: int) -> int:
+        return 1 if self.level() >= REDUCED_CONSISTENCY else default
+
+    def skip_low_priority_memory(self) -> bool:
+        return self.level() >= SKIP_LOW_PRIORITY_MEMORY
+
+    def retry_after(self) -> int:
+        return max(1, int(round(settings.ADMISSION_RETRY_AFTER_SECONDS * max(self.pressure(), 1.0))))
+
+    def observe_queue_wait(self, wait: float) -> None:
+        self.queue_wait = self.ewma_alpha * wait + (1 - self.ewma_alpha) * self.queue_wait
+        metrics.observe("admission_queue_wait_seconds", wait)
+
+    def status(self) -> dict:
+        level = self.level()
+        return {
+            "level": level,
+            "level_name": LEVEL_NAMES[level],
+            "pressure": round(self.pressure(), 3),
+            "inflight_pipelines": self.n_inflight_pipelines,
+            "queue_wait_seconds": round(self.queue_wait, 4),
+            "active_requests": self.n_active,
+            "waiting_requests": self.n_waiting,
+        }
+
+
+admission_controller = AdmissionController(
+    max_concurrent=settings.ADMISSION_MAX_CONCURRENT_REQUESTS,
+    max_queue_wait=settings.ADMISSION_MAX_QUEUE_WAIT_SECONDS,
+    target_inflight_pipelines=settings.ADMISSION_TARGET_INFLIGHT_PIPELINES,
+    target_queue_wait=settings.ADMISSION_TARGET_QUEUE_WAIT_SECONDS,
+    level_thresholds=settings.ADMISSION_LEVEL_THRESHOLDS,
+    queue_wait_half_life=settings.ADMISSION_QUEUE_WAIT_HALF_LIFE_SECONDS,
+)
+
+# === Middleware ===
+
+async def _send_unavailable(send, retry_after: int, reason: str) -> None:
+    body = json_utils.dumps({"detail": "Server is overloaded. Please retry later.", "reason": reason})
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """
+    /api/v1/conversation 요청의 동시 처리 수를 제한하고, 과부하 시 요청을 거절(503 + Retry-After)하는 ASGI 미들웨어.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission_controller) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        match = _ADMISSION_PATH_RE.match(scope.get("path", "")) if scope["type"] == "http" else None
+        if match is None or not settings.ADMISSION_ENABLED:
+            return await self.app(scope, receive, send)
+
+        controller = self.controller
+        realtime = match["stage"] is None or match["stage"] in REALTIME_STAGES
+        if not realtime and controller.level() >= SHED_NON_REALTIME:
+            metrics.increment("admission_rejected_total", reason="shed", stage=match["stage"])
+            return await _send_unavailable(send, controller.retry_after(), "shed")
+        if match["stage"] in UNMETERED_STAGES:
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        controller.n_waiting += 1
+        try:
+            await asyncio.wait_for(controller.semaphore.acquire(), timeout=controller.max_queue_wait or None)
+        except asyncio.TimeoutError:
+            controller.observe_queue_wait(time.perf_counter() - start)
+            metrics.increment("admission_rejected_total", reason="queue_timeout", stage=match["stage"])
+            return await _send_unavailable(send, controller.retry_after(), "queue_timeout")
+        finally:
+            controller.n_waiting -= 1
+
+        controller.observe_queue_wait(time.perf_counter() - start)
+        controller.n_active += 1
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            controller.n_active -= 1
+            controller.semaphore.release()
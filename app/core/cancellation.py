@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from starlette.requests import Request
+
+from . import logger
+from .metrics import metrics
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+# 취소 사유 (asyncio.Task.cancel(msg)로 전달되어 CancelledError.args[0]에서 확인 가능)
+SUPERSEDED = "superseded"
+DISCONNECTED = "disconnected"
+DEADLINE = "deadline"
+# 추측 실행한 작업의 결과가 필요 없어진 경우 (memory의 speculative 모드)
+SPECULATION = "speculation"
+
+# === Functions ===
+
+def cancel_reason(error: BaseException) -> str:
+    return error.args[0] if error.args and isinstance(error.args[0], str) else "unknown"
+
+
+async def wait_for_disconnect(request: Request) -> None:
+    """
+    본문을 모두 읽은 요청에서 클라이언트 연결이 끊길 때까지 기다립니다.
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+class PipelineTracker:
+    """
+    대화(scope)별로 진행 중인 파이프라인 태스크를 추적하고 협력적으로 취소하는 클래스.
+
+    같은 scope/파이프라인에 더 새로운 리비전이 시작되면 이전 리비전의 태스크를 취소하고,
+    클라이언트 연결이 끊기거나 마감 시간이 지나면 아직 끝나지 않은 태스크를 취소합니다.
+    취소된 파이프라인의 결과는 None이며, 대화 상태는 바뀌지 않습니다.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Tuple[str, str], Tuple[int, asyncio.Task]] = {}
+        self._reasons: Dict[asyncio.Task, str] = {}
+
+    def n_inflight(self) -> int:
+        return len(self._inflight)
+
+    def _start(self, scope: str, pipeline: str, revision: int, coro: Awaitable, supersede: bool) -> asyncio.Task:
+        key = (scope, pipeline)
+        previous = self._inflight.get(key)
+        if supersede and previous is not None and previous[0] < revision and not previous[1].done():
+            self._cancel(previous[1], SUPERSEDED)
+
+        task = asyncio.ensure_future(coro)
+        self._inflight[key] = (revision, task)
+
+        def _cleanup(done: asyncio.Task) -> None:
+            current = self._inflight.get(key)
+            if current is not None and current[1] is done:
+                del self._inflight[key]
+            if done.cancelled():
+                metrics.increment("pipeline_cancelled_total", pipeline=pipeline, reason=self._reasons.pop(done, "unknown"))
+            else:
+                self._reasons.pop(done, None)
+
+        task.add_done_callback(_cleanup)
+        return task
+
+    def _cancel(self, task: asyncio.Task, reason: str) -> None:
+        if not task.done():
+            self._reasons[task] = reason
+            task.cancel(reason)
+
+    async def run(
+        self,
+        scope: str,
+        revision: int,
+        pipelines: Dict[str, Awaitable],
+        supersede: Iterable[str] = (),
+        disconnected: Optional[Callable[[], Awaitable[None]]] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        파이프라인들을 동시에 실행하고 {파이프라인 이름: 결과}를 반환합니다.
+        취소된 파이프라인의 결과는 None입니다. 취소 외의 예외는 그대로 전달합니다.
+
+        Args:
+            scope: 파이프라인을 묶는 단위 (대화 ID).
+            revision: 이번 실행이 처리하는 리비전 (메시지 수 등 단조 증가하는 값).
+            pipelines: 파이프라인 이름과 코루틴.
+            supersede: 새 리비전이 시작되면 이전 리비전을 취소할 파이프라인 이름.
+            disconnected: 클라이언트 연결이 끊기면 반환되는 코루틴 함수.
+            deadline: 마감 시간(초). 지나면 남은 파이프라인을 취소합니다.
+        """
+        supersede = set(supersede)
+        tasks = {
+            name: self._start(scope, name, revision, coro, name in supersede)
+            for name, coro in pipelines.items()
+        }
+        watcher = asyncio.ensure_future(disconnected()) if disconnected is not None else None
+        pending = set(tasks.values())
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + deadline if deadline else None
+        try:
+            while pending:
+                waiting = pending | ({watcher} if watcher is not None else set())
+                timeout = max(expires_at - loop.time(), 0.0) if expires_at is not None else None
+                done, _ = await asyncio.wait(waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                pending -= done
+                if watcher is not None and watcher in done:
+                    log.info("Client disconnected, cancelling %d pipelines of %s", len(pending), scope)
+                    for task in pending:
+                        self._cancel(task, DISCONNECTED)
+                    watcher = None
+                elif not done:
+                    log.warning("Deadline of %.1fs expired, cancelling %d pipelines of %s", deadline, len(pending), scope)
+                    for task in pending:
+                        self._cancel(task, DEADLINE)
+                    expires_at = None
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        except asyncio.CancelledError:
+            # 요청 처리 자체가 취소된 경우(서버 종료 등) 파이프라인도 함께 취소
+            for task in tasks.values():
+                self._cancel(task, DISCONNECTED)
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+        results = {}
+        for name, task in tasks.items():
+            if task.cancelled():
+                results[name] = None
+            elif task.exception() is not None:
+                raise task.exception()
+            else:
+                results[name] = task.result()
+        return results
+
+
+pipeline_tracker = PipelineTracker()
@@ -0,0 +1,140 @@
+import json
+import hashlib
+import pathlib
+import threading
+import types
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+from . import config, logger
+
+log = logger.get_logger(__name__)
+
+# === Models ===
+
+@dataclass
+class CassetteEntry:
+    """
+    카세트에 기록된 LLM 호출 한 건.
+    요청은 key(모델, 메시지, 응답 형식의 해시)로만 저장해 파일을 작게 유지합니다.
+    """
+    key: str
+    pipeline: str
+    model: str
+    response: Any
+    latency: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    def usage(self) -> types.SimpleNamespace:
+        """
+        OpenAI 응답의 usage와 같은 모양의 객체를 반환합니다.
+        """
+        return types.SimpleNamespace(
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            prompt_tokens_details=types.SimpleNamespace(cached_tokens=self.cached_tokens),
+        )
+
+
+class CassetteMiss(LookupError):
+    """
+    재생 모드에서 요청에 해당하는 기록이 없을 때 발생합니다.
+    """
+
+
+class Cassette:
+    """
+    LLM 호출을 append-only JSONL 파일에 기록하고 재생하는 클래스.
+
+    재생 시에는 같은 key의 기록을 기록된 순서대로 반환하고, key가 일치하는 기록이 없으면
+    (프롬프트가 바뀐 경우) 같은 파이프라인의 아직 재생하지 않은 기록을 순서대로 반환합니다.
+    """
+
+    def __init__(self, path: pathlib.Path, mode: str, time_scale: float = 1.0) -> None:
+        self.path = pathlib.Path(path)
+        self.mode = mode
+        self.time_scale = time_scale
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries: Optional[List[CassetteEntry]] = None
+        self._by_key: Dict[str, Deque[int]] = defaultdict(deque)
+        self._by_pipeline: Dict[str, Deque[int]] = defaultdict(deque)
+        self._replayed: set = set()
+
+    @staticmethod
+    def request_key(model: str, messages: List[Dict[str, str]], response_format: str) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "response_format": response_format},
+            ensure_ascii=False, sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+    def record(self, entry: CassetteEntry) -> None:
+        line = json.dumps(asdict(entry), ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def _load(self) -> List[CassetteEntry]:
+        entries = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entries.append(CassetteEntry(**json.loads(line)))
+        for idx, entry in enumerate(entries):
+            self._by_key[entry.key].append(idx)
+            self._by_pipeline[entry.pipeline].append(idx)
+        log.info("Loaded %d LLM cassette entries from %s", len(entries), self.path)
+        return entries
+
+    def replay(self, key: str, pipeline: str) -> CassetteEntry:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+
+            candidates = self._by_key.get(key)
+            if candidates:
+                idx = candidates.popleft() if len(candidates) > 1 else candidates[0]
+            else:
+                queue = self._by_pipeline.get(pipeline)
+                while queue and queue[0] in self._replayed:
+                    queue.popleft()
+                if not queue:
+                    raise CassetteMiss(f"No cassette entry for {pipeline} ({key})")
+                idx = queue.popleft()
+                log.warning("Cassette key miss for %s, replaying entry #%d in recorded order", pipeline, idx)
+            self._replayed.add(idx)
+            return self._entries[idx]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+# === Functions ===
+
+@lru_cache(maxsize=4)
+def _open_cassette(path: str, mode: str, time_scale: float) -> Cassette:
+    return Cassette(pathlib.Path(path), mode=mode, time_scale=time_scale)
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    설정된 카세트를 반환합니다. 비활성화되어 있으면 None을 반환합니다.
+    """
+    settings = config.settings
+    if settings.LLM_CASSETTE_MODE == "off":
+        return None
+    if not settings.LLM_CASSETTE_PATH:
+        log.warning("LLM_CASSETTE_MODE is set but LLM_CASSETTE_PATH is empty; cassette disabled")
+        return None
+    return _open_cassette(settings.LLM_CASSETTE_PATH, settings.LLM_CASSETTE_MODE, settings.LLM_CASSETTE_TIME_SCALE)
@@ -1,14 +1,38 @@
-from openai import AsyncOpenAI
-from google.cloud import speech
+from typing import TYPE_CHECKING
 
 from .config import (
     settings
 )
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# LAZY_INIT 모드에서는 openai 임포트와 클라이언트 생성을 첫 사용 시점까지 미룹니다.
+# (테스트/벤치마크에서는 clients.async_openai_client에 직접 대입해 교체할 수 있습니다.)
+
+
+def _build_async_openai_client() -> "AsyncOpenAI":
+    from openai import AsyncOpenAI
+
+    # 재시도와 타임아웃은 core.resilience에서 파이프라인 마감 시간에 맞춰 처리
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        max_retries=0,
+    )
+
 
-async_openai_client = AsyncOpenAI(
-    api_key=settings.OPENAI_API_KEY
-)
 # google_speech_client = speech.SpeechAsyncClient(
 #     credentials=GOOGLE_API_KEY
 # )
+
+
+def __getattr__(name: str):
+    if name == "async_openai_client":
+        client = _build_async_openai_client()
+        globals()[name] = client
+        return client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if not settings.LAZY_INIT:
+    async_openai_client = _build_async_openai_client()
@@ -1,6 +1,6 @@
 from pathlib import Path
 from pydantic import BaseSettings
-from typing import Optional, ClassVar
+from typing import Dict, List, Literal, Optional, ClassVar
 import os
 
 # Environment Variables
@@ -17,10 +17,140 @@ class Settings(BaseSettings):
     PROJECT_DESCRIPTION: Optional[str] = "API for providing real-time advice in dating situations"
     PROJECT_VERSION: Optional[str] = "0.1.0"
     
+    # Startup Configuration
+    # 무거운 임포트와 클라이언트 생성을 첫 사용 시점까지 미룸 (콜드 스타트 단축)
+    LAZY_INIT: bool = True
+    # 서버 시작 시 /ready와 같은 워밍업(클라이언트 생성, 조언 목록 로딩 등)을 미리 수행
+    WARMUP_ON_STARTUP: bool = False
+    # 워밍업 시 OpenAI API에 요청을 보내 커넥션을 미리 열어 둠
+    WARMUP_OPEN_CONNECTIONS: bool = False
+
     # OpenAI API Configuration
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL_NAME: Optional[str] = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
     
+    # LLM Resilience Configuration
+    # LLM 호출 한 건(재시도 포함)의 마감 시간(초), 0이면 비활성화
+    LLM_CALL_DEADLINE_SECONDS: float = 10.0
+    # 파이프라인(PROMPT_NAME)별 마감 시간 재정의, 예: {"score/sentimental_analysis": 3.0}
+    LLM_PIPELINE_DEADLINES: Dict[str, float] = {
+        "score/sentimental_analysis": 4.0,
+        "memory/partner_message_relevance_classifier": 4.0,
+    }
+    # 실패 시 재시도 횟수와 지터 백오프(초) (OpenAI 클라이언트 자체 재시도는 사용하지 않음)
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_DELAY: float = 0.2
+    LLM_RETRY_MAX_DELAY: float = 2.0
+    # 지연 시간이 LLM_HEDGE_QUANTILE 분위수를 넘으면 같은 요청을 한 번 더 보내 먼저 온 응답을 사용
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_QUANTILE: float = 0.95
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MIN_DELAY: float = 0.05
+    # 모델별 연속 실패가 임계값 이상이면 LLM_CIRCUIT_RESET_SECONDS 동안 호출을 차단
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Logging Configuration
+    LOG_LEVEL: str = "INFO"
+    # 로그 핸들러 I/O를 별도 스레드(QueueListener)에서 처리
+    LOG_QUEUE_ENABLED: bool = True
+    # 로거 이름(prefix)별 샘플링 비율, 예: {"app.api.v1.conversation": 0.1}
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    # 로거 이름(prefix)별 초당 최대 로그 수, 예: {"app.services.manager": 50}
+    LOG_RATE_LIMITS: Dict[str, float] = {}
+
+    # Prompt Configuration
+    # 파이프라인(PROMPT_NAME)별 프롬프트 토큰 예산 재정의, 예: {"advice/advice_generator": 4000}
+    PROMPT_TOKEN_BUDGETS: Dict[str, int] = {}
+
+    # Partner Memory Configuration
+    # 사소한 파트너 메시지(추임새 등)는 관련성 분류기 호출 없이 건너뜀
+    MEMORY_PREFILTER_ENABLED: bool = True
+    # train_linear_model로 학습한 선형 모델 경로 (없으면 규칙 기반 필터만 사용)
+    MEMORY_PREFILTER_MODEL_PATH: Optional[str] = None
+    MEMORY_PREFILTER_SKIP_THRESHOLD: float = 0.05
+    # two_stage: 관련성 분류(nano) 후 메모 생성(mini), fused: 한 번의 호출로 판단과 메모 생성,
+    # speculative: 관련성 분류와 메모 생성을 동시에 시작하고 불필요하면 메모 생성을 취소/폐기
+    MEMORY_PIPELINE_MODE: Literal["two_stage", "fused", "speculative"] = "two_stage"
+    # 메모 생성 지시를 작은 모델(nano)로 먼저 생성하고 로컬 검증에 실패한 경우에만 mini로 다시 생성
+    MEMORY_INSTRUCTION_CASCADE_ENABLED: bool = False
+    MEMORY_CASCADE_MIN_CONTENT_CHARS: int = 4
+    MEMORY_CASCADE_MAX_CONTENT_CHARS: int = 80
+    # 메모 내용의 글자 bigram 중 분석한 메시지와 겹쳐야 하는 최소 비율
+    MEMORY_CASCADE_MIN_OVERLAP: float = 0.15
+    # 메모가 이 개수나 글자 수를 넘으면 조언/메모 생성 프롬프트에 현재 메시지(또는 요청한 조언)와
+    # BM25 관련도가 높은 메모만 최대 MEMORY_PROMPT_TOP_K개, MEMORY_PROMPT_MAX_CHARS자까지 넣음
+    MEMORY_PROMPT_SELECTION_ENABLED: bool = True
+    MEMORY_PROMPT_TOP_K: int = 12
+    MEMORY_PROMPT_MAX_CHARS: int = 600
+
+    # Sentiment Analysis Configuration
+    # 로컬 감정 분석의 확신도가 임계값 이상이면 LLM 호출 없이 그 점수를 사용
+    LOCAL_SENTIMENT_ENABLED: bool = True
+    LOCAL_SENTIMENT_CONFIDENCE_THRESHOLD: float = 0.75
+    # 대화별로 이 시간(초) 안에 연달아 들어온 메시지를 모아 한 번의 호출로 분석, 0이면 메시지마다 분석
+    SENTIMENT_DEBOUNCE_SECONDS: float = 0.0
+    # 모인 메시지가 이 수에 도달하면 debounce 시간을 기다리지 않고 분석
+    SENTIMENT_DEBOUNCE_MAX_BATCH: int = 4
+    # 대화별로 보관할 메시지별 점수 시계열의 최대 길이 (오래된 값부터 덮어씀)
+    SCORE_SERIES_CAPACITY: int = 2048
+
+    # Realtime Pipeline Configuration
+    # 같은 대화에 새 메시지가 오면 이전 메시지의 분석을 취소할 파이프라인 (memory, score)
+    # memory를 취소하면 이전 메시지에서 나올 메모가 누락될 수 있어 기본값은 score만 취소
+    CANCEL_SUPERSEDED_PIPELINES: List[str] = ["score"]
+    # 클라이언트 연결이 끊기면 진행 중인 파이프라인을 취소
+    CANCEL_ON_DISCONNECT: bool = True
+    # 메시지 한 건의 파이프라인 마감 시간(초), 0이면 비활성화
+    REALTIME_PIPELINE_DEADLINE_SECONDS: float = 20.0
+
+    # Admission Control Configuration
+    ADMISSION_ENABLED: bool = True
+    # 동시에 처리할 /api/v1/conversation 요청 수, 초과한 요청은 대기열에서 기다림
+    ADMISSION_MAX_CONCURRENT_REQUESTS: int = 64
+    # 대기열에서 이 시간(초) 안에 처리를 시작하지 못하면 503 반환, 0이면 무제한 대기
+    ADMISSION_MAX_QUEUE_WAIT_SECONDS: float = 5.0
+    # 부하 = max(진행 중인 파이프라인 수 / 목표치, 대기 시간 EWMA / 목표치)
+    ADMISSION_TARGET_INFLIGHT_PIPELINES: int = 128
+    ADMISSION_TARGET_QUEUE_WAIT_SECONDS: float = 0.5
+    # 대기 시간 EWMA가 절반으로 줄어드는 시간(초). 요청이 끊겨도 성능 저하 수준이 내려가도록 시간에 따라 감소
+    ADMISSION_QUEUE_WAIT_HALF_LIFE_SECONDS: float = 5.0
+    # 부하가 각 임계값을 넘으면 성능 저하 수준이 한 단계씩 올라감
+    # (1: n_consistency 축소, 2: 우선순위 낮은 메시지의 메모리 업데이트 생략, 3: 실시간이 아닌 엔드포인트에 503)
+    ADMISSION_LEVEL_THRESHOLDS: List[float] = [0.5, 0.75, 1.0]
+    # 503 응답의 Retry-After 기본값(초), 부하에 비례해 늘어남
+    ADMISSION_RETRY_AFTER_SECONDS: float = 5.0
+
+    # Session Export Configuration
+    # 대화 내보내기(JSONL) 응답을 이 크기(바이트) 단위로 묶어 전송
+    SESSION_EXPORT_CHUNK_BYTES: int = 65536
+    # 대화 가져오기 요청 본문에서 한 줄(레코드)의 최대 크기(바이트)
+    SESSION_IMPORT_MAX_LINE_BYTES: int = 1048576
+
+    # Advice Catalog Configuration
+    # advice_metadatas.json 변경 여부를 확인하는 주기(초), 0이면 자동 재로딩 비활성화
+    ADVICE_CATALOG_RELOAD_INTERVAL: float = 5.0
+    # llm: LLM 순위만 사용, local: 로컬 순위만 사용(LLM 호출 없음),
+    # blend: LLM 순위와 로컬 순위를 합산, fallback: LLM 실패 시 로컬 순위 사용
+    ADVICE_RECOMMENDER_MODE: Literal["llm", "local", "blend", "fallback"] = "llm"
+
+    # LLM Cassette Configuration
+    # record: LLM 호출과 응답, 지연 시간을 LLM_CASSETTE_PATH에 기록
+    # replay: 기록된 응답을 네트워크 호출 없이 재생
+    LLM_CASSETTE_MODE: Literal["off", "record", "replay"] = "off"
+    LLM_CASSETTE_PATH: Optional[str] = None
+    # 재생 시 기록된 지연 시간에 곱할 배율, 0이면 지연 없이 재생
+    LLM_CASSETTE_TIME_SCALE: float = 1.0
+
+    # Speech Ingestion Configuration
+    # local: 네트워크 없이 동작하는 대체 구현, google: Google Cloud Speech-to-Text
+    STT_BACKEND: str = "local"
+    STT_LANGUAGE_CODE: str = "ko-KR"
+    # local 백엔드가 순서대로 반환할 발화 스크립트 (한 줄에 한 발화)
+    STT_LOCAL_TRANSCRIPTS_PATH: Optional[str] = None
+    # STT/메시지 파이프라인을 기다리는 발화 수가 이를 넘으면 오디오 수신을 멈춤
+    AUDIO_MAX_PENDING_SEGMENTS: int = 4
+
     # Google API Configuration
     GOOGLE_API_KEY: Optional[str] = os.getenv("GOOGLE_API_KEY")
 
@@ -1,7 +1,7 @@
 from . import logger
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
-from starlite import Response, status_codes
+from fastapi import status as status_codes
 from starlette.requests import Request
 
 
@@ -0,0 +1,211 @@
+import json
+import time
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from . import clients, logger, resilience
+from .cancellation import cancel_reason
+from .cassette import Cassette, CassetteEntry, get_cassette
+from .metrics import metrics
+from ..utils.prompt_utils import estimate_messages_tokens
+
+log = logger.get_logger(__name__)
+
+ResponseFormat = TypeVar("ResponseFormat", bound=BaseModel)
+
+# === Models ===
+
+@dataclass
+class LLMUsage:
+    """
+    track_usage 범위 안에서 완료된 LLM 호출의 누적 사용량.
+    """
+    n_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+_current_usage: ContextVar[Optional[LLMUsage]] = ContextVar("llm_usage", default=None)
+
+# === Functions ===
+
+@contextmanager
+def track_usage(usage: Optional[LLMUsage] = None) -> Iterator[LLMUsage]:
+    """
+    범위 안(해당 컨텍스트에서 생성된 태스크 포함)의 LLM 사용량을 `usage`에 누적합니다.
+    """
+    usage = usage if usage is not None else LLMUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+
+
+def _cached_tokens(usage) -> int:
+    details = getattr(usage, "prompt_tokens_details", None)
+    return (getattr(details, "cached_tokens", None) or 0) if details is not None else 0
+
+
+def _record_usage(pipeline: str, model: str, latency: float, usage) -> None:
+    metrics.increment("llm_calls_total", pipeline=pipeline, model=model)
+    metrics.observe("llm_latency_seconds", latency, pipeline=pipeline, model=model)
+    current_usage = _current_usage.get()
+    if current_usage is not None:
+        current_usage.n_calls += 1
+    if usage is None:
+        return
+
+    prompt_tokens = usage.prompt_tokens or 0
+    completion_tokens = usage.completion_tokens or 0
+    cached_tokens = _cached_tokens(usage)
+    if current_usage is not None:
+        current_usage.prompt_tokens += prompt_tokens
+        current_usage.completion_tokens += completion_tokens
+        current_usage.cached_tokens += cached_tokens
+    metrics.increment("llm_prompt_tokens_total", prompt_tokens, pipeline=pipeline, model=model)
+    metrics.increment("llm_completion_tokens_total", completion_tokens, pipeline=pipeline, model=model)
+
+    # 프롬프트 prefix 캐시 적중률과 적중 여부별 지연 시간
+    metrics.increment("llm_cached_tokens_total", cached_tokens, pipeline=pipeline, model=model)
+    metrics.observe(
+        "llm_latency_by_cache_seconds", latency,
+        pipeline=pipeline, model=model, cache="hit" if cached_tokens else "miss",
+    )
+
+
+async def _call(
+    pipeline: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    response_format: str,
+    request: Callable[[], Awaitable[Tuple[Any, Any]]],
+    encode: Callable[[Any], Any] = lambda response: response,
+    decode: Callable[[Any], Any] = lambda response: response,
+) -> Any:
+    """
+    request()로 LLM을 호출해 (응답, usage)를 받고 사용량을 기록합니다.
+    호출에는 마감 시간, 재시도, 헤징, 서킷 브레이커가 적용됩니다 (core.resilience).
+    카세트가 설정되어 있으면 encode한 응답을 기록하거나, 기록된 응답을 decode해 재생합니다.
+    """
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == "replay":
+        entry = cassette.replay(Cassette.request_key(model, messages, response_format), pipeline)
+        start = time.perf_counter()
+        if entry.latency * cassette.time_scale > 0:
+            await asyncio.sleep(entry.latency * cassette.time_scale)
+        _record_usage(pipeline, model, time.perf_counter() - start, entry.usage())
+        return decode(entry.response)
+
+    start = time.perf_counter()
+    try:
+        response, usage = await resilience.call_with_resilience(pipeline, model, request)
+    except asyncio.CancelledError as e:
+        # 취소로 절약한 호출 수와 (추정) 프롬프트 토큰
+        reason = cancel_reason(e)
+        metrics.increment("llm_cancelled_calls_total", pipeline=pipeline, model=model, reason=reason)
+        metrics.increment(
+            "llm_cancelled_prompt_tokens_total", estimate_messages_tokens(messages),
+            pipeline=pipeline, model=model, reason=reason,
+        )
+        raise
+    latency = time.perf_counter() - start
+    _record_usage(pipeline, model, latency, usage)
+
+    if cassette is not None and cassette.mode == "record":
+        cassette.record(CassetteEntry(
+            key=Cassette.request_key(model, messages, response_format),
+            pipeline=pipeline,
+            model=model,
+            response=encode(response),
+            latency=round(latency, 4),
+            prompt_tokens=(usage.prompt_tokens or 0) if usage is not None else 0,
+            completion_tokens=(usage.completion_tokens or 0) if usage is not None else 0,
+            cached_tokens=_cached_tokens(usage) if usage is not None else 0,
+        ))
+    return response
+
+
+async def parse(
+    pipeline: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    response_format: Type[ResponseFormat],
+) -> ResponseFormat:
+    """
+    Structured Output으로 LLM을 호출하고 파싱된 응답을 반환합니다.
+    호출 수, 지연 시간, 토큰 사용량을 pipeline/model 라벨로 기록합니다.
+    """
+    async def request():
+        response = await clients.async_openai_client.beta.chat.completions.parse(
+            messages=messages,
+            model=model,
+            response_format=response_format,
+        )
+        return response.choices[0].message.parsed, response.usage
+
+    return await _call(
+        pipeline, model, messages, response_format.__name__, request,
+        encode=lambda parsed: parsed.dict(),
+        decode=response_format.parse_obj,
+    )
+
+
+async def create_json(
+    pipeline: str,
+    model: str,
+    messages: List[Dict[str, str]],
+) -> Dict[str, Any]:
+    """
+    JSON 모드로 LLM을 호출하고 응답을 딕셔너리로 반환합니다.
+    """
+    async def request():
+        response = await clients.async_openai_client.chat.completions.create(
+            messages=messages,
+            model=model,
+            response_format={"type": "json_object"},
+        )
+        return json.loads(response.choices[0].message.content), response.usage
+
+    return await _call(pipeline, model, messages, "json_object", request)
+
+
+def prompt_cache_report() -> Dict[str, Dict[str, float]]:
+    """
+    파이프라인별 프롬프트 캐시 적중률(캐시된 프롬프트 토큰 비율)과
+    캐시 적중 시 절약된 평균 지연 시간을 반환합니다.
+    """
+    report: Dict[str, Dict[str, float]] = defaultdict(lambda: {
+        "prompt_tokens": 0.0,
+        "cached_tokens": 0.0,
+        "cache_hit_ratio": 0.0,
+        "latency_hit_seconds": 0.0,
+        "latency_miss_seconds": 0.0,
+        "latency_saved_seconds": 0.0,
+    })
+
+    for name, field in (("llm_prompt_tokens_total", "prompt_tokens"), ("llm_cached_tokens_total", "cached_tokens")):
+        for labels, value in metrics.get_counters(name):
+            report[labels["pipeline"]][field] += value
+
+    for labels, summary in metrics.get_summaries("llm_latency_by_cache_seconds"):
+        report[labels["pipeline"]][f"latency_{labels['cache']}_seconds"] = summary["mean"]
+
+    for entry in report.values():
+        if entry["prompt_tokens"]:
+            entry["cache_hit_ratio"] = entry["cached_tokens"] / entry["prompt_tokens"]
+        if entry["latency_hit_seconds"] and entry["latency_miss_seconds"]:
+            entry["latency_saved_seconds"] = entry["latency_miss_seconds"] - entry["latency_hit_seconds"]
+
+    return dict(report)
@@ -1,12 +1,138 @@
+import re
+import copy
+import time
+import queue
+import atexit
+import random
 import logging
+import threading
+import logging.handlers
+from contextlib import contextmanager
+from contextvars import ContextVar
 from logging.config import dictConfig
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from . import config
+
+# === Constants ===
+
+# 로그 레코드에 구조화된 필드로 붙이는 키 (extra 또는 log_context로 지정)
+STRUCTURED_FIELDS = ("conversation_id", "stage", "pipeline")
+
+_CONVERSATION_PATH_RE = re.compile(r"/conversation/(?P<conversation_id>[^/]+)(?:/(?P<stage>[^/]+))?")
+
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# === Filters & Formatters ===
+
+class ContextFilter(logging.Filter):
+    """
+    log_context로 지정된 필드를 레코드에 붙입니다. extra로 직접 넘긴 값이 우선합니다.
+    ContextVar를 읽어야 하므로 로그를 남기는 스레드(이벤트 루프)의 핸들러에 연결합니다.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    로거별 샘플링 비율과 초당 최대 레코드 수(토큰 버킷)를 적용합니다.
+    설정은 점으로 구분된 로거 이름의 가장 긴 prefix로 찾으며, ERROR 이상은 항상 통과시킵니다.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float], rate_limits: Dict[str, float]) -> None:
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self._policies: Dict[str, Tuple[float, Optional[float]]] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.n_dropped = 0
+
+    @staticmethod
+    def _lookup(name: str, table: Dict[str, float]) -> Optional[float]:
+        while True:
+            if name in table:
+                return table[name]
+            if "." not in name:
+                return table.get("")
+            name = name.rsplit(".", 1)[0]
+
+    def _policy(self, name: str) -> Tuple[float, Optional[float]]:
+        policy = self._policies.get(name)
+        if policy is None:
+            sample_rate = self._lookup(name, self.sample_rates)
+            policy = (1.0 if sample_rate is None else sample_rate, self._lookup(name, self.rate_limits))
+            self._policies[name] = policy
+        return policy
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        sample_rate, rate_limit = self._policy(record.name)
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            self.n_dropped += 1
+            return False
+        if rate_limit is None:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._buckets.get(record.name, (rate_limit, now))
+            tokens = min(rate_limit, tokens + (now - updated_at) * rate_limit)
+            if tokens < 1.0:
+                self._buckets[record.name] = (tokens, now)
+                self.n_dropped += 1
+                return False
+            self._buckets[record.name] = (tokens - 1.0, now)
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    기본 포맷 뒤에 구조화된 필드를 key=value 형태로 덧붙입니다.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = " ".join(
+            f"{key}={getattr(record, key)}" for key in STRUCTURED_FIELDS
+            if getattr(record, key, None) is not None
+        )
+        return f"{message} | {fields}" if fields else message
+
+
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler.prepare()는 로그를 남기는 스레드에서 msg % args와 예외 traceback을 포맷합니다.
+    이 핸들러는 레코드 사본을 그대로 큐에 넣어 포맷팅까지 QueueListener 스레드에서 처리하게 합니다.
+    레코드를 pickle하지 않으므로 같은 프로세스 안의 큐에만 사용합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+# === Setup ===
 
 def setup_logger():
+    """
+    루트 로거를 설정합니다. LOG_QUEUE_ENABLED이면 루트 로거에는 QueueHandler만 두고,
+    포맷팅과 stderr 쓰기는 QueueListener 스레드에서 처리해 이벤트 루프를 막지 않습니다.
+    """
+    global _listener
+    settings = config.settings
     logging_config = {
         "version": 1,
         "disable_existing_loggers": False,
         "formatters": {
             "default": {
+                "()": StructuredFormatter,
                 "format": "[%(asctime)s] %(levelname)s in %(name)s: %(message)s",
             },
         },
@@ -14,23 +140,72 @@ def setup_logger():
             "console": {
                 "class": "logging.StreamHandler",
                 "formatter": "default",
-                "level": "INFO",
+                "level": settings.LOG_LEVEL,
             },
         },
         "root": {
             "handlers": ["console"],
-            "level": "INFO",
+            "level": settings.LOG_LEVEL,
         },
     }
     dictConfig(logging_config)
 
+    root = logging.getLogger()
+    console = root.handlers[0]
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    if settings.LOG_QUEUE_ENABLED:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = DeferredFormatQueueHandler(log_queue)
+        root.removeHandler(console)
+        root.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+    else:
+        queue_handler = console
+
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMITS))
+
 setup_logger()
 
 def get_logger(name: str = __name__):
     return logging.getLogger(name)
 
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    범위 안(해당 컨텍스트에서 생성된 태스크 포함)의 로그 레코드에 구조화된 필드를 붙입니다.
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class LogContextMiddleware:
+    """
+    /conversation/{conversation_id}/{stage} 경로의 요청에 conversation_id와 stage 로그 필드를 붙이는 ASGI 미들웨어.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        match = _CONVERSATION_PATH_RE.search(scope.get("path", "")) if scope["type"] == "http" else None
+        if match is None:
+            return await self.app(scope, receive, send)
+        with log_context(conversation_id=match["conversation_id"], stage=match["stage"] or "conversation"):
+            return await self.app(scope, receive, send)
+
 # # 사용 예시 (각 모듈에서)
 # logger = get_logger(__name__)
 
 # def some_function():
 #     logger.info("This is a log message from %s", __name__)
+#     logger.info("Memory updated: %d memos", n_memos, extra={"stage": "memory"})
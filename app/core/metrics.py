@@ -0,0 +1,145 @@
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# === Constants ===
+
+RESERVOIR_SIZE = 1024
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# === Summary ===
+
+class _Summary:
+    """
+    관측값의 개수/합계/최솟값/최댓값과 최근 관측값 샘플을 보관하는 클래스.
+    분위수는 최근 RESERVOIR_SIZE개의 관측값으로 계산합니다.
+    """
+    __slots__ = ("count", "total", "min", "max", "recent")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.recent: Deque[float] = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+        return ordered[idx]
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "p50": self.quantile(0.50) or 0.0,
+            "p95": self.quantile(0.95) or 0.0,
+            "p99": self.quantile(0.99) or 0.0,
+        }
+
+
+# === MetricsRegistry ===
+
+class MetricsRegistry:
+    """
+    프로세스 내 카운터/요약 지표를 기록하는 클래스.
+    지표는 이름과 라벨(pipeline, model 등)의 조합으로 구분됩니다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self._summaries: Dict[str, Dict[LabelKey, _Summary]] = defaultdict(dict)
+
+    @staticmethod
+    def _label_key(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+    def increment(self, name: str, value: float = 1.0, **labels) -> None:
+        key = self._label_key(labels)
+        with self._lock:
+            self._counters[name][key] += value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = self._label_key(labels)
+        with self._lock:
+            summary = self._summaries[name].get(key)
+            if summary is None:
+                summary = self._summaries[name][key] = _Summary()
+            summary.observe(value)
+
+    def get_counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(self._label_key(labels), 0.0)
+
+    def get_summary(self, name: str, **labels) -> Optional[Dict[str, float]]:
+        """
+        이름과 라벨이 정확히 일치하는 요약 지표를 to_dict() 형식으로 반환합니다. 관측값이 없으면 None입니다.
+        """
+        with self._lock:
+            summary = self._summaries.get(name, {}).get(self._label_key(labels))
+            return summary.to_dict() if summary else None
+
+    def get_counters(self, name: str) -> List[Tuple[Dict[str, str], float]]:
+        """
+        이름이 일치하는 모든 카운터를 (라벨, 값) 목록으로 반환합니다.
+        """
+        with self._lock:
+            return [(dict(key), value) for key, value in self._counters.get(name, {}).items()]
+
+    def get_summaries(self, name: str) -> List[Tuple[Dict[str, str], Dict[str, float]]]:
+        """
+        이름이 일치하는 모든 요약 지표를 (라벨, to_dict()) 목록으로 반환합니다.
+        """
+        with self._lock:
+            return [(dict(key), summary.to_dict()) for key, summary in self._summaries.get(name, {}).items()]
+
+    def quantile(self, name: str, q: float, **labels) -> Optional[float]:
+        with self._lock:
+            summary = self._summaries.get(name, {}).get(self._label_key(labels))
+            return summary.quantile(q) if summary else None
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """
+        모든 지표를 `이름{라벨=값,...}` 형식의 키로 펼친 딕셔너리로 반환합니다.
+        """
+        def fmt(name: str, key: LabelKey) -> str:
+            if not key:
+                return name
+            return name + "{" + ",".join(f"{k}={v}" for k, v in key) + "}"
+
+        with self._lock:
+            return {
+                "counters": {
+                    fmt(name, key): value
+                    for name, series in self._counters.items()
+                    for key, value in series.items()
+                },
+                "summaries": {
+                    fmt(name, key): summary.to_dict()
+                    for name, series in self._summaries.items()
+                    for key, summary in series.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+# 싱글톤 패턴으로 MetricsRegistry 인스턴스 생성
+metrics = MetricsRegistry()
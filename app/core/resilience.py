@@ -0,0 +1,246 @@
+import sys
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from . import logger
+from .config import settings
+from .metrics import metrics
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+# 재시도할 HTTP 상태 코드 (5xx도 재시도)
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+# 재시도할 일시적인 연결 오류. openai.APIConnectionError(APITimeoutError 포함)는 is_retryable에서 확인
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError)
+
+HEDGED = "hedged"
+
+# === Exceptions ===
+
+class CircuitOpenError(RuntimeError):
+    """
+    모델의 서킷 브레이커가 열려 있어 호출하지 않은 경우.
+    """
+
+# === CircuitBreaker ===
+
+class CircuitBreaker:
+    """
+    모델별 연속 실패를 세어 임계값을 넘으면 일정 시간 호출을 차단하는 클래스.
+
+    closed: 정상 호출, open: 호출 차단(CircuitOpenError),
+    half_open: 차단 시간이 지나면 한 번의 시험 호출만 허용하고 성공하면 closed로 돌아갑니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.n_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                metrics.increment("llm_circuit_rejected_total", model=self.name)
+                raise CircuitOpenError(f"Circuit for {self.name} is open")
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self._probing:
+                metrics.increment("llm_circuit_rejected_total", model=self.name)
+                raise CircuitOpenError(f"Circuit for {self.name} is half-open")
+            self._probing = True
+
+    def record_success(self) -> None:
+        self.n_failures = 0
+        self._probing = False
+        if self.state != "closed":
+            self._transition("closed")
+
+    def record_failure(self) -> None:
+        self.n_failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.n_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != "open":
+                self._transition("open")
+
+    def record_ignored(self) -> None:
+        # 취소되었거나 서비스 장애가 아닌 오류(4xx, 응답 파싱 실패 등)로 끝난 호출은
+        # 성공/실패로 보지 않고, 시험 호출이었다면 다음 호출이 다시 시험하도록 함
+        self._probing = False
+
+    def _transition(self, state: str) -> None:
+        log.warning("Circuit breaker for %s: %s -> %s", self.name, self.state, state)
+        metrics.increment("llm_circuit_transitions_total", model=self.name, state=state)
+        self.state = state
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(model: str) -> CircuitBreaker:
+    breaker = _breakers.get(model)
+    if breaker is None:
+        breaker = _breakers[model] = CircuitBreaker(
+            model,
+            failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.LLM_CIRCUIT_RESET_SECONDS,
+        )
+    return breaker
+
+# === Functions ===
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    연결 오류, 타임아웃, 408/409/429, 5xx만 재시도하고 서킷 브레이커의 실패로 셉니다.
+    그 밖의 4xx, 응답 파싱/검증 오류, 코드 오류는 다시 호출해도 같은 결과이므로 제외합니다.
+    """
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    # openai는 첫 사용 시점에 임포트되므로(clients), 아직 임포트되지 않았다면 openai 오류일 수 없음
+    openai = sys.modules.get("openai")
+    if openai is None:
+        return False
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^attempt))."""
+    return random.uniform(0.0, min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def pipeline_deadline(pipeline: str) -> Optional[float]:
+    deadline = settings.LLM_PIPELINE_DEADLINES.get(pipeline, settings.LLM_CALL_DEADLINE_SECONDS)
+    return deadline or None
+
+
+def hedge_delay(pipeline: str, model: str) -> Optional[float]:
+    """
+    중복 요청을 보내기까지 기다릴 시간. 충분한 관측값이 쌓인 경우 요청 한 번의 지연 시간 p95를 사용합니다.
+    재시도, 백오프, 헤징을 포함한 전체 호출 시간(llm_latency_seconds)을 쓰면 실패가 늘수록 기준이 올라가므로
+    성공한 개별 요청의 지연 시간(llm_attempt_latency_seconds)을 사용합니다.
+    """
+    if not settings.LLM_HEDGE_ENABLED:
+        return None
+    summary = metrics.get_summary("llm_attempt_latency_seconds", pipeline=pipeline, model=model)
+    if summary is None or summary["count"] < settings.LLM_HEDGE_MIN_SAMPLES:
+        return None
+    p95 = metrics.quantile("llm_attempt_latency_seconds", settings.LLM_HEDGE_QUANTILE, pipeline=pipeline, model=model)
+    return max(p95, settings.LLM_HEDGE_MIN_DELAY) if p95 is not None else None
+
+
+async def _timed(
+    pipeline: str,
+    model: str,
+    request: Callable[[], Awaitable[Tuple[Any, Any]]],
+) -> Tuple[Any, Any]:
+    start = time.perf_counter()
+    result = await request()
+    metrics.observe("llm_attempt_latency_seconds", time.perf_counter() - start, pipeline=pipeline, model=model)
+    return result
+
+
+async def _hedged(
+    pipeline: str,
+    model: str,
+    request: Callable[[], Awaitable[Tuple[Any, Any]]],
+) -> Tuple[Any, Any]:
+    """
+    request()가 p95 안에 끝나지 않으면 같은 요청을 한 번 더 보내고 먼저 성공한 응답을 사용합니다.
+    """
+    delay = hedge_delay(pipeline, model)
+    primary = asyncio.ensure_future(_timed(pipeline, model, request))
+    if delay is None:
+        return await primary
+
+    tasks = [primary]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            metrics.increment("llm_hedged_requests_total", pipeline=pipeline, model=model)
+            tasks.append(asyncio.ensure_future(_timed(pipeline, model, request)))
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if len(tasks) > 1:
+                        metrics.increment(
+                            "llm_hedge_wins_total", pipeline=pipeline, model=model,
+                            winner="hedge" if task is tasks[1] else "primary",
+                        )
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel(HEDGED)
+
+
+async def call_with_resilience(
+    pipeline: str,
+    model: str,
+    request: Callable[[], Awaitable[Tuple[Any, Any]]],
+) -> Tuple[Any, Any]:
+    """
+    서킷 브레이커, 파이프라인별 마감 시간, 지터 백오프 재시도, 꼬리 지연 헤징을 적용해 request()를 호출합니다.
+
+    Raises:
+        CircuitOpenError: 모델의 서킷 브레이커가 열려 있는 경우.
+        TimeoutError: 마감 시간 안에 성공하지 못한 경우.
+    """
+    breaker = get_circuit_breaker(model)
+    loop = asyncio.get_running_loop()
+    deadline = pipeline_deadline(pipeline)
+    expires_at = loop.time() + deadline if deadline is not None else None
+
+    attempt = 0
+    while True:
+        breaker.before_call()
+        remaining = expires_at - loop.time() if expires_at is not None else None
+        try:
+            result = await asyncio.wait_for(_hedged(pipeline, model, request), timeout=remaining)
+        except asyncio.CancelledError:
+            breaker.record_ignored()
+            raise
+        except Exception as e:
+            retryable = is_retryable(e)
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+            timed_out = isinstance(e, TimeoutError)
+            metrics.increment(
+                "llm_errors_total", pipeline=pipeline, model=model,
+                error="timeout" if timed_out else type(e).__name__,
+            )
+            delay = backoff_delay(attempt)
+            if (
+                timed_out
+                or attempt >= settings.LLM_MAX_RETRIES
+                or not retryable
+                or (expires_at is not None and loop.time() + delay >= expires_at)
+            ):
+                raise
+            attempt += 1
+            metrics.increment("llm_retries_total", pipeline=pipeline, model=model)
+            log.warning("Retrying %s (%s) in %.2fs after %s: %s", pipeline, model, delay, type(e).__name__, e)
+            await asyncio.sleep(delay)
+            continue
+
+        breaker.record_success()
+        return result
@@ -5,20 +5,28 @@ from fastapi.responses import HTMLResponse
 from fastapi import Request
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi import HTTPException
+from fastapi import status as status_codes
 
 from .api.v1 import (
+    admin,
     conversation,
 )
 from .core import (
+    admission,
     config,
-    exceptions
+    exceptions,
+    logger,
 )
+from .services import warmup
+from .utils import json_utils
 
 
 app = FastAPI(
     title=config.settings.PROJECT_NAME,
     description=config.settings.PROJECT_DESCRIPTION,
     version=config.settings.PROJECT_VERSION,
+    default_response_class=json_utils.FastJSONResponse,
 )
 
 
@@ -27,6 +35,13 @@ app.add_exception_handler(Exception, exceptions.general_exception_handler)
 app.add_exception_handler(exceptions.HTTPException, exceptions.http_exception_handler)
 
 
+# 요청 경로의 conversation_id/stage를 로그 필드로 사용
+app.add_middleware(logger.LogContextMiddleware)
+
+# 동시 처리 수 제한과 과부하 시 단계적 성능 저하/요청 거절
+app.add_middleware(admission.AdmissionMiddleware)
+
+
 # CORS settings
 # origins = [
 #     "http://localhost",
@@ -41,12 +56,34 @@ app.add_exception_handler(exceptions.HTTPException, exceptions.http_exception_ha
 #     allow_headers=["*"],
 # )
 
+# LAZY_INIT 모드에서도 트래픽을 받기 전에 초기화를 마치도록 시작 시 워밍업
+if config.settings.WARMUP_ON_STARTUP:
+    app.add_event_handler("startup", warmup.warm_up)
+
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
+
+
+@app.get("/ready")
+async def ready():
+    # 준비 상태 확인(readiness probe) 시 첫 호출에서 워밍업 수행
+    try:
+        timings = await warmup.warm_up()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status_codes.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Warm-up failed: {e}"
+        )
+    return {"ready": True, "warmup_seconds": timings}
     
 # Include routers
 app.include_router(
     conversation.router, 
     prefix="/api/v1"
+)
+app.include_router(
+    admin.router,
+    prefix="/api/v1"
 )
\ No newline at end of file
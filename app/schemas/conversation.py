@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Union
+from typing import List, Optional, Union
 from datetime import datetime
 
 from ..services.elements import Message
@@ -35,15 +35,50 @@ class DeleteConversationOutput(BaseModel):
     conversation_id: str
     deleted_at: datetime
     
+class ImportConversationOutput(BaseModel):
+    conversation_id: str
+    n_messages: int
+    imported_at: datetime
+
 class UpdateConversationOutput(BaseModel):
     scores: score_service.ConversationScores
     
 class GetRealtimeMemoryOutput(BaseModel):
+    revision: int = 0
     partner_memory: memory_service.PartnerMemory
+
+class PartnerMemo(BaseModel):
+    revision: int
+    category: str
+    content: str
+
+class GetRealtimeMemoryDeltaOutput(BaseModel):
+    revision: int
+    since: int
+    # since 이후의 변경을 메모 목록으로 표현할 수 없으면 True이며, partner_memory에 전체 메모가 담김
+    full: bool = False
+    memos: List[PartnerMemo] = []
+    partner_memory: Optional[memory_service.PartnerMemory] = None
     
 class GetRealtimeAnalysisOutput(BaseModel):
+    revision: int = 0
     scores: score_service.ConversationScores
 
+class PartnerReactionCounts(BaseModel):
+    positive: int
+    negative: int
+
+class GetScoreSeriesOutput(BaseModel):
+    revision: int
+    metric: str
+    method: str
+    # 다운샘플링 전 시계열 길이와 용량 초과로 밀려난 값의 수
+    n_total: int
+    n_dropped: int
+    # [타임스탬프(초), 값] 목록
+    points: List[List[float]]
+    partner_reactions: PartnerReactionCounts
+
 class GetBreaktimeAdviceOutput(BaseModel):
     advice_id: str
     advice: advice_service.Advice
@@ -51,5 +86,11 @@ class GetBreaktimeAdviceOutput(BaseModel):
 class RecommendBreaktimeAdviceOutput(BaseModel):
     advice_metadatas: List[advice_service.AdviceMetadata]
     
+class IngestAudioOutput(BaseModel):
+    messages: List[Message]
+    n_segments: int
+    audio_seconds: float
+    scores: score_service.ConversationScores
+
 class GetFinalReportOutput(BaseModel):
     final_report: str
\ No newline at end of file
@@ -0,0 +1,160 @@
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from ..core import logger
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+COLUMNS = (
+    "active",
+    "started_at",
+    "last_message_at",
+    "n_messages",
+    "n_partner_messages",
+    "n_memos",
+    "user_engagement",
+    "partner_engagement",
+    "user_talk_share",
+)
+INITIAL_CAPACITY = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+# === FleetTable ===
+
+class FleetTable:
+    """
+    진행 중인 모든 대화의 요약 지표를 열(column) 단위 array('d')로 보관하는 클래스.
+
+    대화마다 하나의 행(slot)을 할당하고, 메시지/메모/점수가 바뀔 때 해당 행만 갱신합니다.
+    삭제된 대화의 행은 active=0으로 표시하고 재사용합니다.
+    분석 시에는 열을 그대로 복사해 NumPy 배열로 사용하므로 대화 객체를 순회하지 않습니다.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY) -> None:
+        self.capacity = capacity
+        self.columns: Dict[str, array] = {name: array("d", bytes(8 * capacity)) for name in COLUMNS}
+        self.n_rows = 0
+        self._free: List[int] = []
+
+    def allocate(self) -> "FleetRow":
+        if self._free:
+            slot = self._free.pop()
+        else:
+            if self.n_rows == self.capacity:
+                self._grow()
+            slot = self.n_rows
+            self.n_rows += 1
+        for column in self.columns.values():
+            column[slot] = 0.0
+        self.columns["active"][slot] = 1.0
+        return FleetRow(self, slot)
+
+    def release(self, row: "FleetRow") -> None:
+        self.columns["active"][row.slot] = 0.0
+        self._free.append(row.slot)
+        row.table = None
+
+    def _grow(self) -> None:
+        for column in self.columns.values():
+            column.frombytes(bytes(8 * self.capacity))
+        self.capacity *= 2
+
+    def snapshot(self) -> Dict[str, bytes]:
+        """사용 중인 행 범위의 각 열을 bytes로 복사합니다 (행 수에 비례하는 memcpy)."""
+        return {name: column[:self.n_rows].tobytes() for name, column in self.columns.items()}
+
+
+class FleetRow:
+    """
+    FleetTable에서 한 대화에 할당된 행. ConversationMemory/ConversationScorer가 상태를 바꿀 때 호출합니다.
+    """
+    __slots__ = ("table", "slot")
+
+    def __init__(self, table: FleetTable, slot: int) -> None:
+        self.table: Optional[FleetTable] = table
+        self.slot = slot
+
+    def set(self, column: str, value: float) -> None:
+        if self.table is not None:
+            self.table.columns[column][self.slot] = value
+
+    def on_message(self, role: str, timestamp: float) -> None:
+        if self.table is None:
+            return
+        columns = self.table.columns
+        columns["n_messages"][self.slot] += 1
+        if role == "파트너":
+            columns["n_partner_messages"][self.slot] += 1
+        columns["last_message_at"][self.slot] = timestamp
+
+    def on_memo(self) -> None:
+        if self.table is not None:
+            self.table.columns["n_memos"][self.slot] += 1
+
+    def on_scores(self, user_engagement: float, partner_engagement: float, user_talk_share: float) -> None:
+        self.set("user_engagement", user_engagement)
+        self.set("partner_engagement", partner_engagement)
+        self.set("user_talk_share", user_talk_share)
+
+
+# === Functions ===
+
+def _distribution(np, values) -> Dict[str, float]:
+    if values.size == 0:
+        return {"count": 0}
+    quantiles = np.quantile(values, QUANTILES)
+    summary = {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+    summary.update({f"p{int(q * 100)}": float(v) for q, v in zip(QUANTILES, quantiles)})
+    return summary
+
+
+def fleet_analytics(table: FleetTable, now: Optional[float] = None, histogram_bins: int = 10) -> Dict[str, object]:
+    """
+    진행 중인 모든 대화의 참여도, 발화 비율, 분당 메시지 수, 메모 수, 세션 경과 시간의 분포를 계산합니다.
+    NumPy가 필요합니다.
+    """
+    import numpy as np
+
+    now = time.time() if now is None else now
+    columns = {name: np.frombuffer(data, dtype=np.float64) for name, data in table.snapshot().items()}
+    active = columns["active"] > 0
+    started_at = columns["started_at"][active]
+    age_seconds = now - started_at
+    n_messages = columns["n_messages"][active]
+    has_messages = n_messages > 0
+    # 세션 시작 후 1분 이내는 1분으로 보고 분당 메시지 수를 계산
+    message_rate = n_messages / np.maximum(age_seconds / 60.0, 1.0)
+    idle_seconds = now - columns["last_message_at"][active][has_messages]
+
+    values = {
+        "user_engagement": columns["user_engagement"][active][has_messages],
+        "partner_engagement": columns["partner_engagement"][active][has_messages],
+        "user_talk_share": columns["user_talk_share"][active][has_messages],
+        "messages_per_minute": message_rate,
+        "n_messages": n_messages,
+        "n_memos": columns["n_memos"][active],
+        "session_age_seconds": age_seconds,
+        "idle_seconds": idle_seconds,
+    }
+    report: Dict[str, object] = {
+        "n_active": int(active.sum()),
+        "n_with_messages": int(has_messages.sum()),
+        "distributions": {name: _distribution(np, column) for name, column in values.items()},
+    }
+    # 0~4 범위 점수의 히스토그램
+    histograms = {}
+    for name in ("user_engagement", "partner_engagement"):
+        counts, edges = np.histogram(values[name], bins=histogram_bins, range=(0.0, 4.0))
+        histograms[name] = {"counts": counts.tolist(), "edges": edges.tolist()}
+    counts, edges = np.histogram(values["user_talk_share"], bins=histogram_bins, range=(0.0, 1.0))
+    histograms["user_talk_share"] = {"counts": counts.tolist(), "edges": edges.tolist()}
+    report["histograms"] = histograms
+    return report
@@ -1,7 +1,9 @@
 from typing import Dict
 from ..core import logger
+from .fleet import FleetTable
 from .session_services.memory import ConversationMemory
 from .session_services.score import ConversationScorer
+from .session_services import snapshot
 
 log = logger.get_logger(__name__)
 
@@ -17,6 +19,8 @@ class ConversationManager:
         # 대화 ID별로 ConversationMemory와 ConversationScorer를 저장하는 딕셔너리
         self._conversation_memories: Dict[str, ConversationMemory] = {}
         self._conversation_scorers: Dict[str, ConversationScorer] = {}
+        # 진행 중인 대화의 요약 지표를 열 단위로 보관 (GET /admin/fleet)
+        self.fleet = FleetTable()
 
     def is_conversation_exists(self, conversation_id: str) -> bool:
         """
@@ -45,13 +49,14 @@ class ConversationManager:
             raise ValueError("대화 ID는 비어 있을 수 없습니다.")
 
         if self.is_conversation_exists(conversation_id):
-            log.info(f"대화 ID {conversation_id}가 이미 존재합니다. 재초기화합니다.")
+            log.info("대화 ID %s가 이미 존재합니다. 재초기화합니다.", conversation_id)
             self.delete_conversation(conversation_id)
 
         # ConversationMemory와 ConversationScorer를 초기화
         self._conversation_memories[conversation_id] = ConversationMemory()
         self._conversation_scorers[conversation_id] = ConversationScorer()
-        log.info(f"대화가 초기화되었습니다. ID: {conversation_id}")
+        self._attach_fleet_row(conversation_id)
+        log.info("대화가 초기화되었습니다. ID: %s", conversation_id)
 
     def delete_conversation(self, conversation_id: str) -> None:
         """
@@ -63,17 +68,20 @@ class ConversationManager:
         removed = False
 
         # 대화 메모리 삭제
-        if self._conversation_memories.pop(conversation_id, None) is not None:
+        memory = self._conversation_memories.pop(conversation_id, None)
+        if memory is not None:
             removed = True
+            if memory.fleet_row is not None:
+                self.fleet.release(memory.fleet_row)
 
         # 대화 스코어러 삭제
         if self._conversation_scorers.pop(conversation_id, None) is not None:
             removed = True
 
         if removed:
-            log.info(f"대화가 삭제되었습니다. ID: {conversation_id}")
+            log.info("대화가 삭제되었습니다. ID: %s", conversation_id)
         else:
-            log.warning(f"존재하지 않는 대화 ID를 삭제하려고 시도했습니다. ID: {conversation_id}")
+            log.warning("존재하지 않는 대화 ID를 삭제하려고 시도했습니다. ID: %s", conversation_id)
 
     def get_conversation_memory(self, conversation_id: str) -> ConversationMemory:
         """
@@ -90,7 +98,7 @@ class ConversationManager:
         """
         memory = self._conversation_memories.get(conversation_id)
         if memory is None:
-            log.error(f"대화 메모리가 존재하지 않습니다. ID: {conversation_id}")
+            log.error("대화 메모리가 존재하지 않습니다. ID: %s", conversation_id)
             raise ValueError(f"대화 메모리가 존재하지 않습니다. ID: {conversation_id}")
         return memory
 
@@ -109,10 +117,72 @@ class ConversationManager:
         """
         scorer = self._conversation_scorers.get(conversation_id)
         if scorer is None:
-            log.error(f"대화 스코어러가 존재하지 않습니다. ID: {conversation_id}")
+            log.error("대화 스코어러가 존재하지 않습니다. ID: %s", conversation_id)
             raise ValueError(f"대화 스코어러가 존재하지 않습니다. ID: {conversation_id}")
         return scorer
 
+    def snapshot_conversation(self, conversation_id: str) -> bytes:
+        """
+        주어진 대화 ID의 메모리와 스코어러 상태를 스냅샷(JSON bytes)으로 반환합니다.
+
+        Args:
+            conversation_id (str): 스냅샷을 만들 대화 ID.
+
+        Returns:
+            bytes: snapshot.encode_session으로 인코딩한 스냅샷.
+        """
+        return snapshot.encode_session(
+            self.get_conversation_memory(conversation_id),
+            self.get_conversation_scorer(conversation_id),
+        )
+
+    def restore_conversation(self, conversation_id: str, data: bytes) -> None:
+        """
+        스냅샷으로 대화를 복원합니다. 같은 ID의 대화가 있으면 덮어씁니다.
+
+        Args:
+            conversation_id (str): 복원할 대화 ID.
+            data (bytes): snapshot_conversation으로 만든 스냅샷.
+
+        Raises:
+            ValueError: 스냅샷 형식이나 버전이 맞지 않는 경우.
+        """
+        conversation_memory, conversation_scorer = snapshot.decode_session(data)
+        self.set_conversation(conversation_id, conversation_memory, conversation_scorer)
+        log.info("대화가 복원되었습니다. ID: %s", conversation_id)
+
+    def set_conversation(
+        self,
+        conversation_id: str,
+        conversation_memory: ConversationMemory,
+        conversation_scorer: ConversationScorer,
+    ) -> None:
+        """
+        이미 복원한 메모리와 스코어러로 대화를 등록합니다. 같은 ID의 대화가 있으면 덮어씁니다.
+        """
+        previous = self._conversation_memories.get(conversation_id)
+        if previous is not None and previous.fleet_row is not None:
+            self.fleet.release(previous.fleet_row)
+        self._conversation_memories[conversation_id] = conversation_memory
+        self._conversation_scorers[conversation_id] = conversation_scorer
+        self._attach_fleet_row(conversation_id)
+
+    def _attach_fleet_row(self, conversation_id: str) -> None:
+        """
+        대화에 FleetTable 행을 할당하고 현재 상태로 채웁니다.
+        """
+        memory = self._conversation_memories[conversation_id]
+        scorer = self._conversation_scorers[conversation_id]
+        row = self.fleet.allocate()
+        row.set("started_at", memory.start_time.timestamp())
+        for message in memory.messages:
+            row.on_message(message.role, message.timestamp.timestamp())
+        row.set("n_memos", sum(len(memos) for memos in memory.partner_memory.content.values()))
+        scores = scorer.get_scores()
+        row.on_scores(scores.user_engagement, scores.partner_engagement, scores.user_talk_share)
+        memory.fleet_row = row
+        scorer.fleet_row = row
+
 
 # 싱글톤 패턴으로 ConversationManager 인스턴스 생성
 conversation_manager = ConversationManager()
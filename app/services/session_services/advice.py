@@ -1,4 +1,5 @@
 import json
+import time
 import pathlib
 import asyncio
 import itertools
@@ -8,16 +9,22 @@ from dataclasses import dataclass
 from collections import Counter, defaultdict
 
 from .. import elements
-from . import memory
+from . import memory, score
 
 from ...core import (
-    clients,
     config,
+    llm,
     logger
 )
+from ...core.admission import admission_controller
+from ...core.metrics import metrics
 from ...utils.prompt_utils import (
     load_prompt,
+    build_prompt_messages,
+    PromptSection,
+    Stability,
 )
+from ...utils.text_utils import BM25Index
 
 log = logger.get_logger(__name__)
 
@@ -46,16 +53,149 @@ class Advice(BaseModel):
 # ========== Constants =========
 
 N_MESSAGES = 15
+# 프롬프트에 넣을 파트너 메모를 고를 때 질의로 사용하는 최근 메시지 수
+N_MEMO_QUERY_MESSAGES = 3
 MAX_RECOMMENDATIONS = 5
 
+# LocalAdviceRecommender 대화 신호 기준 (감정 점수는 0~4 척도)
+LOW_ENGAGEMENT = 2.5
+HIGH_ENGAGEMENT = 3.5
+DOMINANT_TALK_SHARE = 0.65
+FEW_PARTNER_MESSAGES = 5
+# blend 모드에서 로컬 순위를 LLM 순위 몇 개 분량의 표로 반영할지
+LOCAL_BLEND_VOTES = 2
+
 ADVICE_METADATAS_PATH = pathlib.Path(__file__).parent.parent.parent / "advice_metadatas.json"
-ADVICE_METADATAS_JSON = json.loads(ADVICE_METADATAS_PATH.read_text(encoding="utf-8"))
-ADVICE_METADATAS = {
-    advice_id: AdviceMetadata(
-        advice_id=advice_id,
-        **metadata
-    ) for advice_id, metadata in ADVICE_METADATAS_JSON.items()
-}
+
+# ========== AdviceCatalog ==========
+
+def normalize_advice_id(advice_id: str) -> str:
+    """
+    Normalizes an advice ID for lookups: removes all whitespace and lowercases it.
+    """
+    return ''.join(advice_id.split()).lower()
+
+
+def advice_metadata_to_block(advice_metadata: AdviceMetadata) -> str:
+    return (
+        f"ID: {advice_metadata.advice_id}\n"
+        f"- 제목: {advice_metadata.emoji} {advice_metadata.title}\n"
+        f"- 설명: {advice_metadata.description}\n"
+        f"- 요구사항: {advice_metadata.prompt_instruction}\n"
+    )
+
+
+@dataclass(frozen=True)
+class _AdviceCatalogSnapshot:
+    version: int
+    metadatas: Dict[str, AdviceMetadata]
+    normalized_index: Dict[str, AdviceMetadata]
+    blocks: Dict[str, str]
+    list_block: str
+    # Conversation signals (see LocalAdviceRecommender) each advice is suited for
+    signals: Dict[str, List[str]]
+    # BM25 index over each advice's title, description and instruction, in `metadatas` order
+    bm25_index: BM25Index
+
+
+class AdviceCatalog:
+    """
+    Advice metadata catalog backed by a JSON file.
+    Builds a normalized-key index and pre-rendered prompt blocks once per version,
+    and reloads itself when the file changes on disk. The file is first read on first use.
+    """
+
+    def __init__(self, path: pathlib.Path, reload_interval: float = 0.0) -> None:
+        self.path = path
+        self.reload_interval = reload_interval
+        self._mtime_ns: Optional[int] = None
+        self._last_checked = 0.0
+        self._snapshot: Optional[_AdviceCatalogSnapshot] = None
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        stat = self.path.stat()
+        metadatas_json = json.loads(self.path.read_text(encoding="utf-8"))
+        self._mtime_ns = stat.st_mtime_ns
+        return metadatas_json
+
+    @staticmethod
+    def _build_snapshot(version: int, metadatas_json: Dict[str, Dict[str, Any]]) -> _AdviceCatalogSnapshot:
+        metadatas = {
+            advice_id: AdviceMetadata(
+                advice_id=advice_id,
+                **{k: v for k, v in metadata.items() if k != "signals"}
+            ) for advice_id, metadata in metadatas_json.items()
+        }
+        bm25_index = BM25Index()
+        for metadata in metadatas.values():
+            bm25_index.add(f"{metadata.title} {metadata.description} {metadata.prompt_instruction}")
+        blocks = {
+            advice_id: advice_metadata_to_block(metadata)
+            for advice_id, metadata in metadatas.items()
+        }
+        list_block = (
+            "### 💡 '나'에게 소개팅 도중 제공 가능한 조언 목록:\n"
+            "----------------------\n"
+            + '\n'.join(blocks.values())
+            + "----------------------\n\n"
+        )
+        return _AdviceCatalogSnapshot(
+            version=version,
+            metadatas=metadatas,
+            normalized_index={normalize_advice_id(k): v for k, v in metadatas.items()},
+            blocks=blocks,
+            list_block=list_block,
+            signals={
+                advice_id: list(metadata.get("signals", []))
+                for advice_id, metadata in metadatas_json.items()
+            },
+            bm25_index=bm25_index,
+        )
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot is not None else 0
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reloads the catalog if the file has changed (or if forced).
+        On a parse error the current version is kept. Returns True if a new version was loaded.
+        """
+        try:
+            if not force and self.path.stat().st_mtime_ns == self._mtime_ns:
+                return False
+            snapshot = self._build_snapshot(
+                version=self.version + 1,
+                metadatas_json=self._read(),
+            )
+        except (OSError, ValueError, TypeError) as e:
+            log.error("Failed to reload advice catalog from %s: %s", self.path, e)
+            return False
+
+        self._snapshot = snapshot
+        log.info("Advice catalog reloaded: version=%s, n_advices=%d", snapshot.version, len(snapshot.metadatas))
+        return True
+
+    def current(self) -> _AdviceCatalogSnapshot:
+        """
+        Returns the current catalog version, checking the file for changes at most
+        once per `reload_interval` seconds.
+        """
+        if self._snapshot is None:
+            self._last_checked = time.monotonic()
+            self._snapshot = self._build_snapshot(version=1, metadatas_json=self._read())
+        elif self.reload_interval > 0:
+            now = time.monotonic()
+            if now - self._last_checked >= self.reload_interval:
+                self._last_checked = now
+                self.reload()
+        return self._snapshot
+
+
+ADVICE_CATALOG = AdviceCatalog(
+    ADVICE_METADATAS_PATH,
+    reload_interval=config.settings.ADVICE_CATALOG_RELOAD_INTERVAL,
+)
     
 # ========= Functions =========
 
@@ -64,29 +204,18 @@ def get_advice_metadata(
 ) -> Optional[AdviceMetadata]:
     """
     Retrieves the advice metadata for a given advice ID.
-    Tries to match safely by normalizing and fallback to case-insensitive search.
+    Tries an exact match first, then a case- and whitespace-insensitive index lookup.
     """
     if not advice_id or not isinstance(advice_id, str):
         return None
+    return _find_advice_metadata(ADVICE_CATALOG.current(), advice_id)
 
-    normalized_id = advice_id.strip()
-    # First, try exact match
-    metadata = ADVICE_METADATAS.get(normalized_id)
+def _find_advice_metadata(catalog: _AdviceCatalogSnapshot, advice_id: str) -> Optional[AdviceMetadata]:
+    metadata = catalog.metadatas.get(advice_id.strip())
     if metadata:
         return metadata
 
-    # Try case-insensitive match
-    for key, value in ADVICE_METADATAS.items():
-        if key.lower() == normalized_id.lower():
-            return value
-
-    # Try whitespace-insensitive match
-    normalized_id_ws = ''.join(normalized_id.split())
-    for key, value in ADVICE_METADATAS.items():
-        if ''.join(key.split()).lower() == normalized_id_ws.lower():
-            return value
-
-    return None
+    return catalog.normalized_index.get(normalize_advice_id(advice_id))
 
 def is_advice_exists(
     advice_id: str
@@ -94,20 +223,15 @@ def is_advice_exists(
     """
     Checks if the advice ID exists in the metadata.
     """
-    return advice_id in ADVICE_METADATAS
+    return advice_id in ADVICE_CATALOG.current().metadatas
 
 def advice_metadata_to_str(
     advice_id: str
 ) -> str:
-    advice_metadata = get_advice_metadata(advice_id)
-    advice_str = (
-        f"ID: {advice_metadata.advice_id}\n"
-        f"- 제목: {advice_metadata.emoji} {advice_metadata.title}\n"
-        f"- 설명: {advice_metadata.description}\n"
-        f"- 요구사항: {advice_metadata.prompt_instruction}\n"
-    )
-    
-    return advice_str
+    # Look up the metadata and its block in one catalog version, so a reload in between cannot raise KeyError
+    catalog = ADVICE_CATALOG.current()
+    advice_metadata = _find_advice_metadata(catalog, advice_id)
+    return catalog.blocks[advice_metadata.advice_id]
 
 def prompt_advice_metadata(advice_id: str):
     advice_section = (
@@ -120,12 +244,11 @@ def prompt_advice_metadata(advice_id: str):
     return advice_section
 
 def prompt_advice_metadata_list():
-    advice_section = "### 💡 '나'에게 소개팅 도중 제공 가능한 조언 목록:\n"
-    advice_section += "----------------------\n"
-    advice_section += '\n'.join([advice_metadata_to_str(advice_id) for advice_id in ADVICE_METADATAS])
-    advice_section += "----------------------\n\n"
+    return ADVICE_CATALOG.current().list_block
 
-    return advice_section
+def recent_messages_query(conversation_memory: memory.ConversationMemory) -> str:
+    # 메모 선택 질의로 사용할 최근 메시지
+    return ' '.join(msg.content for msg in conversation_memory.get_recent_messages(N_MEMO_QUERY_MESSAGES))
 
 # ========= BreaktimeAdviceGenerator =========
 
@@ -133,37 +256,37 @@ class BreaktimeAdviceGenerator():
     PROMPT_NAME = "advice/advice_generator"
     PROMPT_VER = 1
     LLM_MODEL = "gpt-4.1-nano"
+    PROMPT_TOKEN_BUDGET = 6000
 
     @classmethod
     def _generate_prompt(cls, advice_id: str, conversation_memory: memory.ConversationMemory) -> List[Dict[str, str]]:
-        system_message = {
-            "role": "system",
-            "content": load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER)
-        }
-        user_message = {
-            "role": "user",
-            "content": '\n---\n'.join([
-                prompt_advice_metadata(advice_id),
-                conversation_memory.prompt_conversation_info(),
-                conversation_memory.prompt_partner_memory(),
-                conversation_memory.prompt_messages(n_messages=N_MESSAGES),
-            ])
-        }
-
-        return [system_message, user_message]
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER),
+            sections=[
+                PromptSection(prompt_advice_metadata(advice_id), stability=Stability.STATIC),
+                conversation_memory.partner_memory_prompt_section(
+                    query=f"{advice_metadata_to_str(advice_id)} {recent_messages_query(conversation_memory)}", priority=1
+                ),
+                PromptSection(conversation_memory.prompt_messages(n_messages=N_MESSAGES), priority=2, trim_from="head"),
+                PromptSection(conversation_memory.prompt_conversation_info(), stability=Stability.VOLATILE),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
 
     @classmethod
+    @admission_controller.track_pipeline
     async def do(cls, advice_id: str, conversation_memory: memory.ConversationMemory) -> Advice:
         prompt_messages = cls._generate_prompt(
             advice_id=advice_id,
             conversation_memory=conversation_memory
         )
-        response = await clients.async_openai_client.beta.chat.completions.parse(
-            messages=prompt_messages,
+        response = await llm.parse(
+            pipeline=cls.PROMPT_NAME,
             model=cls.LLM_MODEL,
+            messages=prompt_messages,
             response_format=Advice
         )
-        response = response.choices[0].message.parsed
 
         return response
     
@@ -173,42 +296,41 @@ class BreaktimeAdviceRecommender:
     PROMPT_NAME = "advice/advice_recommender"
     PROMPT_VER = 1
     LLM_MODEL = "gpt-4.1-nano"
+    PROMPT_TOKEN_BUDGET = 6000
 
     @classmethod
     def _generate_prompt(cls, conversation_memory: memory.ConversationMemory) -> List[Dict[str, str]]:
-        system_message = {
-            "role": "system",
-            "content": load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER)
-        }
-        user_message = {
-            "role": "user",
-            "content": '\n---\n'.join([
-                prompt_advice_metadata_list(),
-                conversation_memory.prompt_conversation_info(),
-                conversation_memory.prompt_partner_memory(),
-                conversation_memory.prompt_messages(n_messages=N_MESSAGES),
-            ])
-        }
-
-        return [system_message, user_message]
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER),
+            sections=[
+                PromptSection(prompt_advice_metadata_list(), stability=Stability.STATIC),
+                conversation_memory.partner_memory_prompt_section(
+                    query=recent_messages_query(conversation_memory), priority=1
+                ),
+                PromptSection(conversation_memory.prompt_messages(n_messages=N_MESSAGES), priority=2, trim_from="head"),
+                PromptSection(conversation_memory.prompt_conversation_info(), stability=Stability.VOLATILE),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
 
 
     @classmethod
-    async def do(
+    async def _rank_with_llm(
         cls,
         conversation_memory: memory.ConversationMemory,
-        n_consistency: int = 5
-    ) -> List[AdviceMetadata]:
+        n_consistency: int,
+    ) -> List[List[str]]:
         prompt_messages = cls._generate_prompt(conversation_memory)
 
         async def single_run():
             try:
-                response = await clients.async_openai_client.beta.chat.completions.parse(
-                    messages=prompt_messages,
+                response = await llm.parse(
+                    pipeline=cls.PROMPT_NAME,
                     model=cls.LLM_MODEL,
+                    messages=prompt_messages,
                     response_format=AdviceRecommendation,
                 )
-                response = response.choices[0].message.parsed
                 return response
             except Exception as e:
                 if config.settings.DEBUG:
@@ -222,6 +344,36 @@ class BreaktimeAdviceRecommender:
         if not advice_ids:
             raise ValueError("No valid responses received.")
 
+        return advice_ids
+
+    @classmethod
+    @admission_controller.track_pipeline
+    async def do(
+        cls,
+        conversation_memory: memory.ConversationMemory,
+        n_consistency: int = 5,
+        conversation_scorer: Optional[score.ConversationScorer] = None,
+    ) -> List[AdviceMetadata]:
+        mode = config.settings.ADVICE_RECOMMENDER_MODE
+        # 과부하 시 n_consistency 팬아웃을 줄임
+        n_consistency = admission_controller.n_consistency(n_consistency)
+
+        if mode == "local":
+            advice_ids = [LocalAdviceRecommender.rank(conversation_memory, conversation_scorer)]
+        elif mode == "fallback":
+            try:
+                advice_ids = await cls._rank_with_llm(conversation_memory, n_consistency)
+            except Exception as e:
+                log.warning("[%s] LLM ranking failed, falling back to local ranking: %s", cls.__name__, e)
+                metrics.increment("advice_recommender_fallback_total")
+                advice_ids = [LocalAdviceRecommender.rank(conversation_memory, conversation_scorer)]
+        elif mode == "blend":
+            advice_ids = await cls._rank_with_llm(conversation_memory, n_consistency)
+            local_ranking = LocalAdviceRecommender.rank(conversation_memory, conversation_scorer)
+            advice_ids += [local_ranking] * LOCAL_BLEND_VOTES
+        else:
+            advice_ids = await cls._rank_with_llm(conversation_memory, n_consistency)
+
         # 각 요소별로 순위의 합을 계산
         rank_sum = defaultdict(int)
         count = defaultdict(int)
@@ -245,4 +397,64 @@ class BreaktimeAdviceRecommender:
             if advice_metadata:
                 output.append(advice_metadata)
             
-        return output
\ No newline at end of file
+        return output
+
+# ========= LocalAdviceRecommender =========
+
+class LocalAdviceRecommender:
+    """
+    LLM 호출 없이 조언을 추천하는 클래스.
+    최근 대화와 파트너 메모를 질의로 한 문자 n-gram BM25 점수에,
+    ConversationScorer 점수에서 얻은 대화 신호(참여도 저하, 발화 비율 불균형 등)에 맞는 조언의 가산점을 더해 정렬합니다.
+    """
+    SIGNAL_WEIGHT = 0.5
+
+    @staticmethod
+    def detect_signals(
+        conversation_memory: memory.ConversationMemory,
+        conversation_scorer: Optional[score.ConversationScorer] = None,
+    ) -> List[str]:
+        signals = []
+        n_partner_messages = sum(1 for msg in conversation_memory.messages if msg.role == score.PARTNER_ROLE)
+        if n_partner_messages < FEW_PARTNER_MESSAGES:
+            signals.append("few_partner_messages")
+        if conversation_scorer is None:
+            return signals
+
+        scores = conversation_scorer.get_scores()
+        if 0.0 < scores.partner_engagement <= LOW_ENGAGEMENT:
+            signals.append("low_partner_engagement")
+        elif scores.partner_engagement >= HIGH_ENGAGEMENT:
+            signals.append("high_partner_engagement")
+        if 0.0 < scores.user_engagement <= LOW_ENGAGEMENT:
+            signals.append("low_user_engagement")
+        if scores.user_talk_share >= DOMINANT_TALK_SHARE:
+            signals.append("user_dominates")
+        elif 0.0 < scores.user_talk_share <= 1.0 - DOMINANT_TALK_SHARE:
+            signals.append("partner_dominates")
+        return signals
+
+    @classmethod
+    def rank(
+        cls,
+        conversation_memory: memory.ConversationMemory,
+        conversation_scorer: Optional[score.ConversationScorer] = None,
+    ) -> List[str]:
+        start = time.perf_counter()
+        catalog = ADVICE_CATALOG.current()
+        query = ' '.join([
+            conversation_memory.prompt_partner_memory(),
+            ' '.join(msg.content for msg in conversation_memory.get_recent_messages(N_MESSAGES)),
+        ])
+        bm25_scores = catalog.bm25_index.score(query)
+        max_bm25 = max(bm25_scores, default=0.0) or 1.0
+        signals = set(cls.detect_signals(conversation_memory, conversation_scorer))
+
+        scored = []
+        for (advice_id, _), bm25_score in zip(catalog.metadatas.items(), bm25_scores):
+            n_matched = len(signals.intersection(catalog.signals.get(advice_id, [])))
+            scored.append((bm25_score / max_bm25 + cls.SIGNAL_WEIGHT * n_matched, advice_id))
+
+        ranking = [advice_id for _, advice_id in sorted(scored, key=lambda x: (-x[0], x[1]))]
+        metrics.observe("advice_local_recommender_latency_seconds", time.perf_counter() - start)
+        return ranking[:MAX_RECOMMENDATIONS]
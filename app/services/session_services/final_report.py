@@ -4,8 +4,9 @@ from typing import Dict, Optional, List, Literal
 from pydantic import BaseModel, Field
 
 from ..elements import Message
-from ...utils.prompt_utils import load_prompt
-from ...core import clients, logger
+from ...utils.prompt_utils import load_prompt, build_prompt_messages, PromptSection, Stability
+from ...core import llm, logger
+from ...core.admission import admission_controller
 import asyncio
 import json
 
@@ -30,35 +31,30 @@ class PartnerMemoryFinalSummarizer:
     PROMPT_NAME = "final_report/partner_memory_final_summarizer"
     PROMPT_VER = 1
     LLM_MODEL = "gpt-4.1-mini"
+    PROMPT_TOKEN_BUDGET = 8000
 
     @classmethod
     def _generate_prompt(cls, conversation_memory: memory_service.ConversationMemory) -> List[Dict[str, str]]:
-        system_message = {
-            "role": "system",
-            "content": load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER).format(
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER).format(
                 categories=memory_service.PARTNER_MEMORY_CATEGORIES,
-            )
-        }
-        user_message = {
-            "role": "user",
-            "content": '\n---\n'.join([
-                conversation_memory.prompt_partner_memory()
-            ])
-        }
-
-        return [system_message, user_message]
+            ),
+            sections=[
+                PromptSection(conversation_memory.prompt_partner_memory(), stability=Stability.SESSION, priority=1, trim_from="tail"),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
     
     @classmethod
     async def do(cls, conversation_memory: memory_service.ConversationMemory):
         prompt_messages = cls._generate_prompt(conversation_memory)
 
-        response = await clients.async_openai_client.chat.completions.create(
-            messages=prompt_messages,
+        response_dict = await llm.create_json(
+            pipeline=cls.PROMPT_NAME,
             model=cls.LLM_MODEL,
-            response_format={"type": "json_object"}
+            messages=prompt_messages,
         )
-        response_json = response.choices[0].message.content
-        response_dict = json.loads(response_json)
         response_data = memory_service.PartnerMemory(content=response_dict)
         
         return response_data
@@ -66,24 +62,42 @@ class PartnerMemoryFinalSummarizer:
     
 
 # === ConversationScorerFinalSummarizer ===
+
 class ConversationScorerFinalSummarizer:
-    pass
+    """
+    대화 점수를 최종 보고서용 문자열로 정리하는 클래스. LLM을 호출하지 않습니다.
+    """
+
+    @classmethod
+    def do(cls, conversation_scorer: score_service.ConversationScorer) -> str:
+        scores = conversation_scorer.get_scores()
+        summary = ""
+        # 상대방이 긍정적/부정적인 반응을 한 횟수
+        summary += f"- 상대방이 긍정적인 반응을 한 횟수: {conversation_scorer.n_partner_positive}회\n"
+        summary += f"- 상대방이 부정적인 반응을 한 횟수: {conversation_scorer.n_partner_negative}회\n"
+        summary += f"- 나의 참여도: {scores.user_engagement:.1f} / 4\n"
+        summary += f"- 상대방의 참여도: {scores.partner_engagement:.1f} / 4\n"
+        summary += f"- 나의 발화 비율: {scores.user_talk_share * 100:.0f}%\n"
+        return summary
 
-# 상대방이 부정적인 반응을 한 횟수
-# 상대방이 긍정적인 반응을 한 횟수
     
 # === Final Report Generation ===
     
+@admission_controller.track_pipeline
 async def write_final_report_pipeline(
     conversation_memory: memory_service.ConversationMemory,
     conversation_scorer: Optional[score_service.ConversationScorer] = None,
-) -> None:
+) -> str:
     final_report = ""
     
     # Generate the final report
     final_report += "### 📝 파트너에 대해 알게 된 내용을 정리해드릴게요!\n"
     partner_memory = await PartnerMemoryFinalSummarizer.do(conversation_memory=conversation_memory)
     final_report += memory_service.partner_memory_to_str(partner_memory, add_prefix=False)
+
+    if conversation_scorer is not None:
+        final_report += "\n### 📊 대화 분위기를 정리해드릴게요!\n"
+        final_report += ConversationScorerFinalSummarizer.do(conversation_scorer=conversation_scorer)
     
     return final_report
     
@@ -0,0 +1,157 @@
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from ...core import logger
+from ...utils.text_utils import normalize_text
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+# MessageSentimentScore 척도: 0 매우 부정, 1 다소 부정, 2 약간 부정/중립 근처, 3 중립, 4 긍정
+NEUTRAL_SCORE = 3
+
+# 어간 단위로 부분 일치시키는 감정 어휘와 가중치
+POSITIVE_LEXICON = {
+    "좋아": 1.0, "좋네": 1.0, "좋죠": 1.0, "좋습니다": 1.0, "좋은": 0.5, "좋겠": 0.5,
+    "재밌": 1.0, "재미있": 1.0, "즐거": 1.0, "신나": 1.0, "행복": 1.0, "기뻐": 1.0, "기쁘": 1.0,
+    "다행": 0.75, "멋지": 1.0, "멋있": 1.0, "대단": 0.75, "예쁘": 1.0, "귀엽": 1.0, "최고": 1.5,
+    "감사": 0.75, "고마": 0.75, "반가": 0.75, "설레": 1.5, "기대": 0.75, "편하": 0.75, "잘 맞": 1.5,
+    "잘 통": 1.5, "마음에 들": 1.5, "궁금": 0.5, "사랑": 1.0, "훌륭": 1.0, "완전": 0.25,
+    "대박": 0.75, "신기": 0.5, "부럽": 0.5, "맛있": 0.75, "괜찮": 0.5,
+}
+NEGATIVE_LEXICON = {
+    "싫어": 1.5, "싫은": 1.0, "별로": 1.0, "불편": 1.5, "어색": 1.0, "피곤": 1.0, "지루": 1.5,
+    "짜증": 2.0, "화나": 2.0, "화났": 2.0, "최악": 2.0, "실망": 1.5, "힘들": 1.0, "힘드": 1.0,
+    "걱정": 0.75, "무섭": 1.0, "슬프": 1.0, "우울": 1.5, "아쉽": 0.75, "아쉬": 0.75, "속상": 1.5,
+    "부담": 1.0, "죄송": 0.5, "미안": 0.5, "안 맞": 1.5, "겉도": 1.5, "집착": 1.0, "그만": 1.0,
+    "모르겠": 0.5, "글쎄": 0.75, "귀찮": 1.5, "답답": 1.5, "이상하": 0.75,
+}
+# 용언 뒤에 붙어 의미를 뒤집는 부정 표현 ("좋지 않아요", "재밌지 않았어요")
+POST_NEGATIONS = ("지 않", "진 않", "지는 않", "지 못", "진 못", "지도 않")
+# 용언 앞에 붙어 의미를 뒤집는 부정 부사 ("안 좋아요", "못 즐겼어요")
+PRE_NEGATIONS = ("안 ", "못 ", "전혀 ", "별로 ")
+
+_LAUGHTER_RE = re.compile(r"[ㅋㅎ]{2,}|하하|호호|히히|헤헤|크크")
+_CRYING_RE = re.compile(r"[ㅠㅜ]{2,}|흑흑")
+_POSITIVE_EMOTICON_RE = re.compile(r"\^\^|\^_\^|:\)|:d|😊|😄|😆|😍|🥰|☺|👍|❤|♥|♡")
+_NEGATIVE_EMOTICON_RE = re.compile(r"-_-|;;|:\(|😞|😢|😭|😠|😡|🙄|💢")
+
+LAUGHTER_WEIGHT = 1.0
+CRYING_WEIGHT = 0.5
+EMOTICON_WEIGHT = 1.0
+
+# 어휘는 부분 일치라 단서 하나로는 오탐이 많음 ("좋아하는 음식이 뭐에요?")
+# 같은 방향의 단서가 이 수보다 적으면 확신도를 UNCERTAIN_MAX_CONFIDENCE 이하로 제한해 LLM이 판단하게 함
+MIN_AGREEING_CUES = 2
+# 질문은 감정 표현보다 화제 제시인 경우가 많아 단서 수와 관계없이 확신도를 제한
+QUESTION_ENDINGS = ("까", "나요", "가요", "세요", "니", "냐", "뭐에요", "뭐예요", "어때요")
+UNCERTAIN_MAX_CONFIDENCE = 0.5
+_TRAILING_PUNCT_RE = re.compile(r"[\s.!~…ㅋㅎㅠㅜ^]+$")
+
+# === Models ===
+
+@dataclass
+class LocalSentiment:
+    """
+    로컬 감정 분석 결과.
+    score는 MessageSentimentScore와 같은 0~4 척도이며, confidence는 0~1 사이 값입니다.
+    """
+    score: int
+    confidence: float
+    polarity: float
+    n_cues: int
+
+
+# === Functions ===
+
+def _is_negated(text: str, start: int, end: int) -> bool:
+    before = text[max(0, start - 4):start]
+    after = text[end:end + 5]
+    return before.endswith(PRE_NEGATIONS) or after.startswith(POST_NEGATIONS)
+
+
+def is_question(text: str) -> bool:
+    if "?" in text:
+        return True
+    return _TRAILING_PUNCT_RE.sub("", text).endswith(QUESTION_ENDINGS)
+
+
+def _lexicon_cues(text: str) -> List[Tuple[float, bool]]:
+    """
+    감정 어휘의 (가중치, 부정 여부) 목록을 반환합니다. 겹치는 어휘는 긴 것만 셉니다.
+    """
+    matches = []
+    for lexicon, sign in ((POSITIVE_LEXICON, 1.0), (NEGATIVE_LEXICON, -1.0)):
+        for term, weight in lexicon.items():
+            start = text.find(term)
+            while start != -1:
+                matches.append((start, start + len(term), sign * weight))
+                start = text.find(term, start + 1)
+
+    cues = []
+    covered_until = -1
+    for start, end, weight in sorted(matches, key=lambda m: (m[0], -(m[1] - m[0]))):
+        if start < covered_until:
+            continue
+        covered_until = end
+        cues.append((weight, _is_negated(text, start, end)))
+    return cues
+
+
+def score_message(content: str) -> LocalSentiment:
+    """
+    어휘, 이모티콘, 웃음/울음 표시와 부정 표현으로 메시지의 감정 점수를 추정합니다.
+    """
+    text = normalize_text(content)
+    polarity = 0.0
+    n_positive = n_negative = 0
+
+    for weight, negated in _lexicon_cues(text):
+        # 부정된 긍정어는 부정으로, 부정된 부정어는 약한 긍정으로 취급
+        value = -weight if negated and weight > 0 else (-weight * 0.5 if negated else weight)
+        polarity += value
+        if value > 0:
+            n_positive += 1
+        elif value < 0:
+            n_negative += 1
+
+    for pattern, weight in (
+        (_LAUGHTER_RE, LAUGHTER_WEIGHT),
+        (_POSITIVE_EMOTICON_RE, EMOTICON_WEIGHT),
+        (_CRYING_RE, -CRYING_WEIGHT),
+        (_NEGATIVE_EMOTICON_RE, -EMOTICON_WEIGHT),
+    ):
+        if pattern.search(text):
+            polarity += weight
+            if weight > 0:
+                n_positive += 1
+            else:
+                n_negative += 1
+
+    n_cues = n_positive + n_negative
+    if polarity >= 1.0:
+        score = 4
+    elif polarity <= -2.0:
+        score = 0
+    elif polarity <= -1.0:
+        score = 1
+    elif polarity < 0.0:
+        score = 2
+    else:
+        score = NEUTRAL_SCORE
+
+    if n_cues == 0:
+        # 감정 단서가 없으면 중립으로 보되, 맥락을 봐야 하므로 확신하지 않음
+        confidence = 0.3
+    else:
+        agreement = max(n_positive, n_negative) / n_cues
+        strength = min(abs(polarity) / 2.0, 1.0)
+        confidence = round(agreement * (0.5 + 0.5 * strength), 3)
+        if max(n_positive, n_negative) < MIN_AGREEING_CUES:
+            confidence = min(confidence, UNCERTAIN_MAX_CONFIDENCE)
+    if is_question(text):
+        confidence = min(confidence, UNCERTAIN_MAX_CONFIDENCE)
+
+    return LocalSentiment(score=score, confidence=confidence, polarity=polarity, n_cues=n_cues)
@@ -1,11 +1,20 @@
+import time
+import uuid
+import heapq
+import bisect
+import asyncio
 from datetime import datetime
-from typing import Dict, Optional, List, Literal
+from typing import Dict, Optional, List, Literal, Tuple
 
 from pydantic import BaseModel, Field
 
 from ..elements import Message
-from ...utils.prompt_utils import load_prompt
-from ...core import clients, logger
+from ...utils import json_utils, text_utils
+from ...utils.prompt_utils import load_prompt, build_prompt_messages, PromptSection, Stability
+from ...core import cancellation, config, llm, logger
+from ...core.admission import admission_controller
+from ...core.metrics import metrics
+from . import memory_prefilter
 
 log = logger.get_logger(__name__)
 
@@ -82,6 +91,23 @@ def partner_memory_to_str(partner_memory, add_prefix=True) -> str:
     return return_str
     
 
+def memos_to_str(memos: List[Tuple[str, str]], n_total: int) -> str:
+    """
+    선택한 (카테고리, 메모) 목록을 partner_memory_to_str과 같은 형식으로 카테고리 순서대로 출력합니다.
+    """
+    by_category: Dict[str, List[str]] = {}
+    for category, memo in memos:
+        by_category.setdefault(category, []).append(memo)
+    return_str = f"### 📝 파트너에 대한 메모 (관련된 메모 {len(memos)}/{n_total}개):\n"
+    for category in PARTNER_MEMORY_CATEGORIES:
+        if category not in by_category:
+            continue
+        return_str += f"{category}:\n"
+        for memo in by_category[category]:
+            return_str += f"- {memo}\n"
+    return return_str
+    
+
 # === ConversationMemory ===
 
 class ConversationMemory:
@@ -102,10 +128,26 @@ class ConversationMemory:
                 category: [] for category in PARTNER_MEMORY_CATEGORIES
             }
         )
+        # partner_memory가 바뀔 때마다 증가하는 리비전. epoch는 같은 대화 ID로 재초기화된 경우를 구분
+        self.epoch = uuid.uuid4().hex[:8]
+        self.revision = 0
+        # since 조회를 위한 (리비전, 카테고리, 메모) 기록. _memo_log_base 이전 리비전은 기록에 없음
+        self._memo_log: List[Tuple[int, str, str]] = []
+        self._memo_log_base = 0
+        # 직렬화된 partner_memory 캐시: (리비전, JSON bytes)
+        self._partner_memory_json: Optional[Tuple[int, bytes]] = None
+        # 대화 전체 분석(services.fleet)용 요약 지표 행, ConversationManager가 할당
+        self.fleet_row = None
+        # 프롬프트에 넣을 메모 선택용 BM25 색인. _memo_entries[i]가 색인의 i번째 문서
+        self._memo_index = text_utils.BM25Index()
+        self._memo_entries: List[Tuple[str, str]] = []
+        self._memo_chars = 0
 
     def add_message(self, message: Message) -> None:
         # 중복 메시지 필터링은 외부에서 처리한다고 가정
         self.messages.append(message)
+        if self.fleet_row is not None:
+            self.fleet_row.on_message(message.role, message.timestamp.timestamp())
 
     def get_recent_messages(self, n: Optional[int] = None) -> List[Message]:
         return self.messages[-n:] if n else self.messages
@@ -119,6 +161,59 @@ class ConversationMemory:
     ) -> None:
         if instruction.should_update and instruction.category and instruction.content:
             self.partner_memory.content[instruction.category].append(instruction.content)
+            self.revision += 1
+            self._memo_log.append((self.revision, instruction.category, instruction.content))
+            self._index_memo(instruction.category, instruction.content)
+            if self.fleet_row is not None:
+                self.fleet_row.on_memo()
+
+    def set_partner_memory(self, partner_memory: PartnerMemory) -> None:
+        """
+        partner_memory 전체를 교체합니다. 이전 리비전 기준의 since 조회는 전체 응답으로 처리됩니다.
+        """
+        self.partner_memory = partner_memory
+        self.revision += 1
+        self._memo_log = []
+        self._memo_log_base = self.revision
+        self._memo_index = text_utils.BM25Index()
+        self._memo_entries = []
+        self._memo_chars = 0
+        for category, memos in partner_memory.content.items():
+            for memo in memos:
+                self._index_memo(category, memo)
+        if self.fleet_row is not None:
+            self.fleet_row.set("n_memos", sum(len(memos) for memos in partner_memory.content.values()))
+
+    def _index_memo(self, category: str, memo: str) -> None:
+        self._memo_index.add(f"{category} {memo}")
+        self._memo_entries.append((category, memo))
+        self._memo_chars += len(memo)
+
+    def select_memos(self, query: str, top_k: int, max_chars: int) -> List[Tuple[str, str]]:
+        """
+        질의와의 BM25 점수가 높은 메모를 최대 top_k개, 메모 글자 수 합이 max_chars 이하가 되도록 선택합니다.
+        점수가 같으면 최근 메모를 우선합니다.
+        """
+        scores = self._memo_index.score(query)
+        ranked = heapq.nlargest(top_k, range(len(scores)), key=lambda idx: (scores[idx], idx))
+        selected, n_chars = [], 0
+        for idx in ranked:
+            memo_chars = len(self._memo_entries[idx][1])
+            if n_chars + memo_chars > max_chars:
+                continue
+            selected.append(idx)
+            n_chars += memo_chars
+        return [self._memo_entries[idx] for idx in sorted(selected)]
+
+    def memos_since(self, since: int) -> Optional[List[Tuple[int, str, str]]]:
+        """
+        리비전 `since` 이후 추가된 (리비전, 카테고리, 메모) 목록을 반환합니다.
+        기록으로 알 수 없는 리비전이면 None을 반환합니다.
+        """
+        if since < self._memo_log_base or since > self.revision:
+            return None
+        start = bisect.bisect_right(self._memo_log, since, key=lambda entry: entry[0])
+        return self._memo_log[start:]
 
     def get_elapsed_time_str(self) -> str:
         elapsed = datetime.now() - self.start_time
@@ -139,45 +234,69 @@ class ConversationMemory:
         if n_messages and len(self.messages) > n_messages:
             prompt += "...이전 메시지 일부 생략...\n"
         for msg in messages_to_show:
-            prompt += msg.to_prompt()
+            prompt += f"{msg.to_prompt()}\n"
         return prompt
 
     def prompt_partner_memory(self) -> str:
         return partner_memory_to_str(self.partner_memory)
+
+    def partner_memory_prompt_section(self, query: str, priority: int) -> PromptSection:
+        """
+        파트너 메모 프롬프트 섹션을 만듭니다.
+        메모가 MEMORY_PROMPT_TOP_K개, MEMORY_PROMPT_MAX_CHARS자 이하이면 전체를 넣어(SESSION) 프롬프트 캐시를 유지하고,
+        넘으면 질의(현재 메시지, 요청한 조언 등)와 관련된 메모만 골라 넣습니다(RECENT).
+        """
+        settings = config.settings
+        n_memos = len(self._memo_entries)
+        if (
+            not settings.MEMORY_PROMPT_SELECTION_ENABLED
+            or (n_memos <= settings.MEMORY_PROMPT_TOP_K and self._memo_chars <= settings.MEMORY_PROMPT_MAX_CHARS)
+        ):
+            return PromptSection(self.prompt_partner_memory(), stability=Stability.SESSION, priority=priority, trim_from="tail")
+
+        memos = self.select_memos(query, settings.MEMORY_PROMPT_TOP_K, settings.MEMORY_PROMPT_MAX_CHARS)
+        metrics.observe("memory_prompt_selected_ratio", len(memos) / n_memos)
+        return PromptSection(memos_to_str(memos, n_memos), stability=Stability.RECENT, priority=priority, trim_from="tail")
+
+    def partner_memory_json(self) -> bytes:
+        """
+        partner_memory를 JSON bytes로 직렬화합니다. 리비전이 같으면 캐시된 결과를 재사용합니다.
+        """
+        if self._partner_memory_json is None or self._partner_memory_json[0] != self.revision:
+            self._partner_memory_json = (self.revision, json_utils.dumps({"content": self.partner_memory.content}))
+        return self._partner_memory_json[1]
         
 
 class PartnerMemoryRelevanceClassifier:
     PROMPT_NAME = "memory/partner_message_relevance_classifier"
     PROMPT_VER = 1
     LLM_MODEL = "gpt-4.1-nano"
+    PROMPT_TOKEN_BUDGET = 2000
 
     @classmethod
     def _generate_prompt(cls, conversation_memory: ConversationMemory) -> List[Dict[str, str]]:
-        system_message = {
-            "role": "system",
-            "content": load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER).format(
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER).format(
                 categories=", ".join(PARTNER_MEMORY_CATEGORIES)
-            )
-        }
-        user_message = {
-            "role": "user",
-            "content": '\n---\n'.join([
-                conversation_memory.prompt_messages(n_messages=N_MESSAGES),
-                f"### 🔍 분석할 메시지:\n{conversation_memory.messages[-1].to_prompt()}"
-            ])
-        }
-        return [system_message, user_message]
+            ),
+            sections=[
+                PromptSection(conversation_memory.prompt_messages(n_messages=N_MESSAGES), priority=1, trim_from="head"),
+                PromptSection(f"### 🔍 분석할 메시지:\n{conversation_memory.messages[-1].to_prompt()}"),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
     
     @classmethod
     async def do(cls, conversation_memory: ConversationMemory) -> PartnerMemoryRelevance:
         prompt_messages = cls._generate_prompt(conversation_memory)
 
-        response = await clients.async_openai_client.beta.chat.completions.parse(
-            messages=prompt_messages,
+        response = await llm.parse(
+            pipeline=cls.PROMPT_NAME,
             model=cls.LLM_MODEL,
+            messages=prompt_messages,
             response_format=PartnerMemoryRelevance,
         )
-        response = response.choices[0].message.parsed
 
         return response
 
@@ -186,68 +305,276 @@ class PartnerMemoryUpdateInstructionGenerator:
     PROMPT_NAME = "memory/partner_memory_update_instruction_generator"
     PROMPT_VER = 1
     LLM_MODEL = "gpt-4.1-mini"
+    # MEMORY_INSTRUCTION_CASCADE_ENABLED일 때 먼저 시도할 작은 모델
+    CASCADE_LLM_MODEL: Optional[str] = "gpt-4.1-nano"
+    PROMPT_TOKEN_BUDGET = 4000
 
     @classmethod
     def _generate_prompt(cls, conversation_memory: ConversationMemory) -> List[Dict[str, str]]:
-        system_message = {
-            "role": "system",
-            "content": load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER).format(
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER).format(
                 categories=", ".join(PARTNER_MEMORY_CATEGORIES)
-            )
-        }
-        user_message = {
-            "role": "user",
-            "content": '\n---\n'.join([
-                conversation_memory.prompt_partner_memory(),
-                conversation_memory.prompt_messages(n_messages=N_MESSAGES),
-                f"### 🔍 분석할 메시지:\n{conversation_memory.messages[-1].to_prompt()}"
-            ])
-        }
-
-        return [system_message, user_message]
+            ),
+            sections=[
+                # 중복 메모 판단에 필요하므로 대화 내용보다 나중에 잘라냄
+                conversation_memory.partner_memory_prompt_section(
+                    query=conversation_memory.messages[-1].content, priority=2
+                ),
+                PromptSection(conversation_memory.prompt_messages(n_messages=N_MESSAGES), priority=1, trim_from="head"),
+                PromptSection(f"### 🔍 분석할 메시지:\n{conversation_memory.messages[-1].to_prompt()}"),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
     
     @classmethod
-    async def do(cls, conversation_memory: ConversationMemory) -> None:
+    async def do(cls, conversation_memory: ConversationMemory) -> PartnerMemoryUpdateInstruction:
         prompt_messages = cls._generate_prompt(conversation_memory)
 
-        response = await clients.async_openai_client.beta.chat.completions.parse(
-            messages=prompt_messages,
+        if cls.CASCADE_LLM_MODEL is not None and config.settings.MEMORY_INSTRUCTION_CASCADE_ENABLED:
+            return await cls._do_cascade(conversation_memory, prompt_messages)
+
+        response = await llm.parse(
+            pipeline=cls.PROMPT_NAME,
             model=cls.LLM_MODEL,
+            messages=prompt_messages,
             response_format=PartnerMemoryUpdateInstruction,
         )
-        response = response.choices[0].message.parsed
             
         return response
 
+    @classmethod
+    async def _do_cascade(
+        cls,
+        conversation_memory: ConversationMemory,
+        prompt_messages: List[Dict[str, str]],
+    ) -> PartnerMemoryUpdateInstruction:
+        """
+        작은 모델(CASCADE_LLM_MODEL)로 먼저 생성하고, 로컬 검증에 실패하거나 호출이 실패한 경우에만
+        LLM_MODEL로 다시 생성합니다.
+        """
+        start = time.perf_counter()
+        try:
+            response = await llm.parse(
+                pipeline=cls.PROMPT_NAME,
+                model=cls.CASCADE_LLM_MODEL,
+                messages=prompt_messages,
+                response_format=PartnerMemoryUpdateInstruction,
+            )
+        except Exception as e:
+            # 작은 모델의 마감 시간, 서킷 브레이커, 일시적 오류로 메모를 잃지 않도록 큰 모델로 승격
+            log.warning("Cascade call to %s failed: %s", cls.CASCADE_LLM_MODEL, e)
+            reason = "error"
+        else:
+            reason = validate_instruction(response, conversation_memory.messages[-1].content)
+            if reason is None:
+                metrics.increment("memory_cascade_total", result="accepted")
+                metrics.observe("memory_cascade_latency_seconds", time.perf_counter() - start, result="accepted")
+                return response
+
+        log.info("Escalating memory instruction to %s: %s", cls.LLM_MODEL, reason)
+        response = await llm.parse(
+            pipeline=cls.PROMPT_NAME,
+            model=cls.LLM_MODEL,
+            messages=prompt_messages,
+            response_format=PartnerMemoryUpdateInstruction,
+        )
+        metrics.increment("memory_cascade_total", result="escalated")
+        metrics.increment("memory_cascade_escalations_total", reason=reason)
+        metrics.observe("memory_cascade_latency_seconds", time.perf_counter() - start, result="escalated")
+        return response
+
+
+class PartnerMemoryFusedExtractor(PartnerMemoryUpdateInstructionGenerator):
+    """
+    관련성 판단과 메모 생성을 한 번의 Structured Output 호출로 수행하는 클래스.
+    프롬프트 구성은 PartnerMemoryUpdateInstructionGenerator와 같습니다.
+    """
+    PROMPT_NAME = "memory/partner_memory_fused_extractor"
+    PROMPT_VER = 1
+    LLM_MODEL = "gpt-4.1-mini"
+    # 관련성 판단까지 맡으므로 작은 모델의 should_update=False를 검증할 수 없어 캐스케이드하지 않음
+    CASCADE_LLM_MODEL = None
+    PROMPT_TOKEN_BUDGET = 4000
+
 # === Functions ===
+
+def validate_instruction(instruction: PartnerMemoryUpdateInstruction, source: str) -> Optional[str]:
+    """
+    작은 모델이 생성한 메모 지시를 로컬 규칙으로 검증합니다.
+    문제가 없으면 None, 있으면 사유(missing_category, too_short, too_long, no_overlap)를 반환합니다.
+    """
+    if not instruction.should_update:
+        return None
+    if instruction.category is None:
+        return "missing_category"
+    content = (instruction.content or "").strip()
+    if len(content) < config.settings.MEMORY_CASCADE_MIN_CONTENT_CHARS:
+        return "too_short"
+    if len(content) > config.settings.MEMORY_CASCADE_MAX_CONTENT_CHARS:
+        return "too_long"
+    # 메모는 분석한 메시지에서 나와야 하므로 글자 bigram이 어느 정도 겹쳐야 함
+    content_bigrams = set(text_utils.char_ngrams(content, 2, 2))
+    overlap = len(content_bigrams & set(text_utils.char_ngrams(source, 2, 2)))
+    if overlap < config.settings.MEMORY_CASCADE_MIN_OVERLAP * len(content_bigrams):
+        return "no_overlap"
+    return None
+
+
+def cascade_report() -> Dict[str, float]:
+    """
+    메모 생성 캐스케이드의 승격 비율과, 항상 큰 모델을 쓴 경우 대비 절약한 지연 시간(추정)을 반환합니다.
+    """
+    n_accepted = metrics.get_counter("memory_cascade_total", result="accepted")
+    n_escalated = metrics.get_counter("memory_cascade_total", result="escalated")
+    n_total = n_accepted + n_escalated
+
+    def total_seconds(result: str) -> float:
+        summary = metrics.get_summary("memory_cascade_latency_seconds", result=result)
+        return summary["sum"] if summary else 0.0
+
+    generator = PartnerMemoryUpdateInstructionGenerator
+    baseline_summary = metrics.get_summary(
+        "llm_latency_seconds", model=generator.LLM_MODEL, pipeline=generator.PROMPT_NAME
+    )
+    baseline = baseline_summary["mean"] if baseline_summary else 0.0
+    spent = total_seconds("accepted") + total_seconds("escalated")
+    return {
+        "n_total": n_total,
+        "n_escalated": n_escalated,
+        "escalation_rate": n_escalated / n_total if n_total else 0.0,
+        "baseline_latency_seconds": baseline,
+        "mean_latency_seconds": spent / n_total if n_total else 0.0,
+        "latency_saved_seconds": baseline * n_total - spent if baseline else 0.0,
+    }
+
     
+@admission_controller.track_pipeline
 async def update_partner_memory_pipeline(
     conversation_memory: ConversationMemory,
 ) -> PartnerMemoryUpdateInstruction:
     
-    if conversation_memory.messages[-1].role != "파트너":
+    latest_message = conversation_memory.messages[-1]
+    if latest_message.role == "파트너" and _shed_low_priority(latest_message.content):
+        # 과부하 시 우선순위가 낮은 메시지는 메모리를 바꾸지 않음
+        metrics.increment("pipeline_degraded_total", pipeline="memory", reason="low_priority")
+        return PartnerMemoryUpdateInstruction(
+            should_update=False,
+            category=None,
+            content=None
+        )
+    if latest_message.role != "파트너" or memory_prefilter.should_skip_relevance_classifier(latest_message.content):
         instruction = PartnerMemoryUpdateInstruction(
             should_update=False,
             category=None,
             content=None
         )
     else:
-        relevance = await PartnerMemoryRelevanceClassifier.do(
-            conversation_memory=conversation_memory
-        )
-        
-        if relevance.should_remember:
-            instruction = await PartnerMemoryUpdateInstructionGenerator.do(
-                conversation_memory=conversation_memory
-            )
-        else:
-            instruction = PartnerMemoryUpdateInstruction(
+        mode = config.settings.MEMORY_PIPELINE_MODE
+        start = time.perf_counter()
+        try:
+            if mode == "fused":
+                instruction = await PartnerMemoryFusedExtractor.do(
+                    conversation_memory=conversation_memory
+                )
+                n_llm_calls = 1
+            elif mode == "speculative":
+                instruction, n_llm_calls = await _run_speculative(conversation_memory)
+            else:
+                instruction, n_llm_calls = await _run_two_stage(conversation_memory)
+        except Exception as e:
+            # LLM 호출이 실패(마감 시간, 서킷 브레이커 등)하면 메모리를 바꾸지 않음
+            log.warning("Partner memory update failed, keeping the memory unchanged: %s", e)
+            metrics.increment("pipeline_degraded_total", pipeline="memory", reason="llm_failure")
+            return PartnerMemoryUpdateInstruction(
                 should_update=False,
                 category=None,
                 content=None
             )
+
+        # 모드별 메모리 업데이트 지연 시간과 LLM 호출 수 비교용 지표
+        metrics.observe("memory_update_latency_seconds", time.perf_counter() - start, mode=mode)
+        metrics.increment("memory_update_total", mode=mode)
+        metrics.increment("memory_update_llm_calls_total", n_llm_calls, mode=mode)
+        if instruction.should_update:
+            metrics.increment("memory_update_memos_total", mode=mode)
     
     conversation_memory.update_partner_memory(
         instruction=instruction
     )
-    
\ No newline at end of file
+    return instruction
+
+
+def _shed_low_priority(content: str) -> bool:
+    return admission_controller.skip_low_priority_memory() and memory_prefilter.is_low_priority_message(content)
+
+
+async def _run_two_stage(conversation_memory: ConversationMemory):
+    """
+    관련성 분류 후 필요한 경우에만 메모 생성 지시를 생성합니다.
+    (지시, LLM 호출 수)를 반환합니다.
+    """
+    relevance = await PartnerMemoryRelevanceClassifier.do(
+        conversation_memory=conversation_memory
+    )
+    
+    if not relevance.should_remember:
+        instruction = PartnerMemoryUpdateInstruction(
+            should_update=False,
+            category=None,
+            content=None
+        )
+        return instruction, 1
+
+    instruction = await PartnerMemoryUpdateInstructionGenerator.do(
+        conversation_memory=conversation_memory
+    )
+    return instruction, 2
+    
+
+
+async def _run_speculative(conversation_memory: ConversationMemory):
+    """
+    관련성 분류와 메모 생성 지시를 동시에 시작합니다.
+    기억할 필요가 없다고 분류되면 메모 생성 지시를 취소하거나 결과를 폐기합니다.
+    (지시, LLM 호출 수)를 반환합니다.
+    """
+    speculative_usage = llm.LLMUsage()
+
+    async def generate_instruction():
+        with llm.track_usage(speculative_usage):
+            return await PartnerMemoryUpdateInstructionGenerator.do(
+                conversation_memory=conversation_memory
+            )
+
+    instruction_task = asyncio.create_task(generate_instruction())
+    try:
+        relevance = await PartnerMemoryRelevanceClassifier.do(
+            conversation_memory=conversation_memory
+        )
+    except BaseException:
+        instruction_task.cancel(cancellation.SPECULATION)
+        raise
+
+    if relevance.should_remember:
+        metrics.observe("memory_speculation_hit", 1.0)
+        instruction = await instruction_task
+        return instruction, 2
+
+    # 추측 실패: 진행 중이면 취소하고, 이미 끝났으면 사용한 토큰을 낭비로 기록
+    metrics.observe("memory_speculation_hit", 0.0)
+    if instruction_task.done():
+        if not instruction_task.cancelled() and instruction_task.exception() is None:
+            metrics.increment("memory_speculation_wasted_tokens_total", speculative_usage.total_tokens)
+        n_llm_calls = 2
+    else:
+        instruction_task.cancel(cancellation.SPECULATION)
+        metrics.increment("memory_speculation_cancelled_total")
+        n_llm_calls = 1
+    
+    instruction = PartnerMemoryUpdateInstruction(
+        should_update=False,
+        category=None,
+        content=None
+    )
+    return instruction, n_llm_calls
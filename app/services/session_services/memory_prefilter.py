@@ -0,0 +1,225 @@
+import json
+import math
+import pathlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ...core import config, logger
+from ...core.metrics import metrics
+from ...utils.text_utils import hashed_features, normalize_text
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+# "부산", "교사"처럼 두 글자 답변도 정보일 수 있으므로 한 글자 메시지만 길이로 건너뜀
+MIN_HANGUL_SYLLABLES = 2
+# 과부하 시 이보다 짧은(숫자/영문 없는) 메시지는 메모리 업데이트를 생략
+LOW_PRIORITY_MAX_HANGUL_SYLLABLES = 12
+N_FEATURE_BUCKETS = 2 ** 12
+
+# 그 자체로는 파트너에 대한 정보를 담을 수 없는 짧은 반응/추임새
+# "좋아요"처럼 취향 질문의 답이 될 수 있는 말은 포함하지 않음
+FILLER_LEXICON = frozenset([
+    "네", "넵", "넹", "넴", "예", "응", "웅", "어", "아", "앗", "아아", "아하", "오", "오오", "우와", "와", "헐", "대박",
+    "음", "흠", "으음", "글쎄요", "하하", "호호", "히히", "헤헤", "ㅎㅎ", "ㅋㅋ",
+    "그러네요", "그렇네요", "그렇군요", "그렇구나", "그래요", "그럼요", "그쵸", "그죠", "그러게요", "그니까요",
+    "맞아요", "맞아", "맞죠", "맞네요", "좋네요", "괜찮아요", "괜찮습니다",
+    "진짜요", "정말요", "진짜", "정말", "그런가요", "그런가", "그렇죠", "아무래도요",
+    "감사합니다", "고마워요", "고맙습니다", "죄송해요", "죄송합니다", "안녕하세요", "반가워요", "반갑습니다",
+    "당연하죠", "물론이죠", "알겠습니다", "알겠어요", "네네", "아네", "오네", "신기하네요", "재밌네요", "재미있네요",
+    "멋지네요", "멋있네요", "대단하네요", "부럽네요", "웃기네요", "귀엽네요", "그렇지요", "그럴게요",
+])
+
+_LAUGHTER_RE = re.compile(r"[ㅋㅎㅠㅜ]+|\^+|;+|~+")
+_PUNCT_RE = re.compile(r"[.,!?…·'\"()\[\]]+")
+_HANGUL_SYLLABLE_RE = re.compile(r"[가-힣]")
+_INFORMATIVE_CHAR_RE = re.compile(r"[A-Za-z0-9]")
+
+# === Models ===
+
+@dataclass
+class PrefilterDecision:
+    """
+    파트너 메시지를 관련성 분류기 없이 건너뛸지 여부와 그 이유.
+    """
+    skip: bool
+    reason: str
+
+
+@dataclass
+class LinearRelevanceModel:
+    """
+    해시된 문자 n-gram 특징을 사용하는 로지스틱 회귀 모델.
+    """
+    weights: Dict[int, float]
+    bias: float
+    n_buckets: int = N_FEATURE_BUCKETS
+
+    def predict_proba(self, text: str) -> float:
+        features = hashed_features(text, self.n_buckets)
+        z = self.bias + sum(self.weights.get(idx, 0.0) * value for idx, value in features.items())
+        return 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+
+    def save(self, path: pathlib.Path) -> None:
+        path.write_text(json.dumps({
+            "n_buckets": self.n_buckets,
+            "bias": self.bias,
+            "weights": {str(k): v for k, v in self.weights.items() if v},
+        }), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "LinearRelevanceModel":
+        data = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+        return cls(
+            weights={int(k): float(v) for k, v in data["weights"].items()},
+            bias=float(data["bias"]),
+            n_buckets=int(data["n_buckets"]),
+        )
+
+
+# === Functions ===
+
+def strip_reactions(text: str) -> str:
+    """
+    웃음/울음 표시, 이모티콘, 문장부호를 제거한 정규화된 메시지를 반환합니다.
+    """
+    text = normalize_text(text)
+    text = _LAUGHTER_RE.sub(" ", text)
+    text = _PUNCT_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def train_linear_model(
+    samples: Iterable[Tuple[str, bool]],
+    n_epochs: int = 20,
+    learning_rate: float = 0.1,
+    l2: float = 1e-4,
+    n_buckets: int = N_FEATURE_BUCKETS,
+) -> LinearRelevanceModel:
+    """
+    (메시지, 기억 여부) 라벨 데이터로 LinearRelevanceModel을 SGD로 학습합니다.
+    """
+    data = [(hashed_features(text, n_buckets), 1.0 if label else 0.0) for text, label in samples]
+    weights: Dict[int, float] = {}
+    bias = 0.0
+    for _ in range(n_epochs):
+        for features, label in data:
+            z = bias + sum(weights.get(idx, 0.0) * value for idx, value in features.items())
+            error = 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0))) - label
+            bias -= learning_rate * error
+            for idx, value in features.items():
+                w = weights.get(idx, 0.0)
+                weights[idx] = w - learning_rate * (error * value + l2 * w)
+    return LinearRelevanceModel(weights=weights, bias=bias, n_buckets=n_buckets)
+
+
+@lru_cache(maxsize=1)
+def _load_linear_model(path: Optional[str]) -> Optional[LinearRelevanceModel]:
+    if not path:
+        return None
+    try:
+        return LinearRelevanceModel.load(pathlib.Path(path))
+    except (OSError, ValueError, KeyError) as e:
+        log.error("Failed to load memory prefilter model from %s: %s", path, e)
+        return None
+
+
+def get_linear_model() -> Optional[LinearRelevanceModel]:
+    """
+    MEMORY_PREFILTER_MODEL_PATH의 선형 모델을 반환합니다. 처음 호출할 때 읽고 이후에는 캐시를 사용합니다.
+    """
+    return _load_linear_model(config.settings.MEMORY_PREFILTER_MODEL_PATH)
+
+
+def classify_partner_message(
+    content: str,
+    linear_model: Optional[LinearRelevanceModel] = None,
+    skip_threshold: Optional[float] = None,
+) -> PrefilterDecision:
+    """
+    파트너 메시지가 메모를 만들 수 없는 사소한 메시지인지 로컬에서 판단합니다.
+    확실한 경우에만 skip=True를 반환하고, 애매하면 LLM 분류기에 맡깁니다.
+    """
+    stripped = strip_reactions(content)
+    if not stripped:
+        return PrefilterDecision(skip=True, reason="empty")
+
+    # 숫자나 영문(나이, MBTI, 회사명 등)이 있으면 정보일 수 있으므로 건너뛰지 않음
+    if _INFORMATIVE_CHAR_RE.search(stripped):
+        return PrefilterDecision(skip=False, reason="informative_chars")
+
+    if stripped in FILLER_LEXICON or all(word in FILLER_LEXICON for word in stripped.split(" ")):
+        return PrefilterDecision(skip=True, reason="filler")
+
+    if len(_HANGUL_SYLLABLE_RE.findall(stripped)) < MIN_HANGUL_SYLLABLES:
+        return PrefilterDecision(skip=True, reason="too_short")
+
+    if linear_model is not None:
+        threshold = config.settings.MEMORY_PREFILTER_SKIP_THRESHOLD if skip_threshold is None else skip_threshold
+        if linear_model.predict_proba(content) < threshold:
+            return PrefilterDecision(skip=True, reason="linear_model")
+
+    return PrefilterDecision(skip=False, reason="pass")
+
+
+def is_low_priority_message(content: str) -> bool:
+    """
+    과부하 시 메모리 업데이트를 생략해도 되는 메시지인지 판단합니다.
+    숫자나 영문이 없고 한글 음절 수가 LOW_PRIORITY_MAX_HANGUL_SYLLABLES 미만인 짧은 메시지입니다.
+    """
+    stripped = strip_reactions(content)
+    if _INFORMATIVE_CHAR_RE.search(stripped):
+        return False
+    return len(_HANGUL_SYLLABLE_RE.findall(stripped)) < LOW_PRIORITY_MAX_HANGUL_SYLLABLES
+
+
+def should_skip_relevance_classifier(content: str) -> bool:
+    """
+    설정에 따라 로컬 사전 필터를 적용하고, 결정 결과를 지표로 기록합니다.
+    """
+    if not config.settings.MEMORY_PREFILTER_ENABLED:
+        return False
+
+    linear_model = get_linear_model()
+    decision = classify_partner_message(content, linear_model=linear_model)
+    metrics.increment(
+        "memory_prefilter_total",
+        decision="skip" if decision.skip else "pass",
+        reason=decision.reason,
+    )
+    return decision.skip
+
+
+def evaluate_prefilter(
+    samples: Iterable[Tuple[str, bool]],
+    linear_model: Optional[LinearRelevanceModel] = None,
+) -> Dict[str, object]:
+    """
+    라벨 데이터에 대해 사전 필터의 건너뛰기 비율과 오건너뛰기(false skip) 비율을 계산합니다.
+    오건너뛰기는 기억해야 할 메시지를 건너뛴 경우입니다.
+    """
+    n_total = n_relevant = n_irrelevant = n_skipped = n_true_skips = 0
+    false_skips: List[str] = []
+    for content, should_remember in samples:
+        decision = classify_partner_message(content, linear_model=linear_model)
+        n_total += 1
+        if should_remember:
+            n_relevant += 1
+            if decision.skip:
+                false_skips.append(content)
+        else:
+            n_irrelevant += 1
+            if decision.skip:
+                n_true_skips += 1
+        n_skipped += decision.skip
+
+    return {
+        "n_samples": n_total,
+        "skip_rate": n_skipped / n_total if n_total else 0.0,
+        "false_skip_rate": len(false_skips) / n_relevant if n_relevant else 0.0,
+        "irrelevant_recall": n_true_skips / n_irrelevant if n_irrelevant else 0.0,
+        "false_skips": false_skips,
+    }
@@ -1,13 +1,18 @@
+import uuid
 import asyncio
+import weakref
 from dataclasses import dataclass
-from typing import List, Dict, Literal
+from typing import List, Dict, Literal, Optional, Set, Tuple
 
 from pydantic import BaseModel
 
-from . import memory
+from . import memory, local_sentiment
 from ..elements import Message
-from ...core import clients, logger
-from ...utils.prompt_utils import load_prompt
+from ...core import config, llm, logger
+from ...core.admission import admission_controller
+from ...core.metrics import metrics
+from ...utils import json_utils, series_utils
+from ...utils.prompt_utils import load_prompt, build_prompt_messages, PromptSection
 
 log = logger.get_logger(__name__)
 
@@ -16,6 +21,22 @@ log = logger.get_logger(__name__)
 EWMA_ALPHA = 0.25
 USER_ROLE = "나"
 PARTNER_ROLE = "파트너"
+ROLE_CODES = {USER_ROLE: 0, PARTNER_ROLE: 1}
+
+# 감정 점수가 이 이상이면 긍정, 이 이하이면 부정 반응으로 집계
+POSITIVE_MIN_SCORE = 4
+NEGATIVE_MAX_SCORE = 1
+
+# 점수 시계열의 열과 array 타입 코드
+SERIES_COLUMNS = {
+    "t": "d",
+    "role": "b",
+    "sentiment": "b",
+    "user_engagement": "f",
+    "partner_engagement": "f",
+    "user_talk_share": "f",
+}
+SERIES_METRICS = ("sentiment", "user_engagement", "partner_engagement", "user_talk_share")
 
 # === Models ===
 
@@ -27,6 +48,13 @@ class MessageSentimentScore(BaseModel):
     score: Literal[0, 1, 2, 3, 4]
 
 
+class BatchSentimentScores(BaseModel):
+    """
+    여러 메시지의 감정 점수를 메시지 순서대로 나타내는 모델.
+    """
+    scores: List[Literal[0, 1, 2, 3, 4]]
+
+
 class ConversationScores(BaseModel):
     """
     대화 참여도 점수를 나타내는 데이터 클래스.
@@ -45,27 +73,107 @@ class ConversationScorer:
     def __init__(self, alpha: float = EWMA_ALPHA):
         self.alpha = alpha
         self._scores = ConversationScores()
+        self._scores_json: Optional[bytes] = None
+        # 점수가 바뀔 때마다 증가하는 리비전. epoch는 같은 대화 ID로 재초기화된 경우를 구분
+        self.epoch = uuid.uuid4().hex[:8]
+        self.revision = 0
+        # 메시지별 감정 점수와 그 시점의 참여도/발화 비율 (최근 SCORE_SERIES_CAPACITY개)
+        self.series = series_utils.RingBuffer(SERIES_COLUMNS, capacity=config.settings.SCORE_SERIES_CAPACITY)
+        # 파트너의 긍정/부정 반응 횟수 (series에서 밀려난 메시지도 포함)
+        self.n_partner_positive = 0
+        self.n_partner_negative = 0
+        # 대화 전체 분석(services.fleet)용 요약 지표 행, ConversationManager가 할당
+        self.fleet_row = None
 
-    def update(self, conversation_memory: memory.ConversationMemory, sentiment: MessageSentimentScore) -> None:
+    def update(
+        self,
+        conversation_memory: memory.ConversationMemory,
+        sentiment: MessageSentimentScore,
+        message: Optional[Message] = None,
+    ) -> None:
+        """
+        message(기본값: 마지막 메시지)의 감정 점수로 발화자의 참여도를 갱신합니다.
+        """
         if not conversation_memory.messages:
             return
 
-        latest_message = conversation_memory.messages[-1]
+        latest_message = message if message is not None else conversation_memory.messages[-1]
 
         if latest_message.role == USER_ROLE:
             self._scores.user_engagement = self._update_ewma(self._scores.user_engagement, sentiment.score)
         elif latest_message.role == PARTNER_ROLE:
             self._scores.partner_engagement = self._update_ewma(self._scores.partner_engagement, sentiment.score)
 
-        self._update_talk_share(conversation_memory.messages)
+        self._update_talk_share(conversation_memory.messages, latest_message)
+        self._record(latest_message, sentiment)
+        self._scores_changed()
+
+    def _scores_changed(self) -> None:
+        self._scores_json = None
+        self.revision += 1
+        if self.fleet_row is not None:
+            scores = self._scores
+            self.fleet_row.on_scores(scores.user_engagement, scores.partner_engagement, scores.user_talk_share)
+
+    def _record(self, message: Message, sentiment: MessageSentimentScore) -> None:
+        if message.role == PARTNER_ROLE:
+            if sentiment.score >= POSITIVE_MIN_SCORE:
+                self.n_partner_positive += 1
+            elif sentiment.score <= NEGATIVE_MAX_SCORE:
+                self.n_partner_negative += 1
+        self.series.append(
+            t=message.timestamp.timestamp(),
+            role=ROLE_CODES.get(message.role, -1),
+            sentiment=sentiment.score,
+            user_engagement=self._scores.user_engagement,
+            partner_engagement=self._scores.partner_engagement,
+            user_talk_share=self._scores.user_talk_share,
+        )
+
+    def get_series(
+        self,
+        metric: str,
+        method: Literal["lttb", "bucket", "raw"] = "lttb",
+        n_points: int = 100,
+        role: Optional[str] = None,
+    ) -> List[Tuple[float, float]]:
+        """
+        metric 열을 (타임스탬프, 값) 목록으로 반환합니다. lttb/bucket이면 n_points개 이하로 다운샘플링합니다.
+        role을 지정하면 해당 발화자의 메시지만 사용합니다.
+        """
+        xs, ys = self.series.column("t"), self.series.column(metric)
+        if role is not None:
+            code = ROLE_CODES[role]
+            roles = self.series.column("role")
+            xs, ys = [x for x, r in zip(xs, roles) if r == code], [y for y, r in zip(ys, roles) if r == code]
+        if method == "lttb":
+            return series_utils.lttb(xs, ys, n_points)
+        if method == "bucket":
+            return series_utils.bucket_mean(xs, ys, n_points)
+        return list(zip(xs, ys))
         
     def get_scores(self) -> ConversationScores:
         return self._scores
 
+    def set_scores(self, scores: ConversationScores) -> None:
+        self._scores = scores
+        self._scores_changed()
+
+    def scores_json(self) -> bytes:
+        """
+        점수를 JSON bytes로 직렬화합니다. update() 전까지는 캐시된 결과를 재사용합니다.
+        """
+        if self._scores_json is None:
+            self._scores_json = json_utils.dumps(self._scores.dict())
+        return self._scores_json
+
     def _update_ewma(self, previous: float, new: float) -> float:
         return new if previous == 0.0 else self.alpha * new + (1 - self.alpha) * previous
 
-    def _update_talk_share(self, messages: List[Message]) -> None:
+    def _update_talk_share(self, messages: List[Message], message: Message) -> None:
+        # message까지의 발화 비율 (같은 배치에서 뒤에 추가된 메시지는 제외)
+        end = next((idx + 1 for idx in range(len(messages) - 1, -1, -1) if messages[idx] is message), len(messages))
+        messages = messages[:end]
         total = sum(len(msg.content) for msg in messages)
         user = sum(len(msg.content) for msg in messages if msg.role == USER_ROLE)
         self._scores.user_talk_share = user / total if total > 0 else 0.0
@@ -80,61 +188,282 @@ class RealtimeSentimentalAnalyzer:
     PROMPT_NAME = "score/sentimental_analysis"
     PROMPT_VER = 1
     LLM_MODEL = "gpt-4.1-nano"
+    PROMPT_TOKEN_BUDGET = 1500
+    N_CONSISTENCY = 3
 
     @classmethod
     def _generate_prompt(cls, conversation_memory: memory.ConversationMemory) -> List[Dict[str, str]]:
-        system_message = {
-            "role": "system",
-            "content": load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER)
-        }
-        user_message = {
-            "role": "user",
-            "content": '\n---\n'.join([
-                conversation_memory.prompt_messages(n_messages=5),
-                f"### 🔍 분석할 메시지:\n{conversation_memory.messages[-1].to_prompt()}"
-            ])
-        }
-        return [system_message, user_message]
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER),
+            sections=[
+                PromptSection(conversation_memory.prompt_messages(n_messages=5), priority=1, trim_from="head"),
+                PromptSection(f"### 🔍 분석할 메시지:\n{conversation_memory.messages[-1].to_prompt()}"),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
 
     @classmethod
-    async def do(cls, conversation_memory: memory.ConversationMemory, n_consistency: int = 3) -> MessageSentimentScore:
+    async def do(cls, conversation_memory: memory.ConversationMemory, n_consistency: int = N_CONSISTENCY) -> Optional[MessageSentimentScore]:
+        """
+        n_consistency번 샘플링한 점수의 평균을 반환합니다. 모든 샘플이 실패하면 None을 반환합니다.
+        """
         prompt_messages = cls._generate_prompt(conversation_memory)
 
         async def single_run():
             try:
-                response = await clients.async_openai_client.beta.chat.completions.parse(
-                    messages=prompt_messages,
+                return await llm.parse(
+                    pipeline=cls.PROMPT_NAME,
                     model=cls.LLM_MODEL,
+                    messages=prompt_messages,
                     response_format=MessageSentimentScore
                 )
-                return response.choices[0].message.parsed
             except Exception as e:
-                log.error(f"Exception in single_run: {e}")
+                log.error("Exception in single_run: %s", e)
                 return None
 
         results = await asyncio.gather(*(single_run() for _ in range(n_consistency)))
         scores = [r.score for r in results if isinstance(r, MessageSentimentScore)]
+        if not scores:
+            return None
 
         avg_score = int(round(sum(scores) / len(scores)))
         output = MessageSentimentScore(score=avg_score)
 
         return output
     
+class BatchSentimentalAnalyzer:
+    """
+    연달아 들어온 여러 메시지의 감정 점수를 한 번의 호출로 분석하는 클래스.
+    """
+    PROMPT_NAME = "score/batch_sentimental_analysis"
+    PROMPT_VER = 1
+    LLM_MODEL = "gpt-4.1-nano"
+    PROMPT_TOKEN_BUDGET = 2000
+    N_CONSISTENCY = 3
+    N_CONTEXT_MESSAGES = 5
+
+    @classmethod
+    def _generate_prompt(cls, conversation_memory: memory.ConversationMemory, messages: List[Message]) -> List[Dict[str, str]]:
+        # 분석할 메시지 이전의 메시지를 대화 맥락으로 사용
+        first = next(
+            (i for i, msg in enumerate(conversation_memory.messages) if msg is messages[0]),
+            len(conversation_memory.messages),
+        )
+        context = conversation_memory.messages[max(0, first - cls.N_CONTEXT_MESSAGES):first]
+        context_prompt = "### 💬 대화 내용:\n"
+        if first > len(context):
+            context_prompt += "...이전 메시지 일부 생략...\n"
+        context_prompt += "".join(f"{msg.to_prompt()}\n" for msg in context)
+        targets_prompt = "### 🔍 분석할 메시지:\n" + "".join(
+            f"{i}. {msg.to_prompt()}\n" for i, msg in enumerate(messages, start=1)
+        )
+        return build_prompt_messages(
+            cls.PROMPT_NAME,
+            system_prompt=load_prompt(cls.PROMPT_NAME, "system", cls.PROMPT_VER),
+            sections=[
+                PromptSection(context_prompt, priority=1, trim_from="head"),
+                PromptSection(targets_prompt),
+            ],
+            budget=cls.PROMPT_TOKEN_BUDGET,
+        )
+
+    @classmethod
+    async def do(
+        cls,
+        conversation_memory: memory.ConversationMemory,
+        messages: List[Message],
+        n_consistency: int = N_CONSISTENCY,
+    ) -> Optional[List[MessageSentimentScore]]:
+        """
+        메시지별 점수를 n_consistency번 샘플링해 평균을 반환합니다.
+        메시지 수가 맞는 샘플이 없으면 None을 반환합니다.
+        """
+        prompt_messages = cls._generate_prompt(conversation_memory, messages)
+
+        async def single_run():
+            try:
+                return await llm.parse(
+                    pipeline=cls.PROMPT_NAME,
+                    model=cls.LLM_MODEL,
+                    messages=prompt_messages,
+                    response_format=BatchSentimentScores
+                )
+            except Exception as e:
+                log.error("Exception in single_run: %s", e)
+                return None
+
+        results = await asyncio.gather(*(single_run() for _ in range(n_consistency)))
+        samples = [
+            r.scores for r in results
+            if isinstance(r, BatchSentimentScores) and len(r.scores) == len(messages)
+        ]
+        if not samples:
+            return None
+
+        return [
+            MessageSentimentScore(score=int(round(sum(scores) / len(scores))))
+            for scores in zip(*samples)
+        ]
+
+
+class SentimentDebouncer:
+    """
+    대화별로 debounce 시간 안에 연달아 들어온 메시지를 모아 한 번에 감정 분석하는 클래스.
+
+    첫 메시지가 들어오면 window초 뒤(또는 max_batch개가 모이면 즉시) 모인 메시지를 분석하고,
+    메시지 순서대로 EWMA 점수를 갱신합니다. 배치는 순서대로 하나씩 처리됩니다.
+    """
+
+    def __init__(self, window: float, max_batch: int) -> None:
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Message] = []
+        self._batch_done: Optional[asyncio.Future] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+        # 실행 중인 배치 태스크가 가비지 컬렉션되지 않도록 참조를 유지
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        conversation_scorer: ConversationScorer,
+        conversation_memory: memory.ConversationMemory,
+        message: Message,
+    ) -> None:
+        """
+        메시지를 대기 중인 배치에 추가하고, 배치의 점수가 반영될 때까지 기다립니다.
+        기다리는 요청이 취소되어도 배치 처리는 계속됩니다.
+        """
+        loop = asyncio.get_running_loop()
+        self._pending.append(message)
+        if self._batch_done is None:
+            self._batch_done = loop.create_future()
+            self._timer = loop.call_later(self.window, self._flush, conversation_scorer, conversation_memory)
+        batch_done = self._batch_done
+        if len(self._pending) >= self.max_batch:
+            self._timer.cancel()
+            self._flush(conversation_scorer, conversation_memory)
+        await asyncio.shield(batch_done)
+
+    def _flush(self, conversation_scorer: ConversationScorer, conversation_memory: memory.ConversationMemory) -> None:
+        batch, batch_done = self._pending, self._batch_done
+        self._pending, self._batch_done, self._timer = [], None, None
+
+        async def run():
+            async with self._lock:
+                await _score_messages(conversation_scorer, conversation_memory, batch)
+
+        def done(task: asyncio.Task) -> None:
+            if task.cancelled():
+                batch_done.cancel()
+            elif task.exception() is not None:
+                log.error("Sentiment batch failed: %s", task.exception())
+                batch_done.set_exception(task.exception())
+                batch_done.exception()  # 기다리는 요청이 없어도 경고가 남지 않도록 처리
+            else:
+                batch_done.set_result(None)
+
+        task = asyncio.ensure_future(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(done)
+
+
+_debouncers: "weakref.WeakKeyDictionary[ConversationScorer, SentimentDebouncer]" = weakref.WeakKeyDictionary()
+
+
+def get_debouncer(conversation_scorer: ConversationScorer) -> SentimentDebouncer:
+    debouncer = _debouncers.get(conversation_scorer)
+    if debouncer is None:
+        debouncer = _debouncers[conversation_scorer] = SentimentDebouncer(
+            window=config.settings.SENTIMENT_DEBOUNCE_SECONDS,
+            max_batch=config.settings.SENTIMENT_DEBOUNCE_MAX_BATCH,
+        )
+    return debouncer
+
 # === Functions ===
 
+async def _score_messages(
+    conversation_scorer: ConversationScorer,
+    conversation_memory: memory.ConversationMemory,
+    messages: List[Message],
+) -> None:
+    """
+    메시지들의 감정 점수를 구해 메시지 순서대로 반영합니다.
+    로컬 감정 분석이 충분히 확신하는 메시지는 LLM 분석에서 제외합니다.
+    """
+    sentiments: List[Optional[MessageSentimentScore]] = [None] * len(messages)
+    if config.settings.LOCAL_SENTIMENT_ENABLED:
+        for i, message in enumerate(messages):
+            local_output = local_sentiment.score_message(message.content)
+            if local_output.confidence >= config.settings.LOCAL_SENTIMENT_CONFIDENCE_THRESHOLD:
+                sentiments[i] = MessageSentimentScore(score=local_output.score)
+                metrics.increment("sentiment_source_total", source="local")
+
+    remaining = [i for i, sentiment in enumerate(sentiments) if sentiment is None]
+    if remaining:
+        llm_sentiments = await BatchSentimentalAnalyzer.do(
+            conversation_memory=conversation_memory,
+            messages=[messages[i] for i in remaining],
+            n_consistency=admission_controller.n_consistency(BatchSentimentalAnalyzer.N_CONSISTENCY),
+        )
+        metrics.increment("sentiment_source_total", len(remaining), source="llm_batch")
+        metrics.observe("sentiment_batch_size", len(remaining))
+        if llm_sentiments is None:
+            log.warning("Batch sentiment analysis failed, skipping %d messages", len(remaining))
+            metrics.increment("pipeline_degraded_total", pipeline="score", reason="llm_failure")
+        else:
+            for i, sentiment in zip(remaining, llm_sentiments):
+                sentiments[i] = sentiment
+
+    for message, sentiment in zip(messages, sentiments):
+        if sentiment is not None:
+            conversation_scorer.update(
+                conversation_memory=conversation_memory,
+                sentiment=sentiment,
+                message=message,
+            )
+
+
+@admission_controller.track_pipeline
 async def update_conversation_scores_pipeline(
     conversation_scorer: ConversationScorer,
     conversation_memory: memory.ConversationMemory,
 ) -> None:
     """
     대화 메모리의 메시지에 대한 감정 점수를 업데이트합니다.
+    로컬 감정 분석이 충분히 확신하는 경우 LLM 호출을 생략합니다.
     
     Args:
         conversation_memory (ConversationMemory): 대화 메모리 객체.
     """
-    sentiment_analysis_output = await RealtimeSentimentalAnalyzer.do(
-        conversation_memory=conversation_memory
-    )
+    if config.settings.SENTIMENT_DEBOUNCE_SECONDS > 0:
+        # 연달아 들어온 메시지는 모아서 한 번에 분석
+        await get_debouncer(conversation_scorer).submit(
+            conversation_scorer, conversation_memory, conversation_memory.messages[-1]
+        )
+        return
+
+    sentiment_analysis_output = None
+    if config.settings.LOCAL_SENTIMENT_ENABLED:
+        local_output = local_sentiment.score_message(conversation_memory.messages[-1].content)
+        if local_output.confidence >= config.settings.LOCAL_SENTIMENT_CONFIDENCE_THRESHOLD:
+            sentiment_analysis_output = MessageSentimentScore(score=local_output.score)
+            metrics.increment("sentiment_source_total", source="local")
+
+    if sentiment_analysis_output is None:
+        # 과부하 시 n_consistency 팬아웃을 줄임
+        sentiment_analysis_output = await RealtimeSentimentalAnalyzer.do(
+            conversation_memory=conversation_memory,
+            n_consistency=admission_controller.n_consistency(RealtimeSentimentalAnalyzer.N_CONSISTENCY),
+        )
+        metrics.increment("sentiment_source_total", source="llm")
+        if sentiment_analysis_output is None:
+            # LLM 호출이 모두 실패(마감 시간, 서킷 브레이커 등)하면 마지막 점수를 유지
+            log.warning("Sentiment analysis failed, keeping the last scores")
+            metrics.increment("pipeline_degraded_total", pipeline="score", reason="llm_failure")
+            return
     
     conversation_scorer.update(
         conversation_memory=conversation_memory,
@@ -0,0 +1,224 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .memory import ConversationMemory, PartnerMemory
+from .score import ConversationScorer, ConversationScores
+from ..elements import Message
+from ...core import logger
+from ...utils import json_utils
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+SNAPSHOT_VERSION = 1
+# 줄 단위(JSONL) 스트리밍 형식의 버전. 레코드 순서:
+# session → message × N → partner_memory → scores → series × M → end
+STREAM_VERSION = 1
+
+# === Functions ===
+
+def _encode_message(msg: Message) -> Tuple:
+    return (msg.message_id, msg.role, msg.content, msg.timestamp)
+
+
+def encode_session(
+    conversation_memory: ConversationMemory,
+    conversation_scorer: ConversationScorer,
+) -> bytes:
+    """
+    대화 메모리와 스코어러의 상태를 JSON bytes로 인코딩합니다.
+    메시지는 [message_id, role, content, timestamp] 배열로 저장해 키 반복을 줄입니다.
+    """
+    return json_utils.dumps({
+        "version": SNAPSHOT_VERSION,
+        "start_time": conversation_memory.start_time,
+        "my_info": conversation_memory.my_info,
+        "partner_info": conversation_memory.partner_info,
+        "messages": [_encode_message(msg) for msg in conversation_memory.messages],
+        "partner_memory": conversation_memory.partner_memory.content,
+        "alpha": conversation_scorer.alpha,
+        "scores": conversation_scorer.get_scores().__dict__,
+        "series": conversation_scorer.series.to_dict(),
+        "partner_reactions": [conversation_scorer.n_partner_positive, conversation_scorer.n_partner_negative],
+    })
+
+
+def decode_session(data: bytes) -> Tuple[ConversationMemory, ConversationScorer]:
+    """
+    encode_session으로 인코딩한 상태를 복원합니다.
+    직접 인코딩한 데이터이므로 메시지는 검증 없이(construct) 생성합니다.
+
+    Raises:
+        ValueError: 형식이나 버전이 맞지 않는 경우.
+    """
+    snapshot = json_utils.loads(data)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+
+    conversation_memory = ConversationMemory(
+        my_info=snapshot["my_info"],
+        partner_info=snapshot["partner_info"],
+    )
+    conversation_memory.start_time = datetime.fromisoformat(snapshot["start_time"])
+    conversation_memory.messages = [
+        Message.construct(
+            message_id=message_id,
+            role=role,
+            content=content,
+            timestamp=datetime.fromisoformat(timestamp),
+        )
+        for message_id, role, content, timestamp in snapshot["messages"]
+    ]
+    conversation_memory.set_partner_memory(PartnerMemory(content=snapshot["partner_memory"]))
+
+    conversation_scorer = ConversationScorer(alpha=snapshot["alpha"])
+    conversation_scorer.set_scores(ConversationScores(**snapshot["scores"]))
+    if "series" in snapshot:
+        conversation_scorer.series.extend(snapshot["series"])
+        conversation_scorer.n_partner_positive, conversation_scorer.n_partner_negative = snapshot["partner_reactions"]
+
+    return conversation_memory, conversation_scorer
+
+
+def iter_encode_session(
+    conversation_memory: ConversationMemory,
+    conversation_scorer: ConversationScorer,
+    chunk_bytes: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    대화 메모리와 스코어러의 상태를 한 줄에 레코드 하나인 JSONL로 인코딩하며, chunk_bytes 단위로 묶어 반환합니다.
+    메시지는 한 줄씩 인코딩하므로 전체 대화를 한 번에 직렬화하지 않습니다.
+    상태는 이 함수를 호출할 때 이벤트 루프에서 복사하므로, 반환된 이터레이터를 StreamingResponse가
+    스레드 풀에서 소비하는 동안 추가되는 메시지, 점수, 메모는 포함되지 않습니다.
+    """
+    header = {
+        "type": "session",
+        "version": STREAM_VERSION,
+        "start_time": conversation_memory.start_time,
+        "my_info": conversation_memory.my_info,
+        "partner_info": conversation_memory.partner_info,
+        "alpha": conversation_scorer.alpha,
+    }
+    messages = conversation_memory.messages[:]
+    partner_memory = {
+        category: memos[:] for category, memos in conversation_memory.partner_memory.content.items()
+    }
+    scores = conversation_scorer.get_scores().dict()
+    partner_reactions = [conversation_scorer.n_partner_positive, conversation_scorer.n_partner_negative]
+    series = conversation_scorer.series.to_dict()
+    header["series_columns"] = list(series)
+    return _iter_session_chunks(header, messages, partner_memory, scores, partner_reactions, series, chunk_bytes)
+
+
+def _iter_session_chunks(
+    header: Dict,
+    messages: List[Message],
+    partner_memory: Dict[str, List[str]],
+    scores: Dict[str, float],
+    partner_reactions: List[int],
+    series: Dict[str, List[float]],
+    chunk_bytes: int,
+) -> Iterator[bytes]:
+    series_rows = list(zip(*series.values()))
+
+    def records() -> Iterator[Dict]:
+        yield header
+        for message in messages:
+            yield {"type": "message", "message": _encode_message(message)}
+        yield {"type": "partner_memory", "content": partner_memory}
+        yield {"type": "scores", "scores": scores, "partner_reactions": partner_reactions}
+        for row in series_rows:
+            yield {"type": "series", "row": row}
+        yield {"type": "end", "n_messages": len(messages), "n_series": len(series_rows)}
+
+    buffer = bytearray()
+    for record in records():
+        buffer += json_utils.dumps(record)
+        buffer += b"\n"
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+class SessionStreamDecoder:
+    """
+    iter_encode_session 형식의 줄을 순서대로 받아 ConversationMemory/ConversationScorer를 복원하는 클래스.
+    LLM을 호출하지 않고 상태를 그대로 복원하며, 외부에서 받은 데이터이므로 메시지는 검증해서 생성합니다.
+    """
+
+    def __init__(self) -> None:
+        self.conversation_memory: Optional[ConversationMemory] = None
+        self.conversation_scorer: Optional[ConversationScorer] = None
+        self.n_series = 0
+        self._series_columns: Tuple[str, ...] = ()
+        self._ended = False
+
+    def feed_line(self, line: bytes) -> None:
+        """
+        Raises:
+            ValueError: 레코드 형식, 순서, 버전이 맞지 않는 경우.
+        """
+        if not line.strip():
+            return
+        if self._ended:
+            raise ValueError("Unexpected record after the end record")
+        record = json_utils.loads(line)
+        if not isinstance(record, dict):
+            raise ValueError(f"Session stream record must be a JSON object, got {type(record).__name__}")
+        try:
+            self._apply(record)
+        except (KeyError, TypeError, AttributeError, OverflowError) as e:
+            # 범위를 벗어난 값(array 타입코드)이나 잘못된 타입의 필드도 모두 잘못된 입력으로 처리
+            raise ValueError(f"Malformed {record.get('type')!r} record: {e!r}") from e
+
+    def _apply(self, record: Dict) -> None:
+        kind = record["type"]
+        if self.conversation_memory is None:
+            if kind != "session":
+                raise ValueError("Session stream must start with a session record")
+            if record.get("version") != STREAM_VERSION:
+                raise ValueError(f"Unsupported session stream version: {record.get('version')}")
+            self.conversation_memory = ConversationMemory(
+                my_info=record["my_info"],
+                partner_info=record["partner_info"],
+            )
+            self.conversation_memory.start_time = datetime.fromisoformat(record["start_time"])
+            self.conversation_scorer = ConversationScorer(alpha=float(record["alpha"]))
+            self._series_columns = tuple(record["series_columns"])
+            return
+
+        if kind == "message":
+            message_id, role, content, timestamp = record["message"]
+            self.conversation_memory.messages.append(Message(
+                message_id=message_id,
+                role=role,
+                content=content,
+                timestamp=timestamp,
+            ))
+        elif kind == "partner_memory":
+            self.conversation_memory.set_partner_memory(PartnerMemory(content=record["content"]))
+        elif kind == "scores":
+            self.conversation_scorer.set_scores(ConversationScores(**record["scores"]))
+            self.conversation_scorer.n_partner_positive, self.conversation_scorer.n_partner_negative = record["partner_reactions"]
+        elif kind == "series":
+            self.conversation_scorer.series.append(**dict(zip(self._series_columns, record["row"])))
+            self.n_series += 1
+        elif kind == "end":
+            # 전송 중 잘린 스트림을 받아들이지 않도록 레코드 수를 확인
+            if record["n_messages"] != len(self.conversation_memory.messages) or record["n_series"] != self.n_series:
+                raise ValueError("Session stream record counts do not match the end record")
+            self._ended = True
+        else:
+            raise ValueError(f"Unknown session stream record type: {kind}")
+
+    def finish(self) -> Tuple[ConversationMemory, ConversationScorer]:
+        """
+        Raises:
+            ValueError: end 레코드를 받기 전에 스트림이 끝난 경우.
+        """
+        if not self._ended:
+            raise ValueError("Session stream ended before the end record")
+        return self.conversation_memory, self.conversation_scorer
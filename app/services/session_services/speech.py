@@ -0,0 +1,461 @@
+import math
+import time
+import uuid
+import array
+import asyncio
+import pathlib
+import operator
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Deque, Dict, List, Literal, Optional, Protocol
+
+from . import memory, score
+from ..elements import Message
+from ...core import cancellation, config, logger
+from ...core.metrics import metrics
+
+log = logger.get_logger(__name__)
+
+# === Constants ===
+
+FRAME_MS = 20
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+# 에너지 기반 VAD: 추정한 배경 소음보다 VAD_MARGIN_DB 이상 크면 음성 프레임으로 판단
+VAD_MARGIN_DB = 12.0
+VAD_MIN_DB = -45.0
+VAD_INITIAL_NOISE_DB = -60.0
+VAD_NOISE_ADAPTATION = 0.05
+VAD_START_FRAMES = 3           # 60ms 이상 연속으로 음성이면 발화 시작
+VAD_END_FRAMES = 30            # 600ms 이상 조용하면 발화 종료
+VAD_PREROLL_FRAMES = 10        # 발화 시작 직전 200ms를 함께 포함
+MIN_SEGMENT_SECONDS = 0.25
+MAX_SEGMENT_SECONDS = 15.0
+# 스테레오에서 다른 채널이 300ms 이상 우세하면 화자가 바뀐 것으로 보고 발화를 나눔
+TURN_SWITCH_FRAMES = 15
+
+# 스테레오 입력의 채널 순서 (채널 0: 사용자 마이크, 채널 1: 파트너 마이크)
+CHANNEL_SPEAKERS = ("나", "파트너")
+
+Speaker = Literal["나", "파트너"]
+
+# === Models ===
+
+@dataclass
+class SpeechSegment:
+    """
+    VAD로 잘라낸 한 화자의 발화 구간. pcm은 16-bit 모노 PCM입니다.
+    """
+    speaker: Speaker
+    pcm: bytes
+    sample_rate: int
+    start_seconds: float
+    end_seconds: float
+
+    @property
+    def duration(self) -> float:
+        return self.end_seconds - self.start_seconds
+
+
+class UnsupportedAudioError(ValueError):
+    """
+    지원하지 않는 오디오 형식이거나 디코더를 사용할 수 없을 때 발생합니다.
+    """
+
+# === Decoders ===
+
+class PcmDecoder:
+    """
+    16-bit little-endian PCM 청크를 샘플 경계에 맞춰 이어 붙입니다.
+    """
+
+    def __init__(self, channels: int) -> None:
+        self._block = SAMPLE_WIDTH * channels
+        self._remainder = b""
+
+    def decode(self, chunk: bytes) -> bytes:
+        data = self._remainder + chunk
+        cut = len(data) - len(data) % self._block
+        self._remainder = data[cut:]
+        return data[:cut]
+
+
+class OpusDecoder:
+    """
+    2바이트 big-endian 길이가 앞에 붙은 Opus 패킷 스트림을 16-bit PCM으로 디코딩합니다.
+    opuslib이 설치되어 있어야 합니다.
+    """
+
+    def __init__(self, sample_rate: int, channels: int) -> None:
+        try:
+            import opuslib
+        except ImportError as e:
+            raise UnsupportedAudioError("Opus decoding requires the opuslib package.") from e
+        self._decoder = opuslib.Decoder(sample_rate, channels)
+        self._max_frame_size = sample_rate * 120 // 1000
+        self._buffer = b""
+
+    def decode(self, chunk: bytes) -> bytes:
+        self._buffer += chunk
+        pcm = []
+        while len(self._buffer) >= 2:
+            size = int.from_bytes(self._buffer[:2], "big")
+            if len(self._buffer) < 2 + size:
+                break
+            packet, self._buffer = self._buffer[2:2 + size], self._buffer[2 + size:]
+            pcm.append(self._decoder.decode(packet, self._max_frame_size))
+        return b"".join(pcm)
+
+
+def get_decoder(encoding: str, sample_rate: int, channels: int):
+    if encoding == "pcm_s16le":
+        return PcmDecoder(channels)
+    if encoding == "opus":
+        return OpusDecoder(sample_rate, channels)
+    raise UnsupportedAudioError(f"Unsupported audio encoding: {encoding}")
+
+# === Voice Activity Detection ===
+
+def frame_db(samples: array.array) -> float:
+    if not samples:
+        return -100.0
+    rms = math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples))
+    return 20.0 * math.log10(rms / 32768.0) if rms > 0 else -100.0
+
+
+class VoiceActivityDetector:
+    """
+    20ms 프레임 단위의 에너지 기반 VAD.
+    배경 소음 수준을 추적하면서 발화 구간을 잘라 SpeechSegment로 반환합니다.
+
+    스테레오 입력이면 채널마다 한 화자의 마이크로 보고, 더 큰 채널의 화자를 발화에 배정합니다.
+    모노 입력이면 `speaker`로 지정한 화자를 배정합니다.
+    """
+
+    def __init__(self, sample_rate: int, channels: int, speaker: Optional[Speaker] = None) -> None:
+        if channels not in (1, 2):
+            raise UnsupportedAudioError("Only mono or stereo audio is supported.")
+        if channels == 1 and speaker is None:
+            raise UnsupportedAudioError("Speaker must be given for mono audio.")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.speaker = speaker
+        self.frame_bytes = sample_rate * FRAME_MS // 1000 * SAMPLE_WIDTH * channels
+        self.noise_db = VAD_INITIAL_NOISE_DB
+        self._buffer = b""
+        self._n_frames = 0
+        self._preroll: Deque[tuple] = deque(maxlen=VAD_PREROLL_FRAMES)
+        self._segment: List[tuple] = []
+        self._segment_energy = [0.0] * channels
+        self._segment_start = 0
+        self._n_voiced_run = 0
+        self._n_silent_run = 0
+        self._n_switch_run = 0
+
+    def _split_channels(self, frame: bytes) -> List[array.array]:
+        samples = array.array("h", frame)
+        if self.channels == 1:
+            return [samples]
+        return [samples[0::2], samples[1::2]]
+
+    def _dominant(self, frames: List[tuple]) -> int:
+        if self.channels == 1:
+            return 0
+        energy = [0.0] * self.channels
+        for _, dbs in frames:
+            for ch, db in enumerate(dbs):
+                energy[ch] += 10.0 ** (db / 10.0)
+        return max(range(self.channels), key=energy.__getitem__)
+
+    def _start_segment(self, frames: List[tuple], start_frame: int) -> None:
+        self._segment = []
+        self._segment_energy = [0.0] * self.channels
+        self._segment_start = start_frame
+        for entry in frames:
+            self._append(entry)
+
+    def _append(self, entry: tuple) -> None:
+        self._segment.append(entry)
+        for ch, db in enumerate(entry[1]):
+            self._segment_energy[ch] += 10.0 ** (db / 10.0)
+
+    def _finish(self, frames: List[tuple], start_frame: int) -> Optional[SpeechSegment]:
+        if len(frames) * FRAME_MS / 1000 < MIN_SEGMENT_SECONDS:
+            return None
+        channel = self._dominant(frames)
+        speaker = self.speaker if self.channels == 1 else CHANNEL_SPEAKERS[channel]
+        pcm = b"".join(channels[channel].tobytes() for channels, _ in frames)
+        start = start_frame * FRAME_MS / 1000
+        return SpeechSegment(
+            speaker=speaker,
+            pcm=pcm,
+            sample_rate=self.sample_rate,
+            start_seconds=start,
+            end_seconds=start + len(frames) * FRAME_MS / 1000,
+        )
+
+    def _process_frame(self, frame: bytes) -> Optional[SpeechSegment]:
+        channels = self._split_channels(frame)
+        dbs = [frame_db(samples) for samples in channels]
+        loudest = max(dbs)
+        threshold = max(self.noise_db + VAD_MARGIN_DB, VAD_MIN_DB)
+        voiced = loudest >= threshold
+        entry = (channels, dbs)
+        frame_idx = self._n_frames
+        self._n_frames += 1
+
+        if not self._segment:
+            if not voiced:
+                self.noise_db += VAD_NOISE_ADAPTATION * (loudest - self.noise_db)
+            self._preroll.append(entry)
+            self._n_voiced_run = self._n_voiced_run + 1 if voiced else 0
+            if self._n_voiced_run >= VAD_START_FRAMES:
+                self._start_segment(list(self._preroll), frame_idx + 1 - len(self._preroll))
+                self._preroll.clear()
+                self._n_silent_run = self._n_switch_run = 0
+            return None
+
+        # 발화 중: 화자 전환, 침묵, 최대 길이를 확인
+        if self.channels > 1 and voiced:
+            current = max(range(self.channels), key=self._segment_energy.__getitem__)
+            frame_channel = max(range(self.channels), key=dbs.__getitem__)
+            self._n_switch_run = self._n_switch_run + 1 if frame_channel != current else 0
+            if self._n_switch_run >= TURN_SWITCH_FRAMES:
+                # 새 화자가 말하기 시작한 프레임부터 새 발화로 분리
+                split = len(self._segment) - self._n_switch_run + 1
+                finished = self._finish(self._segment[:split], self._segment_start)
+                self._start_segment(self._segment[split:] + [entry], self._segment_start + split)
+                self._n_switch_run = self._n_silent_run = 0
+                return finished
+
+        self._append(entry)
+        self._n_silent_run = 0 if voiced else self._n_silent_run + 1
+        if self._n_silent_run >= VAD_END_FRAMES or len(self._segment) * FRAME_MS / 1000 >= MAX_SEGMENT_SECONDS:
+            return self._flush_segment()
+        return None
+
+    def _flush_segment(self) -> Optional[SpeechSegment]:
+        frames = self._segment[:len(self._segment) - self._n_silent_run] if self._n_silent_run else self._segment
+        finished = self._finish(frames, self._segment_start)
+        self._segment = []
+        self._n_voiced_run = self._n_silent_run = self._n_switch_run = 0
+        return finished
+
+    def feed(self, pcm: bytes) -> List[SpeechSegment]:
+        """
+        PCM 데이터를 추가하고 완료된 발화 구간을 반환합니다.
+        """
+        self._buffer += pcm
+        segments = []
+        n_full = len(self._buffer) // self.frame_bytes
+        for i in range(n_full):
+            segment = self._process_frame(self._buffer[i * self.frame_bytes:(i + 1) * self.frame_bytes])
+            if segment is not None:
+                segments.append(segment)
+        self._buffer = self._buffer[n_full * self.frame_bytes:]
+        return segments
+
+    def flush(self) -> List[SpeechSegment]:
+        """
+        스트림이 끝났을 때 진행 중인 발화를 마무리합니다.
+        """
+        if not self._segment:
+            return []
+        segment = self._flush_segment()
+        return [segment] if segment is not None else []
+
+# === Speech-to-Text Backends ===
+
+class SpeechToTextBackend(Protocol):
+    name: str
+
+    async def transcribe(self, segment: SpeechSegment) -> str:
+        ...
+
+
+class LocalSpeechToText:
+    """
+    네트워크 없이 동작하는 STT 대체 구현.
+    스크립트(한 줄에 한 발화)가 주어지면 발화마다 다음 줄을, 없으면 발화 길이 표시를 반환합니다.
+    """
+    name = "local"
+
+    def __init__(self, transcripts: Optional[List[str]] = None) -> None:
+        self._transcripts: Deque[str] = deque(transcripts or [])
+
+    async def transcribe(self, segment: SpeechSegment) -> str:
+        if self._transcripts:
+            return self._transcripts.popleft()
+        return f"(음성 {segment.duration:.1f}초)"
+
+
+class GoogleSpeechToText:
+    """
+    Google Cloud Speech-to-Text로 발화 구간을 인식합니다. 클라이언트는 첫 사용 시 생성합니다.
+    """
+    name = "google"
+
+    def __init__(self, language_code: str) -> None:
+        self.language_code = language_code
+        self._client = None
+
+    async def transcribe(self, segment: SpeechSegment) -> str:
+        from google.cloud import speech
+
+        if self._client is None:
+            self._client = speech.SpeechAsyncClient()
+        response = await self._client.recognize(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=segment.sample_rate,
+                language_code=self.language_code,
+            ),
+            audio=speech.RecognitionAudio(content=segment.pcm),
+        )
+        return " ".join(
+            result.alternatives[0].transcript.strip()
+            for result in response.results if result.alternatives
+        )
+
+
+def _local_backend() -> LocalSpeechToText:
+    path = config.settings.STT_LOCAL_TRANSCRIPTS_PATH
+    transcripts = None
+    if path:
+        transcripts = [line.strip() for line in pathlib.Path(path).read_text(encoding="utf-8").splitlines() if line.strip()]
+    return LocalSpeechToText(transcripts)
+
+
+STT_BACKENDS: Dict[str, Callable[[], SpeechToTextBackend]] = {
+    "local": _local_backend,
+    "google": lambda: GoogleSpeechToText(config.settings.STT_LANGUAGE_CODE),
+}
+
+
+def register_stt_backend(name: str, factory: Callable[[], SpeechToTextBackend]) -> None:
+    STT_BACKENDS[name] = factory
+    get_stt_backend.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_stt_backend() -> SpeechToTextBackend:
+    name = config.settings.STT_BACKEND
+    if name not in STT_BACKENDS:
+        raise UnsupportedAudioError(f"Unknown STT backend: {name}")
+    return STT_BACKENDS[name]()
+
+# === Ingestion ===
+
+class AudioIngestion:
+    """
+    대화 하나의 오디오 스트림을 받아 발화를 잘라내고, STT 결과를 대화 메시지로 추가합니다.
+
+    발화는 크기가 제한된 큐를 거쳐 하나씩 처리되므로, STT나 메시지 파이프라인이 밀리면
+    feed()가 대기하고 결과적으로 클라이언트의 업로드 속도가 조절됩니다(backpressure).
+    """
+
+    def __init__(
+        self,
+        conversation_memory: memory.ConversationMemory,
+        conversation_scorer: score.ConversationScorer,
+        sample_rate: int,
+        channels: int,
+        encoding: str = "pcm_s16le",
+        speaker: Optional[Speaker] = None,
+        backend: Optional[SpeechToTextBackend] = None,
+        max_pending: Optional[int] = None,
+        conversation_id: Optional[str] = None,
+    ) -> None:
+        # 같은 대화의 /messages 요청과 파이프라인 취소 범위(scope)를 공유하도록 대화 ID를 사용
+        self.conversation_id = conversation_id or conversation_memory.epoch
+        self.conversation_memory = conversation_memory
+        self.conversation_scorer = conversation_scorer
+        self.decoder = get_decoder(encoding, sample_rate, channels)
+        self.vad = VoiceActivityDetector(sample_rate, channels, speaker)
+        self.backend = backend or get_stt_backend()
+        self.messages: List[Message] = []
+        self.n_segments = 0
+        self.n_audio_bytes = 0
+        self.bytes_per_second = sample_rate * channels * SAMPLE_WIDTH
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max_pending or config.settings.AUDIO_MAX_PENDING_SEGMENTS
+        )
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.n_audio_bytes / self.bytes_per_second
+
+    async def _enqueue(self, segment: Optional[SpeechSegment]) -> None:
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        start = time.perf_counter()
+        put = asyncio.ensure_future(self._queue.put(segment))
+        # 큐가 가득 찬 동안 워커가 실패하면 영원히 기다리지 않도록 워커 종료도 함께 기다림
+        await asyncio.wait({put, self._worker}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+        if self._worker.done():
+            self._worker.result()
+        metrics.observe("audio_ingest_backpressure_seconds", time.perf_counter() - start)
+
+    async def _run(self) -> None:
+        while True:
+            segment = await self._queue.get()
+            if segment is None:
+                return
+            start = time.perf_counter()
+            text = (await self.backend.transcribe(segment)).strip()
+            metrics.observe("stt_latency_seconds", time.perf_counter() - start, backend=self.backend.name)
+            metrics.increment("stt_segments_total", speaker=segment.speaker, empty=str(not text).lower())
+            if not text:
+                continue
+
+            # 클라이언트가 보낸 메시지 ID와 겹치지 않도록 별도의 ID를 사용
+            message = Message(
+                message_id=f"audio-{uuid.uuid4().hex}",
+                role=segment.speaker,
+                content=text,
+            )
+            self.conversation_memory.add_message(message=message)
+            self.messages.append(message)
+            # /messages와 같은 방식으로 이전 리비전 대체와 마감 시간에 따라 취소
+            # 연결이 끊기면 본문 읽기가 실패하고 abort()가 워커를 취소하므로 파이프라인도 함께 취소됨
+            await cancellation.pipeline_tracker.run(
+                scope=self.conversation_id,
+                revision=len(self.conversation_memory.messages),
+                pipelines={
+                    "memory": memory.update_partner_memory_pipeline(
+                        conversation_memory=self.conversation_memory
+                    ),
+                    "score": score.update_conversation_scores_pipeline(
+                        conversation_scorer=self.conversation_scorer,
+                        conversation_memory=self.conversation_memory
+                    ),
+                },
+                supersede=config.settings.CANCEL_SUPERSEDED_PIPELINES,
+                deadline=config.settings.REALTIME_PIPELINE_DEADLINE_SECONDS or None,
+            )
+
+    async def feed(self, chunk: bytes) -> None:
+        pcm = self.decoder.decode(chunk)
+        self.n_audio_bytes += len(pcm)
+        for segment in self.vad.feed(pcm):
+            self.n_segments += 1
+            await self._enqueue(segment)
+
+    async def close(self) -> List[Message]:
+        """
+        남은 발화를 처리하고, 이번 스트림에서 추가된 메시지를 반환합니다.
+        """
+        for segment in self.vad.flush():
+            self.n_segments += 1
+            await self._enqueue(segment)
+        await self._enqueue(None)
+        await self._worker
+        return self.messages
+
+    async def abort(self) -> None:
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
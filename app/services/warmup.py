@@ -0,0 +1,57 @@
+import time
+import asyncio
+from typing import Dict, Optional
+
+from ..core import clients, config, logger
+from .session_services import advice, memory_prefilter
+
+log = logger.get_logger(__name__)
+
+_warmup_timings: Optional[Dict[str, float]] = None
+_warmup_lock = asyncio.Lock()
+
+# === Functions ===
+
+def is_warm() -> bool:
+    return _warmup_timings is not None
+
+
+async def warm_up(open_connections: Optional[bool] = None) -> Dict[str, float]:
+    """
+    LAZY_INIT 모드에서 첫 요청 때 수행될 초기화를 미리 수행하고 단계별 소요 시간(초)을 반환합니다.
+    한 번만 수행되며, 이후 호출은 처음의 결과를 반환합니다.
+    조언 목록을 읽지 못하면 예외를 그대로 전달합니다.
+    """
+    global _warmup_timings
+    async with _warmup_lock:
+        if _warmup_timings is not None:
+            return _warmup_timings
+
+        if open_connections is None:
+            open_connections = config.settings.WARMUP_OPEN_CONNECTIONS
+        timings: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        client = clients.async_openai_client
+        timings["openai_client"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        advice.ADVICE_CATALOG.current()
+        timings["advice_catalog"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        memory_prefilter.get_linear_model()
+        timings["memory_prefilter"] = time.perf_counter() - start
+
+        if open_connections:
+            # 첫 LLM 호출이 TCP/TLS 연결 비용을 치르지 않도록 커넥션 풀을 미리 채움
+            start = time.perf_counter()
+            try:
+                await client.models.list()
+            except Exception as e:
+                log.warning("Failed to pre-open OpenAI connection: %s", e)
+            timings["openai_connection"] = time.perf_counter() - start
+
+        _warmup_timings = timings
+        log.info("Warm-up finished in %.3fs", sum(timings.values()))
+        return timings
@@ -0,0 +1,43 @@
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import Response
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes with orjson. Pydantic models and datetimes are supported."""
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+def wrap(key: str, fragment: bytes, **fields: Any) -> bytes:
+    """Return `{**fields, "key": <fragment>}` for an already serialized JSON fragment."""
+    prefix = dumps(fields)[1:-1] + b"," if fields else b""
+    return b"{" + prefix + b'"' + key.encode("utf-8") + b'":' + fragment + b"}"
+
+
+class FastJSONResponse(Response):
+    """
+    JSONResponse rendered with orjson.
+    `bytes` content is treated as already serialized JSON and sent as is.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
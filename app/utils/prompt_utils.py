@@ -1,11 +1,28 @@
 import os
+import re
 import pathlib
-from typing import Literal
+from enum import IntEnum
+from dataclasses import dataclass
+from typing import Dict, List, Literal, Optional, Sequence
+
+from ..core import config
+from ..core.metrics import metrics
 
 PROMPT_DIR = pathlib.Path(__file__).parent / "prompts"
 
 CHAT_PROMPT_FORMAT = "{prompt_name}_{prompt_type}_v{prompt_ver}.txt"
 
+SECTION_SEPARATOR = "\n---\n"
+TRIM_MARKER = "...일부 생략..."
+# 섹션에 이미 들어 있는 생략 표시 줄 (예: prompt_messages()의 "...이전 메시지 일부 생략...")
+_TRIM_MARKER_RE = re.compile(r"^\.\.\..*생략\.\.\.$")
+
+# 한글/한자는 글자당 약 1토큰, 영문/숫자는 약 4글자당 1토큰, 그 외 기호는 1토큰으로 추정
+_WIDE_CHAR_RE = re.compile(r"[\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff]")
+_ASCII_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_SYMBOL_RE = re.compile(r"[^\sA-Za-z0-9\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff]")
+MESSAGE_OVERHEAD_TOKENS = 4
+
 
 def load_prompt(
     prompt_name: str,
@@ -21,4 +38,143 @@ def load_prompt(
     prompt_path = os.path.join(PROMPT_DIR, prompt_filename)
 
     with open(prompt_path, 'r', encoding='utf-8') as file:
-        return file.read()
\ No newline at end of file
+        return file.read()
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without a tokenizer."""
+    if not text:
+        return 0
+    n_wide = len(_WIDE_CHAR_RE.findall(text))
+    n_ascii = sum((len(word) + 3) // 4 for word in _ASCII_WORD_RE.findall(text))
+    n_symbol = len(_SYMBOL_RE.findall(text))
+    return n_wide + n_ascii + n_symbol
+
+
+def estimate_messages_tokens(messages: Sequence[Dict[str, str]]) -> int:
+    """Estimate the number of tokens in a list of chat messages."""
+    return sum(
+        estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+def get_prompt_token_budget(prompt_name: str, default: int) -> int:
+    """Return the token budget for a prompt, honoring the PROMPT_TOKEN_BUDGETS override."""
+    return config.settings.PROMPT_TOKEN_BUDGETS.get(prompt_name, default)
+
+
+class Stability(IntEnum):
+    """
+    How often a prompt section changes. Sections are laid out from stable to volatile
+    so that the provider's automatic prefix caching can reuse the longest prefix.
+    """
+    STATIC = 0    # never changes while the server runs (e.g. the advice catalog)
+    SESSION = 1   # changes a few times per conversation (e.g. partner memos)
+    RECENT = 2    # changes with every message (e.g. recent messages)
+    VOLATILE = 3  # changes with every request (e.g. elapsed time)
+
+
+@dataclass
+class PromptSection:
+    """
+    A section of a prompt.
+
+    Sections with a lower `priority` are trimmed first when the prompt is over budget.
+    `trim_from="head"` drops the oldest lines (e.g. messages), `"tail"` drops the last
+    lines (e.g. memos) and `"none"` never trims the section. The first `n_header_lines`
+    lines are always kept. `STATIC` sections are placed in the system message.
+    """
+    content: str
+    stability: Stability = Stability.RECENT
+    priority: int = 0
+    trim_from: Literal["head", "tail", "none"] = "none"
+    n_header_lines: int = 1
+
+
+def fit_prompt_sections(
+    sections: Sequence[PromptSection],
+    budget: int,
+    reserved_tokens: int = 0,
+) -> List[str]:
+    """
+    Trim sections line by line, lowest priority first, until the estimated size fits the budget.
+    Returns the (possibly trimmed) content of each section in the original order.
+    """
+    lines = [section.content.split("\n") for section in sections]
+    costs = [[estimate_tokens(line) + 1 for line in section_lines] for section_lines in lines]
+    separator_cost = estimate_tokens(SECTION_SEPARATOR) * max(len(sections) - 1, 0)
+    total = reserved_tokens + separator_cost + sum(sum(c) for c in costs)
+    if total <= budget:
+        return [section.content for section in sections]
+
+    trimmed = [False] * len(sections)
+    order = sorted(range(len(sections)), key=lambda i: (sections[i].priority, i))
+    for i in order:
+        section = sections[i]
+        if total <= budget:
+            break
+        if section.trim_from == "none":
+            continue
+        header = lines[i][:section.n_header_lines]
+        body = lines[i][section.n_header_lines:]
+        body_costs = costs[i][section.n_header_lines:]
+        marker = TRIM_MARKER
+        existing_marker_cost = 0
+        if section.trim_from == "head" and body and _TRIM_MARKER_RE.match(body[0]):
+            # 이미 생략 표시로 시작하는 섹션은 표시를 하나 더 붙이지 않고 기존 표시를 유지
+            marker = body.pop(0)
+            existing_marker_cost = body_costs.pop(0)
+            total -= existing_marker_cost
+        while body and total > budget:
+            if not trimmed[i]:
+                trimmed[i] = True
+                total += estimate_tokens(marker) + 1
+            if section.trim_from == "head":
+                body.pop(0)
+                total -= body_costs.pop(0)
+            else:
+                body.pop()
+                total -= body_costs.pop()
+        if trimmed[i]:
+            if section.trim_from == "head":
+                lines[i] = header + [marker] + body
+            else:
+                lines[i] = header + body + [marker]
+        elif existing_marker_cost:
+            total += existing_marker_cost
+
+    return ["\n".join(section_lines) for section_lines in lines]
+
+
+def build_prompt_messages(
+    prompt_name: str,
+    system_prompt: str,
+    sections: Sequence[PromptSection],
+    budget: int,
+) -> List[Dict[str, str]]:
+    """
+    Assemble the system and user messages of a prompt, ordered from stable to volatile,
+    within the prompt's token budget, and record the estimated prompt size.
+    """
+    static_sections = [s for s in sections if s.stability == Stability.STATIC]
+    user_sections = sorted(
+        (s for s in sections if s.stability != Stability.STATIC),
+        key=lambda s: s.stability,
+    )
+    system_content = "\n\n".join([system_prompt] + [s.content for s in static_sections])
+
+    reserved_tokens = estimate_tokens(system_content) + 2 * MESSAGE_OVERHEAD_TOKENS
+    budget = get_prompt_token_budget(prompt_name, budget)
+    contents = fit_prompt_sections(user_sections, budget=budget, reserved_tokens=reserved_tokens)
+    user_content = SECTION_SEPARATOR.join(contents)
+
+    n_tokens = reserved_tokens + estimate_tokens(user_content)
+    metrics.observe("prompt_tokens_estimated", n_tokens, prompt=prompt_name)
+    if any(trimmed != section.content for trimmed, section in zip(contents, user_sections)):
+        metrics.increment("prompt_trimmed_total", prompt=prompt_name)
+
+    return [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_content},
+    ]
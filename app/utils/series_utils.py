@@ -0,0 +1,130 @@
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class RingBuffer:
+    """
+    Fixed-capacity columnar buffer backed by `array.array`.
+    Storage is allocated lazily and doubled on demand up to `capacity`;
+    appending to a full buffer then overwrites the oldest row.
+    """
+
+    def __init__(self, columns: Dict[str, str], capacity: int, initial_capacity: int = 16) -> None:
+        """`columns` maps a column name to an array typecode, e.g. {"t": "d", "role": "b"}."""
+        self.capacity = capacity
+        self.initial_capacity = max(1, min(initial_capacity, capacity))
+        self._columns = {name: array(typecode) for name, typecode in columns.items()}
+        self._allocated = 0
+        self._start = 0
+        self._size = 0
+        self.n_appended = 0
+
+    @property
+    def n_allocated(self) -> int:
+        return self._allocated
+
+    def _grow(self) -> None:
+        # 가득 차기 전에는 덮어쓰지 않으므로 행이 0부터 연속으로 저장되어 있음
+        new_allocated = min(max(self._allocated * 2, self.initial_capacity), self.capacity)
+        for column in self._columns.values():
+            column.extend([0] * (new_allocated - self._allocated))
+        self._allocated = new_allocated
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def n_dropped(self) -> int:
+        return self.n_appended - self._size
+
+    def append(self, **values: float) -> None:
+        if self._size == self._allocated and self._allocated < self.capacity:
+            self._grow()
+        index = (self._start + self._size) % self.capacity
+        for name, column in self._columns.items():
+            column[index] = values[name]
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+        self.n_appended += 1
+
+    def column(self, name: str) -> List[float]:
+        """Return a column in insertion order (oldest first)."""
+        column = self._columns[name]
+        end = self._start + self._size
+        if end <= self.capacity:
+            return column[self._start:end].tolist()
+        return column[self._start:].tolist() + column[:end - self.capacity].tolist()
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        return {name: self.column(name) for name in self._columns}
+
+    def extend(self, columns: Dict[str, Iterable[float]]) -> None:
+        for row in zip(*(columns[name] for name in self._columns)):
+            self.append(**dict(zip(self._columns, row)))
+
+
+def _sort_by_x(xs: Sequence[float], ys: Sequence[float]) -> Tuple[Sequence[float], Sequence[float]]:
+    """Return the points ordered by x (timestamps may arrive out of order)."""
+    if all(xs[i] <= xs[i + 1] for i in range(len(xs) - 1)):
+        return xs, ys
+    order = sorted(range(len(xs)), key=xs.__getitem__)
+    return [xs[i] for i in order], [ys[i] for i in order]
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], n_out: int) -> List[Tuple[float, float]]:
+    """Largest-Triangle-Three-Buckets downsampling. Keeps the first and last points (by x)."""
+    xs, ys = _sort_by_x(xs, ys)
+    n = len(xs)
+    if n_out >= n:
+        return list(zip(xs, ys))
+    if n_out < 3:
+        return [(xs[0], ys[0]), (xs[-1], ys[-1])][:max(n_out, 0)]
+
+    sampled = [(xs[0], ys[0])]
+    bucket_size = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_start, next_end = end, min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = xs[-1], ys[-1]
+        else:
+            avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+            avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best, best_area = start, -1.0
+        ax, ay = xs[a], ys[a]
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append((xs[best], ys[best]))
+        a = best
+    sampled.append((xs[-1], ys[-1]))
+    return sampled
+
+
+def bucket_mean(xs: Sequence[float], ys: Sequence[float], n_buckets: int) -> List[Tuple[float, float]]:
+    """Average points into `n_buckets` equal-width x ranges. Empty buckets are skipped."""
+    if not xs or n_buckets <= 0:
+        return []
+    xs, ys = _sort_by_x(xs, ys)
+    lo, hi = xs[0], xs[-1]
+    width = (hi - lo) / n_buckets
+    if width <= 0:
+        return [(lo, sum(ys) / len(ys))]
+
+    sums = [0.0] * n_buckets
+    counts = [0] * n_buckets
+    for x, y in zip(xs, ys):
+        index = min(int((x - lo) / width), n_buckets - 1)
+        sums[index] += y
+        counts[index] += 1
+    return [
+        (lo + (index + 0.5) * width, sums[index] / counts[index])
+        for index in range(n_buckets)
+        if counts[index]
+    ]
@@ -0,0 +1,82 @@
+import re
+import math
+import zlib
+from collections import Counter
+from typing import Dict, List, Tuple
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_REPEAT_RE = re.compile(r"(.)\1{2,}")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, collapse whitespace and squeeze characters repeated three or more times."""
+    text = _WHITESPACE_RE.sub(" ", text.strip().lower())
+    return _REPEAT_RE.sub(r"\1\1", text)
+
+
+def char_ngrams(text: str, n_min: int = 1, n_max: int = 3) -> List[str]:
+    """Return the character n-grams of each whitespace-separated word, padded with spaces."""
+    ngrams = []
+    for word in normalize_text(text).split(" "):
+        if not word:
+            continue
+        padded = f" {word} "
+        for n in range(n_min, n_max + 1):
+            ngrams.extend(padded[i:i + n] for i in range(len(padded) - n + 1) if padded[i:i + n].strip())
+    return ngrams
+
+
+def hashed_features(text: str, n_buckets: int, n_min: int = 1, n_max: int = 3) -> Dict[int, float]:
+    """Return the character n-gram counts of a text hashed into `n_buckets` buckets."""
+    features: Dict[int, float] = {}
+    for ngram in char_ngrams(text, n_min=n_min, n_max=n_max):
+        bucket = zlib.crc32(ngram.encode("utf-8")) % n_buckets
+        features[bucket] = features.get(bucket, 0.0) + 1.0
+    return features
+
+
+class BM25Index:
+    """
+    In-memory BM25 index over character n-grams. Documents can be added incrementally;
+    document frequencies are kept up to date so IDF is always computed on the current corpus.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, n_min: int = 2, n_max: int = 3) -> None:
+        self.k1 = k1
+        self.b = b
+        self.n_min = n_min
+        self.n_max = n_max
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._doc_lengths: List[int] = []
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, document: str) -> int:
+        """Add a document and return its index."""
+        doc_idx = len(self._doc_lengths)
+        term_counts = Counter(char_ngrams(document, self.n_min, self.n_max))
+        for term, tf in term_counts.items():
+            self._postings.setdefault(term, []).append((doc_idx, tf))
+        length = sum(term_counts.values())
+        self._doc_lengths.append(length)
+        self._total_length += length
+        return doc_idx
+
+    def score(self, query: str) -> List[float]:
+        """Return the BM25 score of every document for a query, in index order."""
+        n_docs = len(self._doc_lengths)
+        scores = [0.0] * n_docs
+        if not n_docs:
+            return scores
+        avg_length = self._total_length / n_docs or 1.0
+        for term in set(char_ngrams(query, self.n_min, self.n_max)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_idx, tf in postings:
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[doc_idx] / avg_length)
+                scores[doc_idx] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return scores
@@ -0,0 +1,52 @@
+# python -m benchmarks.compare benchmarks/results/<before>.json benchmarks/results/<after>.json
+#
+# 두 부하 테스트 결과를 엔드포인트별로 비교합니다.
+
+import sys
+import json
+import argparse
+import pathlib
+from typing import Dict
+
+SUMMARY_FIELDS = ("requests_per_second", "llm_calls_per_message", "rss_growth_mb")
+ENDPOINT_FIELDS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def load(path: pathlib.Path) -> Dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(before: Dict, after: Dict) -> str:
+    lines = [
+        f"before: {before['meta']['revision']} ({before['meta']['timestamp']})",
+        f"after:  {after['meta']['revision']} ({after['meta']['timestamp']})",
+        "",
+        f"{'metric':<52} {'before':>10} {'after':>10} {'delta':>9}",
+    ]
+    for field in SUMMARY_FIELDS:
+        b, a = before.get(field, 0.0), after.get(field, 0.0)
+        lines.append(f"{field:<52} {b:>10.2f} {a:>10.2f} {delta(b, a):>9}")
+    for endpoint in sorted(set(before["endpoints"]) | set(after["endpoints"])):
+        for field in ENDPOINT_FIELDS:
+            b = before["endpoints"].get(endpoint, {}).get(field, 0.0)
+            a = after["endpoints"].get(endpoint, {}).get(field, 0.0)
+            lines.append(f"{endpoint + ' ' + field:<52} {b:>10.1f} {a:>10.1f} {delta(b, a):>9}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Compare two load test results.")
+    parser.add_argument("before", type=pathlib.Path)
+    parser.add_argument("after", type=pathlib.Path)
+    args = parser.parse_args(argv)
+    print(compare(load(args.before), load(args.after)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# python -m benchmarks.import_time --runs 5
+#
+# 새 인터프리터에서 app.main 임포트(콜드 스타트)와 첫 /ready 워밍업에 걸리는 시간을 측정하고,
+# -X importtime 결과에서 누적 시간이 큰 모듈을 보여 줍니다.
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START_SCRIPT = """
+import json, time, asyncio
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.services import warmup
+asyncio.run(warmup.warm_up(open_connections=False))
+print(json.dumps({"import_seconds": imported - start, "warmup_seconds": time.perf_counter() - imported}))
+"""
+
+
+def _env(lazy_init: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "stub")
+    env["LAZY_INIT"] = "true" if lazy_init else "false"
+    env["PYTHONPATH"] = ROOT_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def measure_cold_start(lazy_init: bool) -> Dict[str, float]:
+    output = subprocess.check_output(
+        [sys.executable, "-c", COLD_START_SCRIPT],
+        cwd=ROOT_DIR, env=_env(lazy_init), stderr=subprocess.DEVNULL, text=True,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def top_imports(lazy_init: bool, n_top: int) -> List[Tuple[str, float]]:
+    """-X importtime 결과에서 누적 임포트 시간이 큰 최상위 패키지를 반환합니다."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT_DIR, env=_env(lazy_init), capture_output=True, text=True,
+    )
+    cumulative: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum_us, name = line.split("|")
+        if not cum_us.strip().isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        cumulative[package] = max(cumulative.get(package, 0.0), int(cum_us) / 1e6)
+    return sorted(cumulative.items(), key=lambda x: x[1], reverse=True)[:n_top]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the app.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    for lazy_init in (True, False):
+        runs = [measure_cold_start(lazy_init) for _ in range(args.runs)]
+        imports = [r["import_seconds"] for r in runs]
+        warmups = [r["warmup_seconds"] for r in runs]
+        print(
+            f"LAZY_INIT={lazy_init}: import median {statistics.median(imports) * 1000:.0f}ms "
+            f"(min {min(imports) * 1000:.0f}ms), warm-up median {statistics.median(warmups) * 1000:.0f}ms"
+        )
+        for package, seconds in top_imports(lazy_init, args.top):
+            print(f"    {package:<32} {seconds * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
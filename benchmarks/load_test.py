@@ -0,0 +1,193 @@
+# python -m benchmarks.load_test --dates 200 --max-messages 20
+#
+# FastAPI 앱을 ASGI로 프로세스 안에서 실행하고, 스텁 LLM을 사용해
+# 대화 코퍼스를 여러 소개팅에 동시에 재생하면서 엔드포인트별 지연 시간을 측정합니다.
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import pathlib
+import resource
+import subprocess
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+import httpx
+
+from app.core import clients
+from app.core.metrics import metrics
+from app.main import app
+from .stub_llm import StubAsyncOpenAI
+
+BENCHMARK_DIR = pathlib.Path(__file__).parent
+DEFAULT_CORPUS = BENCHMARK_DIR / "corpus" / "transcripts.jsonl"
+DEFAULT_RESULTS_DIR = BENCHMARK_DIR / "results"
+MESSAGE_PIPELINE_PREFIXES = ("memory/", "score/")
+
+
+def load_corpus(path: pathlib.Path) -> List[Dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def rss_mb() -> float:
+    """현재 프로세스의 RSS(MB). /proc가 없으면 최대 RSS를 사용합니다."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCHMARK_DIR, stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class LoadTest:
+    def __init__(self, corpus: List[Dict], n_dates: int, concurrency: int, max_messages: int) -> None:
+        self.corpus = corpus
+        self.n_dates = n_dates
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.max_messages = max_messages
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.n_messages = 0
+
+    async def _request(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs) -> None:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[f"{endpoint} {response.status_code}"] += 1
+
+    async def run_date(self, client: httpx.AsyncClient, date_idx: int) -> None:
+        transcript = self.corpus[date_idx % len(self.corpus)]
+        conversation_id = f"bench-{date_idx}-{transcript['transcript_id']}"
+        base = f"/api/v1/conversation/{conversation_id}"
+        async with self.semaphore:
+            await self._request(client, "POST /conversation", "POST", base)
+            for idx, message in enumerate(transcript["messages"][:self.max_messages]):
+                payload = {"message": {"message_id": str(idx), **message}}
+                await self._request(client, "POST /messages", "POST", f"{base}/messages", json=payload)
+                await self._request(client, "POST /realtime-memory", "POST", f"{base}/realtime-memory")
+                await self._request(client, "GET /realtime-analysis", "GET", f"{base}/realtime-analysis")
+                self.n_messages += 1
+            await self._request(client, "POST /breaktime-advice/recommendation", "POST", f"{base}/breaktime-advice/recommendation")
+            await self._request(client, "POST /breaktime-advice/{advice_id}", "POST", f"{base}/breaktime-advice/advice_1")
+            await self._request(client, "POST /final-report", "POST", f"{base}/final-report")
+            await self._request(client, "DELETE /conversation", "DELETE", base)
+
+    async def run(self) -> Dict:
+        transport = httpx.ASGITransport(app=app)
+        rss_start = rss_mb()
+        start = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            await asyncio.gather(*(self.run_date(client, i) for i in range(self.n_dates)))
+        elapsed = time.perf_counter() - start
+        rss_end = rss_mb()
+
+        llm_calls: Dict[str, float] = defaultdict(float)
+        for labels, value in metrics.get_counters("llm_calls_total"):
+            llm_calls[labels["pipeline"]] += value
+        message_llm_calls = sum(v for k, v in llm_calls.items() if k.startswith(MESSAGE_PIPELINE_PREFIXES))
+        n_requests = sum(len(v) for v in self.latencies.values())
+
+        return {
+            "endpoints": {
+                endpoint: {
+                    "count": len(values),
+                    "mean_ms": sum(values) / len(values) * 1000,
+                    "p50_ms": percentile(values, 0.50) * 1000,
+                    "p95_ms": percentile(values, 0.95) * 1000,
+                    "p99_ms": percentile(values, 0.99) * 1000,
+                }
+                for endpoint, values in self.latencies.items()
+            },
+            "errors": dict(self.errors),
+            "n_dates": self.n_dates,
+            "n_messages": self.n_messages,
+            "n_requests": n_requests,
+            "elapsed_seconds": elapsed,
+            "requests_per_second": n_requests / elapsed if elapsed else 0.0,
+            "llm_calls_per_message": message_llm_calls / self.n_messages if self.n_messages else 0.0,
+            "llm_calls_by_pipeline": dict(llm_calls),
+            "rss_start_mb": rss_start,
+            "rss_end_mb": rss_end,
+            "rss_growth_mb": rss_end - rss_start,
+        }
+
+
+def print_report(result: Dict) -> None:
+    print(f"{'endpoint':<40} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for endpoint, stats in result["endpoints"].items():
+        print(
+            f"{endpoint:<40} {stats['count']:>7} {stats['p50_ms']:>7.1f}ms "
+            f"{stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms"
+        )
+    print(
+        f"\n{result['n_requests']} requests in {result['elapsed_seconds']:.1f}s "
+        f"({result['requests_per_second']:.1f} req/s), "
+        f"{result['llm_calls_per_message']:.2f} LLM calls/message, "
+        f"RSS {result['rss_start_mb']:.1f}MB -> {result['rss_end_mb']:.1f}MB"
+    )
+    if result["errors"]:
+        print(f"errors: {result['errors']}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="In-process load test against a stubbed LLM.")
+    parser.add_argument("--corpus", type=pathlib.Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--dates", type=int, default=100, help="동시에 진행되는 모의 소개팅 수")
+    parser.add_argument("--concurrency", type=int, default=None, help="최대 동시 소개팅 수 (기본: --dates)")
+    parser.add_argument("--max-messages", type=int, default=20, help="소개팅당 재생할 최대 메시지 수")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="스텁 LLM 지연 시간 배율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results-dir", type=pathlib.Path, default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    clients.async_openai_client = StubAsyncOpenAI(latency_scale=args.latency_scale, seed=args.seed)
+    load_test = LoadTest(
+        corpus=load_corpus(args.corpus),
+        n_dates=args.dates,
+        concurrency=args.concurrency or args.dates,
+        max_messages=args.max_messages,
+    )
+    result = asyncio.run(load_test.run())
+    revision = git_revision()
+    result["meta"] = {
+        "revision": revision,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "args": {k: str(v) for k, v in vars(args).items()},
+    }
+    print_report(result)
+
+    if not args.no_save:
+        args.results_dir.mkdir(parents=True, exist_ok=True)
+        path = args.results_dir / f"{datetime.now():%Y%m%d-%H%M%S}-{revision}.json"
+        path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# python -m benchmarks.serialization --memos 40 --messages 200
+#
+# /realtime-memory, /realtime-analysis 응답 직렬화와 세션 스냅샷 코덱을 측정합니다.
+# 기존 경로(pydantic response_model + jsonable_encoder + json.dumps)와 비교하며,
+# orjson 직렬화 자체의 효과와 리비전 캐시의 효과를 따로 보고합니다.
+
+import os
+import json
+import time
+import pickle
+import asyncio
+import argparse
+from typing import Callable, Dict
+
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from app.main import app
+from app.schemas.conversation import GetRealtimeAnalysisOutput, GetRealtimeMemoryOutput
+from app.services import manager
+from app.services.elements import Message
+from app.services.session_services import memory, snapshot
+from app.utils import json_utils
+
+CONVERSATION_ID = "bench-serialization"
+
+
+def populate(n_memos: int, n_messages: int) -> None:
+    conversation_manager = manager.get_conversation_manager()
+    conversation_manager.init_conversation(CONVERSATION_ID)
+    c_m = conversation_manager.get_conversation_memory(CONVERSATION_ID)
+    for i in range(n_messages):
+        c_m.add_message(Message(
+            message_id=str(i),
+            role="파트너" if i % 2 else "나",
+            content=f"{i}번째 메시지입니다. 주말에는 보통 등산을 가거나 카페에서 책을 읽어요.",
+        ))
+    for i in range(n_memos):
+        category = memory.PARTNER_MEMORY_CATEGORIES[i % len(memory.PARTNER_MEMORY_CATEGORIES)]
+        c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+            should_update=True, category=category, content=f"메모 {i}: 주말마다 등산을 즐기고 최근 사진 동호회에 가입함.",
+        ))
+
+
+def timeit(fn: Callable[[], object], n_iter: int) -> float:
+    """호출 1회당 평균 시간(마이크로초)."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(n_iter):
+        fn()
+    return (time.perf_counter() - start) / n_iter * 1e6
+
+
+async def endpoint_latency(method: str, path: str, n_iter: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.request(method, path)
+        start = time.perf_counter()
+        for _ in range(n_iter):
+            await client.request(method, path)
+        return (time.perf_counter() - start) / n_iter * 1e6
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark response serialization and session snapshots.")
+    parser.add_argument("--memos", type=int, default=40)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    populate(args.memos, args.messages)
+    conversation_manager = manager.get_conversation_manager()
+    c_m = conversation_manager.get_conversation_memory(CONVERSATION_ID)
+    s_m = conversation_manager.get_conversation_scorer(CONVERSATION_ID)
+    n = args.iterations
+
+    results: Dict[str, float] = {
+        "realtime-memory: pydantic + jsonable_encoder + json": timeit(
+            lambda: json.dumps(jsonable_encoder(GetRealtimeMemoryOutput(partner_memory=c_m.partner_memory))), n),
+        # 캐시를 쓰지 않은 orjson 인코딩: 직렬화기 교체 효과만 측정
+        "realtime-memory: orjson (uncached)": timeit(
+            lambda: json_utils.dumps({"content": c_m.partner_memory.content}), n),
+        # 리비전이 바뀌지 않아 저장된 bytes를 그대로 반환하는 경우: 캐시 효과
+        "realtime-memory: cached orjson fragment (cache hit)": timeit(lambda: c_m.partner_memory_json(), n),
+        "realtime-analysis: pydantic + jsonable_encoder + json": timeit(
+            lambda: json.dumps(jsonable_encoder(GetRealtimeAnalysisOutput(scores=s_m.get_scores()))), n),
+        "realtime-analysis: orjson (uncached)": timeit(lambda: json_utils.dumps(s_m.get_scores().dict()), n),
+        "realtime-analysis: cached orjson fragment (cache hit)": timeit(lambda: s_m.scores_json(), n),
+    }
+
+    encoded = snapshot.encode_session(c_m, s_m)
+    pickled = pickle.dumps((c_m, s_m))
+    results.update({
+        "snapshot encode: orjson codec": timeit(lambda: snapshot.encode_session(c_m, s_m), n // 10),
+        "snapshot decode: orjson codec": timeit(lambda: snapshot.decode_session(encoded), n // 10),
+        "snapshot encode: pickle": timeit(lambda: pickle.dumps((c_m, s_m)), n // 10),
+        "snapshot decode: pickle": timeit(lambda: pickle.loads(pickled), n // 10),
+    })
+
+    base = f"/api/v1/conversation/{CONVERSATION_ID}"
+    results["POST /realtime-memory (ASGI round trip)"] = asyncio.run(endpoint_latency("POST", f"{base}/realtime-memory", n // 10))
+    results["GET /realtime-analysis (ASGI round trip)"] = asyncio.run(endpoint_latency("GET", f"{base}/realtime-analysis", n // 10))
+
+    for name, micros in results.items():
+        print(f"{name:<56} {micros:>10.1f}us")
+    print(f"snapshot size: orjson {len(encoded)} bytes, pickle {len(pickled)} bytes")
+
+
+if __name__ == "__main__":
+    main()
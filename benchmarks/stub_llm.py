@@ -0,0 +1,168 @@
+import asyncio
+import json
+import random
+import types
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.utils.prompt_utils import estimate_messages_tokens
+
+# 모델별 (중앙값 지연 시간(초), 로그정규 분포 sigma)
+MODEL_LATENCIES = {
+    "gpt-4.1-nano": (0.45, 0.35),
+    "gpt-4.1-mini": (0.9, 0.4),
+}
+DEFAULT_LATENCY = (0.7, 0.4)
+
+
+class StubAsyncOpenAI:
+    """
+    AsyncOpenAI의 beta.chat.completions.parse와 chat.completions.create를 흉내 내는 스텁.
+    모델별 로그정규 분포 지연 시간 후 response_format에 맞는 임의의 응답을 반환합니다.
+    """
+
+    def __init__(self, latency_scale: float = 1.0, seed: Optional[int] = None) -> None:
+        self.latency_scale = latency_scale
+        self.random = random.Random(seed)
+        self.n_calls = 0
+        completions = types.SimpleNamespace(parse=self._parse, create=self._create)
+        self.chat = types.SimpleNamespace(completions=completions)
+        self.beta = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+
+    async def _sleep(self, model: str) -> None:
+        median, sigma = MODEL_LATENCIES.get(model, DEFAULT_LATENCY)
+        await asyncio.sleep(self.random.lognormvariate(0.0, sigma) * median * self.latency_scale)
+
+    def _usage(self, messages: List[Dict[str, str]], completion: str) -> types.SimpleNamespace:
+        prompt_tokens = estimate_messages_tokens(messages)
+        return types.SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=max(len(completion) // 2, 1),
+            total_tokens=prompt_tokens + max(len(completion) // 2, 1),
+            prompt_tokens_details=types.SimpleNamespace(cached_tokens=0),
+        )
+
+    @staticmethod
+    def _response(message: types.SimpleNamespace, usage: types.SimpleNamespace) -> types.SimpleNamespace:
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(message=message, finish_reason="stop")],
+            usage=usage,
+        )
+
+    async def _parse(self, messages, model, response_format, **kwargs):
+        self.n_calls += 1
+        await self._sleep(model)
+        parsed = response_format.parse_obj(self.fake_value(response_format, messages))
+        content = parsed.json()
+        message = types.SimpleNamespace(parsed=parsed, content=content, refusal=None)
+        return self._response(message, self._usage(messages, content))
+
+    async def _create(self, messages, model, **kwargs):
+        self.n_calls += 1
+        await self._sleep(model)
+        content = json.dumps({"취미/관심사": ["스텁 요약"]}, ensure_ascii=False)
+        message = types.SimpleNamespace(parsed=None, content=content, refusal=None)
+        return self._response(message, self._usage(messages, content))
+
+    def fake_value(self, tp: Any, messages: List[Dict[str, str]]) -> Any:
+        """
+        타입 힌트를 따라 그럴듯한 임의 값을 만듭니다.
+        """
+        origin = typing.get_origin(tp)
+        args = typing.get_args(tp)
+        if isinstance(tp, type) and issubclass(tp, BaseModel):
+            return {
+                name: self._fake_field(tp, name, hint, messages)
+                for name, hint in typing.get_type_hints(tp).items()
+            }
+        if origin is typing.Union:
+            non_none = [arg for arg in args if arg is not type(None)]
+            return self.fake_value(non_none[0], messages) if non_none else None
+        if origin is typing.Literal:
+            return self.random.choice(args)
+        if origin in (list, List):
+            return [self.fake_value(args[0], messages) for _ in range(self.random.randint(1, 3))]
+        if origin in (dict, Dict):
+            return {}
+        if tp is bool:
+            return self.random.random() < 0.5
+        if tp is int:
+            return self.random.randint(0, 4)
+        if tp is float:
+            return self.random.random()
+        return "스텁 응답"
+
+    def _fake_field(self, model: type, name: str, hint: Any, messages: List[Dict[str, str]]) -> Any:
+        if name == "score":
+            return self.random.choices([0, 1, 2, 3, 4], weights=[1, 2, 4, 8, 6])[0]
+        if name == "should_remember":
+            return self.random.random() < 0.4
+        if name == "should_update":
+            return True
+        if name == "content" and model.__name__ == "PartnerMemoryUpdateInstruction":
+            target = messages[-1]["content"].rsplit("\n", 1)[-1]
+            return target.split(":", 1)[-1].strip()[:40] or "스텁 메모"
+        if name == "advice_ids":
+            ids = [f"advice_{i}" for i in range(1, 11)]
+            self.random.shuffle(ids)
+            return ids[:5]
+        return self.fake_value(hint, messages)
+
+
+class ScriptedAsyncOpenAI(StubAsyncOpenAI):
+    """
+    테스트용으로 응답을 직접 지정하는 스텁.
+    answer(model, messages, response_format)가 반환한 값을 응답으로 쓰고, 예외 객체를 반환하면 그 예외를 던집니다.
+    delays로 모델별 지연 시간(초)을 지정할 수 있으며, 지연 중 취소된 호출은 cancelled_models에 기록됩니다.
+    """
+
+    def __init__(
+        self,
+        answer: Callable[[str, List[Dict[str, str]], Any], Any],
+        delays: Optional[Dict[str, float]] = None,
+    ) -> None:
+        super().__init__(latency_scale=0.0, seed=0)
+        self.answer = answer
+        self.delays = delays or {}
+        self.calls: List[Tuple[str, List[Dict[str, str]]]] = []
+        self.cancelled_models: List[str] = []
+
+    @classmethod
+    def by_model(cls, answers: Dict[str, Any], **kwargs) -> "ScriptedAsyncOpenAI":
+        """모델별로 정해진 응답을 반환하는 스텁을 만듭니다."""
+        return cls(lambda model, messages, response_format: answers[model], **kwargs)
+
+    @classmethod
+    def failing(cls, error: BaseException, **kwargs) -> "ScriptedAsyncOpenAI":
+        """모든 호출에서 error를 던지는 스텁을 만듭니다."""
+        return cls(lambda model, messages, response_format: error, **kwargs)
+
+    @property
+    def models(self) -> List[str]:
+        return [model for model, _ in self.calls]
+
+    async def _answer(self, messages, model, response_format) -> Any:
+        self.n_calls += 1
+        self.calls.append((model, messages))
+        try:
+            await asyncio.sleep(self.delays.get(model, 0.0))
+        except asyncio.CancelledError:
+            self.cancelled_models.append(model)
+            raise
+        result = self.answer(model, messages, response_format)
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _parse(self, messages, model, response_format, **kwargs):
+        parsed = await self._answer(messages, model, response_format)
+        content = parsed.json() if parsed is not None else ""
+        message = types.SimpleNamespace(parsed=parsed, content=content, refusal=None)
+        return self._response(message, self._usage(messages, content))
+
+    async def _create(self, messages, model, **kwargs):
+        content = await self._answer(messages, model, None)
+        message = types.SimpleNamespace(parsed=None, content=content, refusal=None)
+        return self._response(message, self._usage(messages, content))
@@ -0,0 +1,79 @@
+# PYTHONPATH=. pytest -s tests/admission.py
+
+import asyncio
+
+import httpx
+
+from app.core import admission, cancellation, config
+from app.main import app
+from app.services import manager
+from app.services.session_services.memory_prefilter import is_low_priority_message
+
+
+def test_degradation_levels(monkeypatch):
+    controller = admission.admission_controller
+    target = controller.target_queue_wait
+    monkeypatch.setattr(controller, "queue_wait", 0.0)
+    assert controller.level() == admission.NORMAL and controller.n_consistency(3) == 3
+
+    monkeypatch.setattr(controller, "queue_wait", target * 0.8)
+    assert controller.level() == admission.SKIP_LOW_PRIORITY_MEMORY
+    assert controller.n_consistency(3) == 1 and controller.skip_low_priority_memory()
+    assert is_low_priority_message("아 진짜요? 대박") and not is_low_priority_message("저 27살이에요")
+
+
+def test_disabled_admission_never_degrades(monkeypatch):
+    controller = admission.admission_controller
+    monkeypatch.setattr(config.settings, "ADMISSION_ENABLED", False)
+    monkeypatch.setattr(controller, "n_inflight_pipelines", controller.target_inflight_pipelines)
+    monkeypatch.setattr(controller, "queue_wait", controller.target_queue_wait * 10)
+    assert controller.level() == admission.NORMAL
+    assert controller.n_consistency(3) == 3 and not controller.skip_low_priority_memory()
+
+
+def test_shed_non_realtime_endpoints(monkeypatch):
+    monkeypatch.setattr(admission.admission_controller, "queue_wait", admission.admission_controller.target_queue_wait * 10)
+    manager.get_conversation_manager().init_conversation("admission-test")
+    base = "/conversation/admission-test"
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            report = await client.post(f"{base}/final-report")
+            realtime = await client.get(f"{base}/realtime-analysis")
+            status = await client.get("/admin/admission")
+            return report, realtime, status
+
+    report, realtime, status = asyncio.run(run())
+    assert report.status_code == 503 and int(report.headers["retry-after"]) >= 1
+    assert realtime.status_code == 200
+    assert status.json()["level_name"] == "shed_non_realtime"
+
+
+def test_inflight_pipelines_and_queue_wait_decay(monkeypatch):
+    controller = admission.AdmissionController(
+        max_concurrent=4, max_queue_wait=1.0, target_inflight_pipelines=4,
+        target_queue_wait=0.5, level_thresholds=[0.5, 0.75, 1.0], queue_wait_half_life=0.05,
+    )
+    release = asyncio.Event()
+
+    @controller.track_pipeline
+    async def pipeline():
+        await release.wait()
+
+    async def run():
+        # 같은 대화의 이전 메시지 파이프라인이 끝나지 않아도 모두 셈 (PipelineTracker는 슬롯 하나만 유지)
+        tracker = cancellation.PipelineTracker()
+        tasks = [asyncio.ensure_future(tracker.run("c", revision, {"memory": pipeline()})) for revision in (1, 2)]
+        tasks.append(asyncio.ensure_future(pipeline()))
+        await asyncio.sleep(0.01)
+        n_inflight = controller.n_inflight_pipelines
+        release.set()
+        await asyncio.gather(*tasks)
+        return n_inflight
+
+    assert asyncio.run(run()) == 3 and controller.n_inflight_pipelines == 0
+
+    controller.observe_queue_wait(5.0)
+    assert controller.level() == admission.SHED_NON_REALTIME
+    asyncio.run(asyncio.sleep(0.5))
+    assert controller.level() == admission.NORMAL
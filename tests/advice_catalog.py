@@ -0,0 +1,100 @@
+# PYTHONPATH=. pytest -s tests/advice_catalog.py
+
+import os
+import json
+import time
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.services.session_services import advice
+
+
+def _write(path, title, signals=("few_partner_messages",)):
+    path.write_text(json.dumps({
+        "Advice_1": {
+            "emoji": "💬",
+            "title": title,
+            "description": "대화 소재를 추천합니다.",
+            "prompt_instruction": "상대의 관심사로 질문을 만드세요.",
+            "signals": list(signals),
+        },
+    }, ensure_ascii=False), encoding="utf-8")
+    # 같은 타임스탬프 해상도 안에서 다시 써도 변경이 감지되도록 mtime을 앞당김
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_on_change_and_force(tmp_path):
+    path = tmp_path / "advice_metadatas.json"
+    _write(path, "대화 소재")
+    catalog = advice.AdviceCatalog(path)
+
+    snapshot = catalog.current()
+    assert snapshot.version == 1
+    assert snapshot.normalized_index["advice_1"].title == "대화 소재"
+    assert "대화 소재" in snapshot.blocks["Advice_1"] and snapshot.blocks["Advice_1"] in snapshot.list_block
+    assert snapshot.signals == {"Advice_1": ["few_partner_messages"]}
+    assert catalog.reload() is False
+
+    _write(path, "새 대화 소재", signals=())
+    # reload_interval=0이면 current()는 파일을 다시 확인하지 않음
+    assert catalog.current() is snapshot
+    assert catalog.reload() is True
+    assert catalog.current().version == 2
+    assert catalog.current().normalized_index["advice_1"].title == "새 대화 소재"
+    assert "새 대화 소재" in catalog.current().list_block
+    assert catalog.current().signals == {"Advice_1": []}
+    assert catalog.reload(force=True) is True and catalog.version == 3
+
+    # 파싱 오류가 나면 현재 버전을 유지
+    path.write_text("{", encoding="utf-8")
+    assert catalog.reload(force=True) is False
+    assert catalog.version == 3 and catalog.current().metadatas["Advice_1"].title == "새 대화 소재"
+
+
+def test_current_checks_file_once_per_interval(tmp_path):
+    path = tmp_path / "advice_metadatas.json"
+    _write(path, "대화 소재")
+    catalog = advice.AdviceCatalog(path, reload_interval=0.2)
+    catalog.current()
+
+    _write(path, "새 대화 소재")
+    assert catalog.current().metadatas["Advice_1"].title == "대화 소재"
+    time.sleep(0.25)
+    assert catalog.current().metadatas["Advice_1"].title == "새 대화 소재"
+    assert catalog.version == 2
+
+
+def test_admin_reload_endpoint(tmp_path, monkeypatch):
+    path = tmp_path / "advice_metadatas.json"
+    _write(path, "대화 소재")
+    catalog = advice.AdviceCatalog(path)
+    monkeypatch.setattr(advice, "ADVICE_CATALOG", catalog)
+    catalog.current()
+    _write(path, "새 대화 소재")
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            return await client.post("/admin/advice-catalog/reload")
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert response.json() == {"reloaded": True, "version": 2}
+    assert advice.get_advice_metadata(" advice_1 ").title == "새 대화 소재"
+
+
+def test_advice_block_uses_one_catalog_version(tmp_path, monkeypatch):
+    path = tmp_path / "advice_metadatas.json"
+    _write(path, "대화 소재")
+    catalog = advice.AdviceCatalog(path)
+    before = catalog.current()
+    path.write_text(path.read_text(encoding="utf-8").replace("Advice_1", "Advice_2"), encoding="utf-8")
+    assert catalog.reload(force=True)
+    # 첫 번째 조회 직후에 재로딩된 상황
+    snapshots = iter([before, catalog.current()])
+    monkeypatch.setattr(catalog, "current", lambda: next(snapshots))
+    monkeypatch.setattr(advice, "ADVICE_CATALOG", catalog)
+
+    assert "대화 소재" in advice.advice_metadata_to_str("advice_1")
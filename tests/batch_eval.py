@@ -0,0 +1,89 @@
+# PYTHONPATH=. pytest -s tests/batch_eval.py
+
+import json
+
+import pytest
+
+from app import batch_eval
+from app.core import admission, clients, config
+from benchmarks.stub_llm import StubAsyncOpenAI
+
+
+def _write_corpus(path, n_transcripts):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n_transcripts):
+            messages = [
+                {"role": "나", "content": "주말에 보통 뭐 하세요?"},
+                {"role": "파트너", "content": "저는 주말마다 등산을 가요. 요즘은 북한산에 자주 가요."},
+            ]
+            f.write(json.dumps({"transcript_id": f"t-{i}", "messages": messages}, ensure_ascii=False) + "\n")
+
+
+def test_batch_eval_writes_results_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setattr(clients, "async_openai_client", StubAsyncOpenAI(latency_scale=0.0, seed=0))
+    corpus, output = tmp_path / "corpus.jsonl", tmp_path / "results.jsonl"
+    _write_corpus(corpus, 5)
+
+    report = batch_eval.main([
+        "--corpus", str(corpus), "--output", str(output),
+        "--pipelines", "memory,score", "--concurrency", "2", "--limit", "3",
+    ])
+    assert report["n_transcripts"] == 3 and report["n_failed"] == 0 and report["llm_calls"] > 0
+
+    # 중단된 실행처럼 잘린 마지막 줄을 남긴 뒤 이어서 실행
+    with open(output, "ab") as f:
+        f.write(b'{"transcript_id": "t-')
+    report = batch_eval.main([
+        "--corpus", str(corpus), "--output", str(output), "--pipelines", "memory,score",
+    ])
+    assert report["n_skipped"] == 3 and report["n_transcripts"] == 2
+    completed = batch_eval.load_completed(output)
+    assert completed == {f"t-{i}" for i in range(5)}
+    assert all("scores" in json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()[-2:])
+
+
+def test_batch_eval_retries_failures_and_validates_shards(tmp_path, monkeypatch):
+    monkeypatch.setattr(clients, "async_openai_client", StubAsyncOpenAI(latency_scale=0.0, seed=0))
+    corpus, output = tmp_path / "corpus.jsonl", tmp_path / "results.jsonl"
+    _write_corpus(corpus, 3)
+    evaluate_transcript = batch_eval.evaluate_transcript
+
+    async def flaky(transcript, pipelines):
+        if transcript["transcript_id"] == "t-1":
+            raise ConnectionError("temporary outage")
+        return await evaluate_transcript(transcript, pipelines)
+
+    monkeypatch.setattr(batch_eval, "evaluate_transcript", flaky)
+    args = ["--corpus", str(corpus), "--output", str(output), "--pipelines", "score"]
+    assert batch_eval.main(args)["n_failed"] == 1
+    assert batch_eval.load_completed(output) == {"t-0", "t-2"}
+    assert "t-1" in batch_eval.errors_path(output).read_text(encoding="utf-8")
+
+    # 일시적인 실패는 다음 실행에서 다시 시도
+    monkeypatch.setattr(batch_eval, "evaluate_transcript", evaluate_transcript)
+    report = batch_eval.main(args)
+    assert report["n_transcripts"] == 1 and report["n_failed"] == 0
+    assert batch_eval.load_completed(output) == {"t-0", "t-1", "t-2"}
+
+    with pytest.raises(SystemExit):
+        batch_eval.main(args + ["--shard-index", "3"])
+    with pytest.raises(SystemExit):
+        batch_eval.main(args + ["--shard-index", "3", "--num-shards", "2"])
+
+
+def test_batch_eval_disables_degradation_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(clients, "async_openai_client", StubAsyncOpenAI(latency_scale=0.0, seed=0))
+    # 다른 요청으로 서버가 과부하인 상황
+    controller = admission.admission_controller
+    monkeypatch.setattr(controller, "queue_wait", controller.target_queue_wait * 10)
+    corpus, output = tmp_path / "corpus.jsonl", tmp_path / "results.jsonl"
+    _write_corpus(corpus, 2)
+    args = ["--corpus", str(corpus), "--output", str(output), "--pipelines", "score"]
+
+    assert batch_eval.main(args)["max_admission_level"] == "normal"
+    assert config.settings.ADMISSION_ENABLED
+    rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert {row["admission_level"] for row in rows} == {"normal"}
+
+    output.unlink()
+    assert batch_eval.main(args + ["--admission"])["max_admission_level"] == "shed_non_realtime"
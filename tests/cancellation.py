@@ -0,0 +1,35 @@
+# PYTHONPATH=. pytest -s tests/cancellation.py
+
+import asyncio
+
+from app.core import cancellation, clients, llm
+from app.core.metrics import metrics
+from benchmarks.stub_llm import StubAsyncOpenAI
+
+
+def _call(pipeline):
+    return llm.create_json(pipeline, "gpt-4.1-mini", [{"role": "user", "content": "점수를 JSON으로 알려줘"}])
+
+
+def test_superseded_and_deadline(monkeypatch):
+    monkeypatch.setattr(clients, "async_openai_client", StubAsyncOpenAI(latency_scale=1.0, seed=0))
+    tracker = cancellation.PipelineTracker()
+    cancelled_before = metrics.get_counter(
+        "llm_cancelled_calls_total", pipeline="test/superseded", model="gpt-4.1-mini", reason="superseded")
+
+    async def run():
+        old = asyncio.ensure_future(tracker.run("c", 1, {"score": _call("test/superseded")}, supersede=["score"]))
+        await asyncio.sleep(0.01)
+        new = await tracker.run("c", 2, {"score": asyncio.sleep(0, result="new")}, supersede=["score"])
+        expired = await tracker.run("c", 3, {"memory": _call("test/deadline")}, deadline=0.01)
+        return await old, new, expired
+
+    old, new, expired = asyncio.run(run())
+    assert old == {"score": None} and new == {"score": "new"} and expired == {"memory": None}
+    assert metrics.get_counter(
+        "llm_cancelled_calls_total", pipeline="test/superseded", model="gpt-4.1-mini", reason="superseded",
+    ) == cancelled_before + 1
+    assert metrics.get_counter(
+        "llm_cancelled_prompt_tokens_total", pipeline="test/deadline", model="gpt-4.1-mini", reason="deadline",
+    ) > 0
+    assert tracker.n_inflight() == 0
@@ -0,0 +1,46 @@
+# PYTHONPATH=. pytest -s tests/fleet.py
+
+import pytest
+
+from app.services.elements import Message
+from app.services.fleet import fleet_analytics
+from app.services.manager import ConversationManager
+from app.services.session_services import memory, score
+
+
+def _populate(conversation_manager, n_conversations):
+    for i in range(n_conversations):
+        conversation_id = f"fleet-{i}"
+        conversation_manager.init_conversation(conversation_id)
+        c_m = conversation_manager.get_conversation_memory(conversation_id)
+        s_m = conversation_manager.get_conversation_scorer(conversation_id)
+        for j in range(i + 1):
+            c_m.add_message(Message(message_id=str(j), role="파트너" if j % 2 else "나", content="안녕하세요"))
+            s_m.update(c_m, score.MessageSentimentScore(score=4))
+        c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+            should_update=True, category="취미/관심사", content="주말마다 등산"))
+
+
+def test_fleet_table_tracks_conversations():
+    conversation_manager = ConversationManager()
+    _populate(conversation_manager, 3)
+    conversation_manager.delete_conversation("fleet-0")
+    columns = conversation_manager.fleet.columns
+    rows = [slot for slot in range(conversation_manager.fleet.n_rows) if columns["active"][slot]]
+    assert sorted(columns["n_messages"][slot] for slot in rows) == [2, 3]
+    assert all(columns["n_memos"][slot] == 1 for slot in rows)
+
+    data = conversation_manager.snapshot_conversation("fleet-2")
+    conversation_manager.restore_conversation("fleet-2", data)
+    assert sum(columns["active"][:conversation_manager.fleet.n_rows]) == 2
+
+
+def test_fleet_analytics():
+    pytest.importorskip("numpy")
+    conversation_manager = ConversationManager()
+    _populate(conversation_manager, 5)
+    report = fleet_analytics(conversation_manager.fleet)
+    assert report["n_active"] == 5
+    assert report["distributions"]["n_messages"]["max"] == 5
+    assert report["distributions"]["partner_engagement"]["count"] == 5
+    assert sum(report["histograms"]["user_engagement"]["counts"]) == 5
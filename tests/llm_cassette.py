@@ -0,0 +1,70 @@
+# PYTHONPATH=. pytest -s tests/llm_cassette.py
+
+import json
+import types
+import asyncio
+
+import pytest
+
+from app.core import cassette, clients, config, llm
+from app.services.session_services.score import MessageSentimentScore
+from benchmarks.stub_llm import StubAsyncOpenAI
+
+MESSAGES = [{"role": "user", "content": "메시지: 오늘 정말 즐거웠어요!"}]
+
+
+def _use_cassette(monkeypatch, path, mode):
+    cassette._open_cassette.cache_clear()
+    monkeypatch.setattr(config.settings, "LLM_CASSETTE_MODE", mode)
+    monkeypatch.setattr(config.settings, "LLM_CASSETTE_PATH", str(path))
+    monkeypatch.setattr(config.settings, "LLM_CASSETTE_TIME_SCALE", 0.0)
+
+
+def test_record_then_replay_without_client(tmp_path, monkeypatch):
+    path = tmp_path / "cassette.jsonl"
+
+    _use_cassette(monkeypatch, path, "record")
+    monkeypatch.setattr(clients, "async_openai_client", StubAsyncOpenAI(latency_scale=0.0, seed=0))
+    recorded = asyncio.run(llm.parse("test/score", "gpt-4.1-nano", MESSAGES, MessageSentimentScore))
+    recorded_json = asyncio.run(llm.create_json("test/report", "gpt-4.1-mini", MESSAGES))
+    cassette.get_cassette().close()
+
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["pipeline"] for line in lines] == ["test/score", "test/report"]
+
+    _use_cassette(monkeypatch, path, "replay")
+    monkeypatch.setattr(clients, "async_openai_client", None)
+    assert asyncio.run(llm.parse("test/score", "gpt-4.1-nano", MESSAGES, MessageSentimentScore)) == recorded
+    assert asyncio.run(llm.create_json("test/report", "gpt-4.1-mini", MESSAGES)) == recorded_json
+    cassette._open_cassette.cache_clear()
+
+
+def test_replay_falls_back_to_pipeline_order(tmp_path, monkeypatch):
+    path = tmp_path / "cassette.jsonl"
+    entries = [
+        cassette.CassetteEntry(key=f"k{i}", pipeline="test/score", model="m", response={"score": i}, latency=0.1)
+        for i in range(2)
+    ]
+    path.write_text("".join(json.dumps(e.__dict__) + "\n" for e in entries), encoding="utf-8")
+
+    _use_cassette(monkeypatch, path, "replay")
+    tape = cassette.get_cassette()
+    assert tape.replay("k1", "test/score").response == {"score": 1}
+    # 프롬프트가 바뀌어 key가 일치하지 않으면 아직 재생하지 않은 기록을 순서대로 반환
+    assert tape.replay("changed", "test/score").response == {"score": 0}
+    with pytest.raises(cassette.CassetteMiss):
+        tape.replay("changed", "test/score")
+    cassette._open_cassette.cache_clear()
+
+
+def test_prompt_cache_report():
+    for model, (prompt_tokens, cached_tokens) in {"gpt-4.1-nano": (100, 40), "gpt-4.1-mini": (100, 0)}.items():
+        llm._record_usage("test/cache-report", model, 0.5 if cached_tokens == 0 else 0.2, types.SimpleNamespace(
+            prompt_tokens=prompt_tokens, completion_tokens=1,
+            prompt_tokens_details=types.SimpleNamespace(cached_tokens=cached_tokens),
+        ))
+
+    report = llm.prompt_cache_report()["test/cache-report"]
+    assert report["prompt_tokens"] == 200 and report["cached_tokens"] == 40
+    assert report["cache_hit_ratio"] == 0.2
+    assert abs(report["latency_saved_seconds"] - 0.3) < 1e-9
@@ -0,0 +1,91 @@
+# PYTHONPATH=. pytest -s tests/local_advice.py
+
+import asyncio
+
+from app.core import clients, config
+from app.core.metrics import metrics
+from app.services.elements import Message
+from app.services.session_services import memory, score
+from app.services.session_services.advice import (
+    AdviceRecommendation,
+    BreaktimeAdviceRecommender,
+    LocalAdviceRecommender,
+)
+from app.utils.text_utils import BM25Index
+from benchmarks.stub_llm import ScriptedAsyncOpenAI
+
+# 사용자가 혼자 말하고 파트너는 짧게 반응하는 대화
+ONE_SIDED = [
+    ("나", "안녕하세요 저는 회사원이에요"), ("파트너", "네"),
+    ("나", "주말에 보통 뭐 하세요? 저는 등산 자주 가요"), ("파트너", "음"),
+    ("나", "산 정상에서 먹는 컵라면 최고예요"), ("파트너", "네"),
+    ("나", "요즘 회사 일이 많아서 힘들어요"), ("파트너", "아"), ("파트너", "네"),
+]
+
+
+def _conversation(messages):
+    c_m = memory.ConversationMemory(my_info={}, partner_info={})
+    for i, (role, content) in enumerate(messages):
+        c_m.add_message(Message(message_id=str(i), role=role, content=content))
+    return c_m
+
+
+def _one_sided_scorer():
+    s_m = score.ConversationScorer()
+    s_m.set_scores(score.ConversationScores(user_engagement=3.0, partner_engagement=2.0, user_talk_share=0.8))
+    return s_m
+
+
+def test_bm25_scores_matching_document_highest():
+    index = BM25Index()
+    for document in ["주말마다 등산을 다녀요", "고양이 두 마리를 키워요", "회사에서 개발자로 일해요"]:
+        index.add(document)
+
+    scores = index.score("등산 좋아하세요?")
+    assert scores[0] > 0 and scores[1] == scores[2] == 0
+    assert index.score("xyz") == [0.0, 0.0, 0.0]
+    assert BM25Index().score("등산") == []
+
+
+def test_signals_select_advice():
+    c_m = _conversation(ONE_SIDED)
+    s_m = _one_sided_scorer()
+    assert LocalAdviceRecommender.detect_signals(c_m) == []
+    assert LocalAdviceRecommender.detect_signals(c_m, s_m) == ["low_partner_engagement", "user_dominates"]
+    # 두 신호에 모두 해당하는 "살짝 과했을 수도?"가 1순위
+    assert LocalAdviceRecommender.rank(c_m, s_m)[:2] == ["advice_4", "advice_8"]
+
+    # 신호가 약하면 대화 내용과의 BM25 점수로 정렬
+    c_m = _conversation([("나", "상대에게 칭찬 한 마디 하고 싶어요")])
+    assert LocalAdviceRecommender.detect_signals(c_m) == ["few_partner_messages"]
+    assert LocalAdviceRecommender.rank(c_m)[0] == "advice_5"
+
+
+def test_recommender_modes(monkeypatch):
+    c_m = _conversation(ONE_SIDED)
+    s_m = _one_sided_scorer()
+    local_ranking = LocalAdviceRecommender.rank(c_m, s_m)
+    llm_ranking = ["advice_6", "advice_1", "advice_4", "advice_8", "advice_10"]
+
+    def recommend(mode, client):
+        monkeypatch.setattr(config.settings, "ADVICE_RECOMMENDER_MODE", mode)
+        monkeypatch.setattr(clients, "async_openai_client", client)
+        output = asyncio.run(BreaktimeAdviceRecommender.do(c_m, n_consistency=1, conversation_scorer=s_m))
+        return [metadata.advice_id for metadata in output]
+
+    # local: LLM을 호출하지 않음
+    client = ScriptedAsyncOpenAI.failing(RuntimeError("unexpected call"))
+    assert recommend("local", client) == local_ranking
+    assert client.n_calls == 0
+
+    # fallback: LLM이 실패하면 로컬 순위를 사용
+    fallbacks_before = metrics.get_counter("advice_recommender_fallback_total")
+    assert recommend("fallback", ScriptedAsyncOpenAI.failing(RuntimeError("invalid response"))) == local_ranking
+    assert metrics.get_counter("advice_recommender_fallback_total") == fallbacks_before + 1
+    llm_client = ScriptedAsyncOpenAI.by_model({"gpt-4.1-nano": AdviceRecommendation(advice_ids=llm_ranking)})
+    assert recommend("fallback", llm_client) == llm_ranking
+
+    # blend: 로컬 순위가 LOCAL_BLEND_VOTES(2)표, LLM 순위가 1표로 순위 합을 계산
+    # advice_4: 3 + 2*1, advice_1: 2 + 2*3, advice_8: 4 + 2*2, advice_6: 1 + 2*5, advice_10: 5 + 2*4
+    assert local_ranking == ["advice_4", "advice_8", "advice_1", "advice_10", "advice_6"]
+    assert recommend("blend", llm_client) == ["advice_4", "advice_1", "advice_8", "advice_6", "advice_10"]
@@ -0,0 +1,88 @@
+# PYTHONPATH=. pytest -s tests/local_sentiment.py
+# LLM 경로와의 비교: RUN_LLM_BENCHMARK=1 OPENAI_API_KEY=... PYTHONPATH=. pytest -s tests/local_sentiment.py
+
+import os
+import json
+import time
+import asyncio
+import logging
+import pathlib
+
+import pytest
+
+from app.core import config
+from app.services.elements import Message
+from app.services.session_services import memory, score
+from app.services.session_services.local_sentiment import score_message
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_PATH = pathlib.Path(__file__).parent / "fixtures" / "message_sentiment.jsonl"
+
+
+def load_samples():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        return [(record["content"], record["score"]) for record in map(json.loads, f)]
+
+
+def test_negation_flips_polarity():
+    assert score_message("좋아요").score == 4
+    assert score_message("안 좋아요").score < 3
+    assert score_message("재밌지 않아요").score < 3
+
+
+def test_lone_cues_and_questions_are_left_to_llm():
+    threshold = config.settings.LOCAL_SENTIMENT_CONFIDENCE_THRESHOLD
+    for content in ["좋아하는 음식이 뭐에요?", "뭐 좋아하세요", "재밌었어요 ㅎㅎ?", "좋아요", "짜증나요"]:
+        assert score_message(content).confidence < threshold, content
+    assert score_message("진짜 재밌고 좋아요 ㅎㅎ").confidence >= threshold
+
+
+def test_local_agreement_and_latency():
+    samples = load_samples()
+    threshold = config.settings.LOCAL_SENTIMENT_CONFIDENCE_THRESHOLD
+
+    start = time.perf_counter()
+    outputs = [score_message(content) for content, _ in samples]
+    elapsed_us = (time.perf_counter() - start) / len(samples) * 1e6
+
+    confident = [(o, label) for o, (_, label) in zip(outputs, samples) if o.confidence >= threshold]
+    coverage = len(confident) / len(samples)
+    exact = sum(o.score == label for o, label in confident) / max(len(confident), 1)
+    within_one = sum(abs(o.score - label) <= 1 for o, label in confident) / max(len(confident), 1)
+    logger.info(
+        f"Local sentiment: coverage={coverage:.2f} exact={exact:.2f} "
+        f"within_one={within_one:.2f} latency={elapsed_us:.1f}us/message"
+    )
+
+    assert coverage >= 0.3
+    assert within_one >= 0.9
+    assert elapsed_us < 1000
+
+
+@pytest.mark.skipif(os.getenv("RUN_LLM_BENCHMARK") != "1", reason="LLM 벤치마크는 RUN_LLM_BENCHMARK=1일 때만 실행")
+def test_agreement_with_llm_path():
+    samples = load_samples()
+    threshold = config.settings.LOCAL_SENTIMENT_CONFIDENCE_THRESHOLD
+
+    async def llm_score(content):
+        conversation_memory = memory.ConversationMemory()
+        conversation_memory.add_message(Message(message_id="0", role="파트너", content=content))
+        start = time.perf_counter()
+        output = await score.RealtimeSentimentalAnalyzer.do(conversation_memory=conversation_memory)
+        return output.score, time.perf_counter() - start
+
+    llm_outputs = asyncio.run(asyncio.wait_for(
+        asyncio.gather(*(llm_score(content) for content, _ in samples)),
+        timeout=120,
+    ))
+    local_outputs = [score_message(content) for content, _ in samples]
+
+    confident = [(o.score, s) for o, (s, _) in zip(local_outputs, llm_outputs) if o.confidence >= threshold]
+    agreement = sum(abs(a - b) <= 1 for a, b in confident) / max(len(confident), 1)
+    llm_latency_ms = sum(latency for _, latency in llm_outputs) / len(llm_outputs) * 1000
+    logger.info(
+        f"Local vs LLM: agreement_within_one={agreement:.2f} on {len(confident)} confident messages, "
+        f"llm_latency={llm_latency_ms:.0f}ms/message"
+    )
+    assert agreement >= 0.8
@@ -0,0 +1,50 @@
+# PYTHONPATH=. pytest -s tests/logger.py
+
+import queue
+import logging
+
+from app.core import logger
+
+
+def _record(name: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 0, "message %s", ("arg",), None)
+
+
+def test_sampling_filter_rate_limit_and_prefix():
+    sampling = logger.SamplingFilter(sample_rates={"app.noisy": 0.0}, rate_limits={"app.services": 2})
+
+    assert not sampling.filter(_record("app.noisy.child"))
+    assert sampling.filter(_record("app.noisy.child", logging.ERROR))
+
+    kept = [sampling.filter(_record("app.services.manager")) for _ in range(10)]
+    assert sum(kept) == 2
+    assert sampling.filter(_record("app.api.v1.conversation"))
+
+
+def test_context_fields_are_formatted():
+    formatter = logger.StructuredFormatter("%(message)s")
+    context_filter = logger.ContextFilter()
+
+    with logger.log_context(conversation_id="c1", stage="messages"):
+        record = _record("app.test")
+        context_filter.filter(record)
+    assert formatter.format(record) == "message arg | conversation_id=c1 stage=messages"
+
+    record = _record("app.test")
+    record.stage = "memory"
+    context_filter.filter(record)
+    assert formatter.format(record) == "message arg | stage=memory"
+
+
+def test_queue_handler_defers_formatting():
+    log_queue = queue.SimpleQueue()
+    handler = logger.DeferredFormatQueueHandler(log_queue)
+    record = _record("app.test")
+    handler.handle(record)
+
+    queued = log_queue.get_nowait()
+    # 로그를 남긴 스레드에서는 포맷하지 않고, 리스너 스레드의 핸들러가 포맷
+    assert queued is not record
+    assert queued.msg == "message %s" and queued.args == ("arg",)
+    assert not hasattr(queued, "message")
+    assert logger.StructuredFormatter("%(message)s").format(queued) == "message arg"
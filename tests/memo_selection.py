@@ -0,0 +1,53 @@
+# PYTHONPATH=. pytest -s tests/memo_selection.py
+
+from app.core import config
+from app.services.elements import Message
+from app.services.session_services import memory
+from app.services.session_services.advice import BreaktimeAdviceRecommender
+from app.utils.prompt_utils import Stability
+
+MEMOS = [
+    ("취미/관심사", "주말마다 북한산 등산"),
+    ("취미/관심사", "재즈 바 자주 감"),
+    ("직업/학업", "판교에서 백엔드 개발자로 일함"),
+    ("가족/친구", "고양이 두 마리 키움"),
+    ("생활습관", "아침형 인간, 6시 기상"),
+    ("이상형/연애관", "대화가 잘 통하는 사람"),
+]
+
+
+def _conversation():
+    c_m = memory.ConversationMemory()
+    for category, content in MEMOS:
+        c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+            should_update=True, category=category, content=content,
+        ))
+    c_m.add_message(Message(message_id="0", role="파트너", content="요즘 등산 다니는 게 제일 재밌어요"))
+    return c_m
+
+
+def test_small_memory_is_not_filtered():
+    c_m = _conversation()
+    section = c_m.partner_memory_prompt_section(query="등산", priority=1)
+    assert section.content == c_m.prompt_partner_memory()
+    assert section.stability == Stability.SESSION
+
+
+def test_relevant_memos_are_selected_within_caps(monkeypatch):
+    monkeypatch.setattr(config.settings, "MEMORY_PROMPT_TOP_K", 2)
+    c_m = _conversation()
+    assert c_m.select_memos("북한산 등산 좋아해요", top_k=2, max_chars=600)[0] == MEMOS[0]
+    selected = c_m.select_memos("등산", top_k=5, max_chars=20)
+    assert MEMOS[0] in selected and sum(len(content) for _, content in selected) <= 20
+
+    section = c_m.partner_memory_prompt_section(query="고양이 키우세요?", priority=1)
+    assert section.stability == Stability.RECENT
+    assert "고양이 두 마리 키움" in section.content and "(관련된 메모 2/6개)" in section.content
+
+    prompt = BreaktimeAdviceRecommender._generate_prompt(c_m)
+    assert "주말마다 북한산 등산" in str(prompt) and "판교에서 백엔드 개발자로 일함" not in str(prompt)
+
+    # set_partner_memory(스냅샷 복원 등)로 교체해도 색인이 다시 만들어져야 함
+    restored = memory.ConversationMemory()
+    restored.set_partner_memory(c_m.partner_memory)
+    assert restored.select_memos("고양이", top_k=1, max_chars=600) == [MEMOS[3]]
@@ -0,0 +1,54 @@
+# PYTHONPATH=. pytest -s tests/memory_cascade.py
+
+import asyncio
+
+from app.core import clients, config
+from app.core.metrics import metrics
+from app.services.elements import Message
+from app.services.session_services import memory
+from app.services.session_services.memory import PartnerMemoryUpdateInstruction, validate_instruction
+from benchmarks.stub_llm import ScriptedAsyncOpenAI
+
+SOURCE = "저는 병원에서 간호사로 일하고 있어요."
+
+
+def test_validate_instruction():
+    def instruction(category="직업/학업", content="병원 간호사로 일함"):
+        return PartnerMemoryUpdateInstruction(should_update=True, category=category, content=content)
+
+    assert validate_instruction(instruction(), SOURCE) is None
+    assert validate_instruction(instruction(category=None), SOURCE) == "missing_category"
+    assert validate_instruction(instruction(content="간호"), SOURCE) == "too_short"
+    assert validate_instruction(instruction(content="간호사" * 40), SOURCE) == "too_long"
+    assert validate_instruction(instruction(content="주말마다 등산을 즐김"), SOURCE) == "no_overlap"
+
+
+def test_cascade_escalates_only_flagged_answers(monkeypatch):
+    monkeypatch.setattr(config.settings, "MEMORY_INSTRUCTION_CASCADE_ENABLED", True)
+    c_m = memory.ConversationMemory(my_info={}, partner_info={})
+    c_m.add_message(Message(message_id="0", role="파트너", content=SOURCE))
+    good = PartnerMemoryUpdateInstruction(should_update=True, category="직업/학업", content="병원 간호사로 일함")
+    escalated_before = metrics.get_counter("memory_cascade_total", result="escalated")
+
+    client = ScriptedAsyncOpenAI.by_model({"gpt-4.1-nano": good, "gpt-4.1-mini": None})
+    monkeypatch.setattr(clients, "async_openai_client", client)
+    assert asyncio.run(memory.PartnerMemoryUpdateInstructionGenerator.do(c_m)) == good
+    assert client.models == ["gpt-4.1-nano"]
+
+    bad = PartnerMemoryUpdateInstruction(should_update=True, category=None, content="병원 간호사로 일함")
+    client = ScriptedAsyncOpenAI.by_model({"gpt-4.1-nano": bad, "gpt-4.1-mini": good})
+    monkeypatch.setattr(clients, "async_openai_client", client)
+    assert asyncio.run(memory.PartnerMemoryUpdateInstructionGenerator.do(c_m)) == good
+    assert client.models == ["gpt-4.1-nano", "gpt-4.1-mini"]
+    assert metrics.get_counter("memory_cascade_total", result="escalated") == escalated_before + 1
+    report = memory.cascade_report()
+    assert 0 < report["escalation_rate"] < 1 and report["baseline_latency_seconds"] > 0
+
+    # 작은 모델 호출이 실패해도 큰 모델로 승격
+    errors_before = metrics.get_counter("memory_cascade_escalations_total", reason="error")
+    client = ScriptedAsyncOpenAI.by_model({"gpt-4.1-nano": RuntimeError("nano unavailable"), "gpt-4.1-mini": good})
+    monkeypatch.setattr(clients, "async_openai_client", client)
+    assert asyncio.run(memory.PartnerMemoryUpdateInstructionGenerator.do(c_m)) == good
+    assert client.models == ["gpt-4.1-nano", "gpt-4.1-mini"]
+    assert metrics.get_counter("memory_cascade_escalations_total", reason="error") == errors_before + 1
+
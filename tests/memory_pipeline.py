@@ -0,0 +1,83 @@
+# PYTHONPATH=. pytest -s tests/memory_pipeline.py
+
+import asyncio
+
+from app.core import clients, config
+from app.core.metrics import metrics
+from app.services.elements import Message
+from app.services.session_services import memory
+from app.services.session_services.memory import PartnerMemoryUpdateInstruction
+from benchmarks.stub_llm import ScriptedAsyncOpenAI
+
+SOURCE = "저는 병원에서 간호사로 일하고 있어요."
+
+
+def _llm_calls(mode):
+    return metrics.get_counter("memory_update_llm_calls_total", mode=mode)
+
+
+def test_fused_mode_makes_one_call(monkeypatch):
+    monkeypatch.setattr(config.settings, "MEMORY_PIPELINE_MODE", "fused")
+    good = PartnerMemoryUpdateInstruction(should_update=True, category="직업/학업", content="병원 간호사로 일함")
+    client = ScriptedAsyncOpenAI.by_model({"gpt-4.1-mini": good})
+    monkeypatch.setattr(clients, "async_openai_client", client)
+    c_m = memory.ConversationMemory(my_info={}, partner_info={})
+    c_m.add_message(Message(message_id="0", role="파트너", content=SOURCE))
+    calls_before = _llm_calls("fused")
+
+    assert asyncio.run(memory.update_partner_memory_pipeline(c_m)) == good
+    assert client.models == ["gpt-4.1-mini"]
+    assert c_m.partner_memory.content["직업/학업"] == ["병원 간호사로 일함"]
+    assert _llm_calls("fused") == calls_before + 1
+
+
+def test_speculative_mode_cancels_or_discards_generator(monkeypatch):
+    monkeypatch.setattr(config.settings, "MEMORY_PIPELINE_MODE", "speculative")
+    monkeypatch.setattr(config.settings, "LLM_HEDGE_ENABLED", False)
+    good = PartnerMemoryUpdateInstruction(should_update=True, category="직업/학업", content="병원 간호사로 일함")
+
+    def run(should_remember, delays):
+        answers = {"gpt-4.1-nano": memory.PartnerMemoryRelevance(should_remember=should_remember), "gpt-4.1-mini": good}
+        client = ScriptedAsyncOpenAI.by_model(answers, delays=delays)
+        monkeypatch.setattr(clients, "async_openai_client", client)
+        c_m = memory.ConversationMemory(my_info={}, partner_info={})
+        c_m.add_message(Message(message_id="0", role="파트너", content=SOURCE))
+
+        async def body():
+            instruction = await memory.update_partner_memory_pipeline(c_m)
+            # 취소된 생성 태스크가 취소 처리를 마칠 때까지 기다림 (asyncio.run 종료 시의 취소와 구분)
+            await asyncio.sleep(0.05)
+            return instruction
+
+        instruction = asyncio.run(asyncio.wait_for(body(), timeout=2))
+        return instruction, client, c_m
+
+    # 관련 있음: 생성 결과를 그대로 사용
+    calls_before = _llm_calls("speculative")
+    instruction, client, c_m = run(True, {})
+    assert instruction == good and c_m.partner_memory.content["직업/학업"] == ["병원 간호사로 일함"]
+    assert sorted(client.models) == ["gpt-4.1-mini", "gpt-4.1-nano"]
+    assert _llm_calls("speculative") == calls_before + 2
+
+    # 관련 없음 + 생성 진행 중: 생성 호출을 취소하고 분류 호출만 셈
+    calls_before = _llm_calls("speculative")
+    cancelled_before = metrics.get_counter("memory_speculation_cancelled_total")
+    cancel_labels = dict(
+        pipeline=memory.PartnerMemoryUpdateInstructionGenerator.PROMPT_NAME, model="gpt-4.1-mini", reason="speculation",
+    )
+    cancelled_calls_before = metrics.get_counter("llm_cancelled_calls_total", **cancel_labels)
+    instruction, client, c_m = run(False, {"gpt-4.1-mini": 10.0})
+    assert not instruction.should_update and c_m.revision == 0
+    assert client.cancelled_models == ["gpt-4.1-mini"]
+    assert metrics.get_counter("memory_speculation_cancelled_total") == cancelled_before + 1
+    assert metrics.get_counter("llm_cancelled_calls_total", **cancel_labels) == cancelled_calls_before + 1
+    assert _llm_calls("speculative") == calls_before + 1
+
+    # 관련 없음 + 생성 완료: 결과를 폐기하고 사용한 토큰을 낭비로 기록
+    calls_before = _llm_calls("speculative")
+    wasted_before = metrics.get_counter("memory_speculation_wasted_tokens_total")
+    instruction, client, c_m = run(False, {"gpt-4.1-nano": 0.05})
+    assert not instruction.should_update and c_m.revision == 0
+    assert client.cancelled_models == []
+    assert metrics.get_counter("memory_speculation_wasted_tokens_total") > wasted_before
+    assert _llm_calls("speculative") == calls_before + 2
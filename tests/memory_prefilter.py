@@ -0,0 +1,64 @@
+# PYTHONPATH=. pytest -s tests/memory_prefilter.py
+
+import json
+import logging
+import pathlib
+
+from app.services.session_services.memory_prefilter import (
+    classify_partner_message,
+    evaluate_prefilter,
+    train_linear_model,
+)
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_PATH = pathlib.Path(__file__).parent / "fixtures" / "partner_memory_relevance.jsonl"
+N_FOLDS = 4
+
+
+def load_samples():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        return [
+            (record["content"], record["should_remember"])
+            for record in map(json.loads, f)
+        ]
+
+
+def test_filler_messages_are_skipped():
+    for content in ["네", "하하", "그러네요", "ㅋㅋㅋㅋ", "아 네~"]:
+        assert classify_partner_message(content).skip, content
+
+
+def test_informative_messages_are_not_skipped():
+    for content in ["27살이에요", "INFP요", "부산", "요가 배워요"]:
+        assert not classify_partner_message(content).skip, content
+
+
+def test_false_skip_rate_on_fixture():
+    report = evaluate_prefilter(load_samples())
+    logger.info(f"Prefilter report: {report}")
+    assert report["false_skip_rate"] == 0.0, report["false_skips"]
+    assert report["irrelevant_recall"] >= 0.7
+
+
+def test_linear_model_does_not_increase_false_skips():
+    # 학습에 쓰지 않은 샘플로만 평가 (N_FOLDS-겹 교차 검증)
+    samples = load_samples()
+    n_relevant = sum(label for _, label in samples)
+    n_irrelevant = len(samples) - n_relevant
+    false_skips, n_true_skips, n_rule_true_skips = [], 0, 0
+    for fold in range(N_FOLDS):
+        train = [sample for i, sample in enumerate(samples) if i % N_FOLDS != fold]
+        held_out = [sample for i, sample in enumerate(samples) if i % N_FOLDS == fold]
+        n_held_out_irrelevant = sum(not label for _, label in held_out)
+        report = evaluate_prefilter(held_out, linear_model=train_linear_model(train))
+        false_skips += report["false_skips"]
+        n_true_skips += round(report["irrelevant_recall"] * n_held_out_irrelevant)
+        n_rule_true_skips += round(evaluate_prefilter(held_out)["irrelevant_recall"] * n_held_out_irrelevant)
+
+    logger.info(
+        f"Held-out linear model: false_skips={false_skips} "
+        f"irrelevant_recall={n_true_skips / n_irrelevant:.2f} (rules only {n_rule_true_skips / n_irrelevant:.2f})"
+    )
+    assert len(false_skips) / n_relevant <= 0.05, false_skips
+    assert n_true_skips >= n_rule_true_skips
@@ -0,0 +1,85 @@
+# PYTHONPATH=. pytest -s tests/prompt_utils.py
+
+from app.utils.prompt_utils import (
+    PromptSection,
+    Stability,
+    TRIM_MARKER,
+    build_prompt_messages,
+    estimate_tokens,
+    fit_prompt_sections,
+)
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("안녕하세요") == 5
+    assert estimate_tokens("UX designer") == 1 + 2
+    assert estimate_tokens("네!") == 2
+
+
+def test_fit_prompt_sections_within_budget_is_unchanged():
+    sections = [PromptSection("### A\n가나다"), PromptSection("### B\n라마바", trim_from="head")]
+    assert fit_prompt_sections(sections, budget=1000) == [s.content for s in sections]
+
+
+def test_fit_prompt_sections_trims_lowest_priority_first():
+    messages = "### 💬 대화 내용:\n" + "\n".join(f"나: 메시지{i}" for i in range(20))
+    memos = "### 📝 파트너에 대한 메모:\n" + "\n".join(f"- 메모{i}" for i in range(20))
+    sections = [
+        PromptSection(memos, priority=1, trim_from="tail"),
+        PromptSection(messages, priority=2, trim_from="head"),
+        PromptSection("### 🔍 분석할 메시지:\n파트너: 좋아요"),
+    ]
+    total = sum(estimate_tokens(s.content) for s in sections)
+    trimmed = fit_prompt_sections(sections, budget=total - 20)
+
+    # 우선순위가 낮은 메모만 잘리고, 대화 내용과 분석할 메시지는 그대로 유지
+    assert trimmed[0].startswith("### 📝 파트너에 대한 메모:\n- 메모0")
+    assert trimmed[0].endswith(TRIM_MARKER)
+    assert trimmed[1] == messages
+    assert trimmed[2] == sections[2].content
+    # 같은 입력에는 항상 같은 결과
+    assert trimmed == fit_prompt_sections(sections, budget=total - 20)
+
+
+def test_fit_prompt_sections_head_trim_keeps_latest_lines():
+    messages = "### 💬 대화 내용:\n" + "\n".join(f"나: 메시지{i}" for i in range(20))
+    trimmed = fit_prompt_sections(
+        [PromptSection(messages, priority=1, trim_from="head")],
+        budget=30,
+    )[0]
+    lines = trimmed.split("\n")
+    assert lines[0] == "### 💬 대화 내용:"
+    assert lines[1] == TRIM_MARKER
+    assert lines[-1] == "나: 메시지19"
+    assert estimate_tokens(trimmed) <= 30 + len(lines)
+
+
+def test_build_prompt_messages_orders_stable_to_volatile():
+    system_message, user_message = build_prompt_messages(
+        "test/prompt",
+        system_prompt="SYSTEM",
+        sections=[
+            PromptSection("### 정보\n경과 시간", stability=Stability.VOLATILE),
+            PromptSection("### 대화\n나: 안녕"),
+            PromptSection("### 조언 목록\nadvice_1", stability=Stability.STATIC),
+            PromptSection("### 메모\n- 등산", stability=Stability.SESSION),
+        ],
+        budget=1000,
+    )
+    assert system_message["content"] == "SYSTEM\n\n### 조언 목록\nadvice_1"
+    assert user_message["content"].index("### 메모") < user_message["content"].index("### 대화")
+    assert user_message["content"].endswith("### 정보\n경과 시간")
+
+
+def test_fit_prompt_sections_keeps_existing_trim_marker():
+    messages = "### 💬 대화 내용:\n...이전 메시지 일부 생략...\n" + "\n".join(f"나: 메시지{i}" for i in range(20))
+    trimmed = fit_prompt_sections(
+        [PromptSection(messages, priority=1, trim_from="head")],
+        budget=40,
+    )[0]
+    lines = trimmed.split("\n")
+    assert lines[:2] == ["### 💬 대화 내용:", "...이전 메시지 일부 생략..."]
+    assert TRIM_MARKER not in lines and len(lines) < 22
+    assert lines[-1] == "나: 메시지19"
+    assert estimate_tokens(trimmed) <= 40 + len(lines)
@@ -0,0 +1,57 @@
+# PYTHONPATH=. pytest -s tests/realtime_polling.py
+
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.services import manager
+from app.services.elements import Message
+from app.services.session_services import memory, score
+
+
+def _add_memo(c_m, category, content):
+    c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+        should_update=True, category=category, content=content,
+    ))
+
+
+def test_etag_and_since_delta():
+    conversation_manager = manager.get_conversation_manager()
+    conversation_manager.init_conversation("polling-test")
+    c_m = conversation_manager.get_conversation_memory("polling-test")
+    s_m = conversation_manager.get_conversation_scorer("polling-test")
+    _add_memo(c_m, "생활습관", "부산 출신")
+    base = "/conversation/polling-test"
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            first = await client.post(f"{base}/realtime-memory")
+            etag = first.headers["etag"]
+            unchanged = await client.post(f"{base}/realtime-memory", headers={"If-None-Match": etag})
+
+            _add_memo(c_m, "취미/관심사", "주말마다 등산")
+            _add_memo(c_m, "고민", "이직 고민 중")
+            changed = await client.post(f"{base}/realtime-memory", headers={"If-None-Match": etag})
+            delta = await client.post(f"{base}/realtime-memory", params={"since": first.json()["revision"]})
+            stale = await client.post(f"{base}/realtime-memory", params={"since": 99})
+
+            analysis = await client.get(f"{base}/realtime-analysis")
+            analysis_unchanged = await client.get(
+                f"{base}/realtime-analysis", headers={"If-None-Match": analysis.headers["etag"]})
+            c_m.add_message(Message(message_id="0", role="파트너", content="반가워요!"))
+            s_m.update(c_m, score.MessageSentimentScore(score=4))
+            analysis_changed = await client.get(
+                f"{base}/realtime-analysis", headers={"If-None-Match": analysis.headers["etag"]})
+            return first, unchanged, changed, delta, stale, analysis_unchanged, analysis_changed
+
+    first, unchanged, changed, delta, stale, analysis_unchanged, analysis_changed = asyncio.run(run())
+    assert first.json()["revision"] == 1
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200 and changed.json()["revision"] == 3
+    assert [(m["category"], m["content"]) for m in delta.json()["memos"]] == [
+        ("취미/관심사", "주말마다 등산"), ("고민", "이직 고민 중"),
+    ]
+    assert stale.json()["full"] and stale.json()["partner_memory"]["content"]["고민"] == ["이직 고민 중"]
+    assert analysis_unchanged.status_code == 304
+    assert analysis_changed.status_code == 200
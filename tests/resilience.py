@@ -0,0 +1,100 @@
+# PYTHONPATH=. pytest -s tests/resilience.py
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.core import clients, config, llm, resilience
+from app.core.metrics import metrics
+from app.services.elements import Message
+from app.services.session_services import memory, score
+from benchmarks.stub_llm import ScriptedAsyncOpenAI, StubAsyncOpenAI
+
+
+def test_failures_degrade_to_last_scores_and_open_circuit(monkeypatch):
+    failing = ScriptedAsyncOpenAI.failing(ConnectionError("connection reset"))
+    monkeypatch.setattr(clients, "async_openai_client", failing)
+    monkeypatch.setattr(config.settings, "LOCAL_SENTIMENT_ENABLED", False)
+    monkeypatch.setattr(config.settings, "LLM_RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(resilience, "_breakers", {})
+
+    c_m = memory.ConversationMemory(my_info={}, partner_info={})
+    s_m = score.ConversationScorer()
+    c_m.add_message(Message(message_id="0", role="파트너", content="주말에 뭐 하세요?"))
+    s_m.set_scores(score.ConversationScores(partner_engagement=3.0))
+
+    asyncio.run(score.update_conversation_scores_pipeline(conversation_scorer=s_m, conversation_memory=c_m))
+    assert s_m.get_scores().partner_engagement == 3.0
+    assert resilience.get_circuit_breaker(score.RealtimeSentimentalAnalyzer.LLM_MODEL).state == "open"
+
+    n_calls = failing.n_calls
+    asyncio.run(score.update_conversation_scores_pipeline(conversation_scorer=s_m, conversation_memory=c_m))
+    assert failing.n_calls == n_calls
+
+
+def test_hedge_past_p95(monkeypatch):
+    stub = StubAsyncOpenAI(latency_scale=0.0, seed=0)
+    slow_calls = []
+    parse = stub.beta.chat.completions.parse
+
+    async def first_call_stalls(**kwargs):
+        if not slow_calls:
+            slow_calls.append(1)
+            await asyncio.sleep(10)
+        return await parse(**kwargs)
+
+    stub.beta.chat.completions.parse = first_call_stalls
+    monkeypatch.setattr(clients, "async_openai_client", stub)
+    monkeypatch.setattr(config.settings, "LLM_HEDGE_MIN_SAMPLES", 0)
+    for _ in range(20):
+        metrics.observe("llm_attempt_latency_seconds", 0.01, pipeline="test/hedge", model="gpt-4.1-nano")
+
+    result = asyncio.run(asyncio.wait_for(
+        llm.parse("test/hedge", "gpt-4.1-nano", [{"role": "user", "content": "점수"}], score.MessageSentimentScore),
+        timeout=2,
+    ))
+    assert isinstance(result, score.MessageSentimentScore)
+    assert metrics.get_counter("llm_hedge_wins_total", pipeline="test/hedge", model="gpt-4.1-nano", winner="hedge") == 1
+
+
+def test_hedge_delay_uses_attempt_latency(monkeypatch):
+    n_calls = []
+
+    def answer(model, messages, response_format):
+        n_calls.append(model)
+        return ConnectionError("connection reset") if len(n_calls) == 1 else response_format(score=3)
+
+    monkeypatch.setattr(clients, "async_openai_client", ScriptedAsyncOpenAI(answer))
+    monkeypatch.setattr(resilience, "_breakers", {})
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0.2)
+    monkeypatch.setattr(config.settings, "LLM_HEDGE_MIN_SAMPLES", 1)
+    asyncio.run(llm.parse("test/attempt", "gpt-4.1-nano", [{"role": "user", "content": "점수"}], score.MessageSentimentScore))
+
+    # 전체 호출 시간에는 백오프가 포함되지만 헤징 기준은 성공한 요청 한 번의 지연 시간
+    labels = dict(pipeline="test/attempt", model="gpt-4.1-nano")
+    assert metrics.get_summary("llm_latency_seconds", **labels)["max"] >= 0.2
+    assert metrics.get_summary("llm_attempt_latency_seconds", **labels)["count"] == 1
+    assert resilience.hedge_delay("test/attempt", "gpt-4.1-nano") == config.settings.LLM_HEDGE_MIN_DELAY
+
+
+def _status_error(status_code):
+    response = httpx.Response(status_code, request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+def test_only_transient_errors_are_retried_and_open_circuit(monkeypatch):
+    monkeypatch.setattr(config.settings, "LLM_RETRY_BASE_DELAY", 0.0)
+    assert resilience.is_retryable(_status_error(503)) and resilience.is_retryable(_status_error(429))
+    assert not resilience.is_retryable(_status_error(400))
+
+    for error in (ValueError("invalid json"), _status_error(400)):
+        failing = ScriptedAsyncOpenAI.failing(error)
+        monkeypatch.setattr(clients, "async_openai_client", failing)
+        monkeypatch.setattr(resilience, "_breakers", {})
+        for _ in range(config.settings.LLM_CIRCUIT_FAILURE_THRESHOLD + 1):
+            with pytest.raises(type(error)):
+                asyncio.run(llm.parse("test/retry", "gpt-4.1-nano", [{"role": "user", "content": "점수"}], score.MessageSentimentScore))
+        assert failing.n_calls == config.settings.LLM_CIRCUIT_FAILURE_THRESHOLD + 1
+        assert resilience.get_circuit_breaker("gpt-4.1-nano").state == "closed"
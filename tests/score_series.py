@@ -0,0 +1,68 @@
+# PYTHONPATH=. pytest -s tests/score_series.py
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.main import app
+from app.services import manager
+from app.services.elements import Message
+from app.services.session_services import score
+from app.services.session_services.final_report import ConversationScorerFinalSummarizer
+from app.utils.series_utils import RingBuffer, bucket_mean, lttb
+
+
+def test_ring_buffer_and_downsampling():
+    buffer = RingBuffer({"t": "d", "v": "f"}, capacity=4)
+    for i in range(6):
+        buffer.append(t=i, v=i * 0.5)
+    assert buffer.column("t") == [2, 3, 4, 5] and buffer.n_dropped == 2
+
+    # 저장 공간은 필요할 때 두 배씩 늘어나며 capacity를 넘지 않음
+    lazy = RingBuffer({"t": "d"}, capacity=100, initial_capacity=8)
+    assert lazy.n_allocated == 0
+    for i in range(9):
+        lazy.append(t=i)
+    assert lazy.n_allocated == 16 and lazy.column("t") == list(range(9))
+    for i in range(9, 250):
+        lazy.append(t=i)
+    assert lazy.n_allocated == 100 and lazy.column("t") == list(range(150, 250))
+
+    # 클라이언트 타임스탬프는 순서가 뒤섞일 수 있음
+    assert bucket_mean([10, 0, 20, 5, 30], [1, 2, 3, 4, 5], 3) == [(5.0, 3.0), (15.0, 1.0), (25.0, 4.0)]
+    assert lttb([3, 0, 2, 1, 4], [0, 1, 9, 0, 0], 3) == [(0, 1), (2, 9), (4, 0)]
+
+    xs = list(range(1000))
+    ys = [0.0] * 1000
+    ys[500] = 4.0
+    sampled = lttb(xs, ys, 20)
+    assert len(sampled) == 20 and sampled[0] == (0, 0.0) and sampled[-1] == (999, 0.0)
+    assert (500, 4.0) in sampled
+    assert len(bucket_mean(xs, ys, 10)) == 10
+
+
+def test_score_series_endpoint_and_final_report_counts():
+    conversation_manager = manager.get_conversation_manager()
+    conversation_manager.init_conversation("series-test")
+    c_m = conversation_manager.get_conversation_memory("series-test")
+    s_m = conversation_manager.get_conversation_scorer("series-test")
+    start = datetime(2025, 5, 1, 19, 0)
+    for i, sentiment in enumerate([4, 0, 3, 4, 1, 2]):
+        c_m.add_message(Message(
+            message_id=str(i), role="파트너" if i % 2 == 0 else "나", content="네",
+            timestamp=start + timedelta(seconds=10 * i),
+        ))
+        s_m.update(c_m, score.MessageSentimentScore(score=sentiment))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            return await client.get(
+                "/conversation/series-test/score-series",
+                params={"metric": "sentiment", "role": "파트너", "method": "raw"},
+            )
+
+    response = asyncio.run(run())
+    assert [value for _, value in response.json()["points"]] == [4, 3, 1]
+    assert response.json()["partner_reactions"] == {"positive": 1, "negative": 1}
+    assert "긍정적인 반응을 한 횟수: 1회" in ConversationScorerFinalSummarizer.do(s_m)
@@ -0,0 +1,48 @@
+# PYTHONPATH=. pytest -s tests/sentiment_debounce.py
+
+import re
+import asyncio
+
+import pytest
+
+from app.core import clients, config
+from app.services.elements import Message
+from app.services.session_services import memory, score
+from benchmarks.stub_llm import ScriptedAsyncOpenAI
+
+
+def test_burst_is_scored_in_one_batch(monkeypatch):
+    batch_sizes = []
+
+    def answer(model, messages, response_format):
+        # 분석할 메시지 수만큼 4점을 반환
+        n = len(re.findall(r"^\d+\. ", messages[-1]["content"], flags=re.MULTILINE))
+        batch_sizes.append(n)
+        return response_format(scores=[4] * n)
+
+    client = ScriptedAsyncOpenAI(answer)
+    monkeypatch.setattr(clients, "async_openai_client", client)
+    monkeypatch.setattr(config.settings, "LOCAL_SENTIMENT_ENABLED", False)
+    monkeypatch.setattr(config.settings, "SENTIMENT_DEBOUNCE_SECONDS", 0.05)
+
+    c_m = memory.ConversationMemory(my_info={}, partner_info={})
+    s_m = score.ConversationScorer()
+    burst = [("파트너", "오 진짜요?"), ("파트너", "저도 등산 좋아해요"), ("나", "다음에 같이 가요!")]
+
+    async def run():
+        pipelines = []
+        for i, (role, content) in enumerate(burst):
+            c_m.add_message(Message(message_id=str(i), role=role, content=content))
+            pipelines.append(asyncio.ensure_future(
+                score.update_conversation_scores_pipeline(conversation_scorer=s_m, conversation_memory=c_m)))
+            await asyncio.sleep(0.005)
+        await asyncio.gather(*pipelines)
+
+    asyncio.run(run())
+    assert batch_sizes == [3] * score.BatchSentimentalAnalyzer.N_CONSISTENCY
+    assert s_m.revision == 3
+    assert s_m.get_scores().partner_engagement == 4.0 and s_m.get_scores().user_engagement == 4.0
+    # 각 행의 발화 비율은 그 메시지까지의 메시지로 계산
+    lengths = [len(content) for _, content in burst]
+    assert s_m.series.column("user_talk_share") == pytest.approx([0.0, 0.0, lengths[2] / sum(lengths)], abs=1e-6)
+    assert not score.get_debouncer(s_m)._tasks
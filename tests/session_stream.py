@@ -0,0 +1,75 @@
+# PYTHONPATH=. pytest -s tests/session_stream.py
+
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.services import manager
+from app.services.elements import Message
+from app.services.session_services import memory, score, snapshot
+
+
+def _conversation(n_messages):
+    c_m = memory.ConversationMemory(partner_info={"name": "강유민"})
+    s_m = score.ConversationScorer()
+    for i in range(n_messages):
+        c_m.add_message(Message(message_id=str(i), role="파트너" if i % 2 else "나", content=f"메시지 {i}"))
+        s_m.update(c_m, score.MessageSentimentScore(score=i % 5))
+    c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+        should_update=True, category="생활습관", content="부산 출신",
+    ))
+    return c_m, s_m
+
+
+def test_export_import_round_trip():
+    c_m, s_m = _conversation(200)
+    conversation_manager = manager.get_conversation_manager()
+    conversation_manager.restore_conversation("stream-src", snapshot.encode_session(c_m, s_m))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            exported = (await client.get("/conversation/stream-src/export")).content
+
+            async def body(chunk_size):
+                for start in range(0, len(exported), chunk_size):
+                    yield exported[start:start + chunk_size]
+
+            imported = await client.post("/conversation/stream-dst/import", content=body(7))
+            truncated = await client.post("/conversation/stream-bad/import", content=exported[:len(exported) // 2])
+            header = exported.split(b"\n", 1)[0]
+            malformed = [
+                await client.post("/conversation/stream-bad/import", content=body)
+                for body in (b"[1, 2]\n", header + b'\n{"type": "series", "row": [0, 300, 1, 1, 1, 1]}\n')
+            ]
+            return exported, imported, truncated, malformed
+
+    exported, imported, truncated, malformed = asyncio.run(run())
+    assert exported.count(b"\n") == 1 + 200 + 2 + 200 + 1
+    assert imported.status_code == 201 and imported.json()["n_messages"] == 200
+    assert truncated.status_code == 422
+    assert [response.status_code for response in malformed] == [422, 422]
+
+    restored_memory = conversation_manager.get_conversation_memory("stream-dst")
+    restored_scorer = conversation_manager.get_conversation_scorer("stream-dst")
+    assert restored_memory.messages == c_m.messages
+    assert restored_memory.partner_memory == c_m.partner_memory
+    assert restored_scorer.get_scores() == s_m.get_scores()
+    assert restored_scorer.series.to_dict() == s_m.series.to_dict()
+    assert not conversation_manager.is_conversation_exists("stream-bad")
+
+
+def test_export_captures_state_when_called():
+    c_m, s_m = _conversation(3)
+    chunks = snapshot.iter_encode_session(c_m, s_m, chunk_bytes=16)
+    # StreamingResponse가 스레드 풀에서 소비하는 동안 이벤트 루프가 계속 상태를 바꾸는 상황
+    for i in range(3, 6):
+        c_m.add_message(Message(message_id=str(i), role="파트너", content=f"메시지 {i}"))
+        s_m.update(c_m, score.MessageSentimentScore(score=4))
+
+    decoder = snapshot.SessionStreamDecoder()
+    for line in b"".join(chunks).splitlines():
+        decoder.feed_line(line)
+    decoder.finish()
+    assert len(decoder.conversation_memory.messages) == 3
+    assert decoder.n_series == 3
@@ -0,0 +1,56 @@
+# PYTHONPATH=. pytest -s tests/snapshot.py
+
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.schemas.conversation import GetRealtimeAnalysisOutput, GetRealtimeMemoryOutput
+from app.services import manager
+from app.services.elements import Message
+from app.services.session_services import memory, score, snapshot
+
+
+def _conversation():
+    c_m = memory.ConversationMemory(partner_info={"name": "강유민"})
+    c_m.add_message(Message(message_id="0", role="나", content="안녕하세요."))
+    c_m.add_message(Message(message_id="1", role="파트너", content="안녕하세요. 저는 부산에서 왔어요."))
+    c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+        should_update=True, category="생활습관", content="부산 출신",
+    ))
+    s_m = score.ConversationScorer()
+    s_m.update(c_m, score.MessageSentimentScore(score=4))
+    return c_m, s_m
+
+
+def test_snapshot_round_trip():
+    c_m, s_m = _conversation()
+    restored_memory, restored_scorer = snapshot.decode_session(snapshot.encode_session(c_m, s_m))
+
+    assert restored_memory.messages == c_m.messages
+    assert restored_memory.start_time == c_m.start_time
+    assert restored_memory.partner_info == c_m.partner_info
+    assert restored_memory.partner_memory == c_m.partner_memory
+    assert restored_scorer.get_scores() == s_m.get_scores()
+
+
+def test_realtime_endpoints_match_response_models():
+    c_m, s_m = _conversation()
+    manager.get_conversation_manager().restore_conversation("snapshot-test", snapshot.encode_session(c_m, s_m))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            memory_response = await client.post("/conversation/snapshot-test/realtime-memory")
+            analysis_response = await client.get("/conversation/snapshot-test/realtime-analysis")
+            return memory_response.json(), analysis_response.json()
+
+    memory_json, analysis_json = asyncio.run(run())
+    assert GetRealtimeMemoryOutput.parse_obj(memory_json).partner_memory == c_m.partner_memory
+    assert GetRealtimeAnalysisOutput.parse_obj(analysis_json).scores == s_m.get_scores()
+
+    # 메모가 추가되면 캐시된 직렬화 결과가 갱신되어야 함
+    cached = c_m.partner_memory_json()
+    c_m.update_partner_memory(memory.PartnerMemoryUpdateInstruction(
+        should_update=True, category="고민", content="이직 고민 중",
+    ))
+    assert c_m.partner_memory_json() != cached
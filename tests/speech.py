@@ -0,0 +1,83 @@
+# PYTHONPATH=. pytest -s tests/speech.py
+
+import math
+import array
+import asyncio
+
+import httpx
+
+from app.core import cancellation, clients
+from app.main import app
+from app.services.session_services import speech
+from benchmarks.stub_llm import StubAsyncOpenAI
+
+SAMPLE_RATE = 16000
+
+
+def _stereo(parts):
+    """(채널, 초) 목록으로 채널별 440Hz 톤과 침묵(채널 None)을 이어 붙인 스테레오 PCM을 만듭니다."""
+    samples = array.array("h")
+    t = 0
+    for channel, seconds in parts:
+        for _ in range(int(seconds * SAMPLE_RATE)):
+            value = int(8000 * math.sin(2 * math.pi * 440 * t / SAMPLE_RATE)) if channel is not None else 0
+            noise = (t * 7919) % 61 - 30
+            samples.extend((value + noise, noise) if channel == 0 else (noise, value + noise))
+            t += 1
+    return samples.tobytes()
+
+
+AUDIO = _stereo([(None, 0.5), (0, 1.0), (None, 1.0), (1, 0.8), (0, 0.6), (None, 1.0)])
+
+
+def test_vad_segments_and_speaker_turns():
+    vad = speech.VoiceActivityDetector(SAMPLE_RATE, channels=2)
+    segments = []
+    for i in range(0, len(AUDIO), 3333):
+        segments += vad.feed(AUDIO[i:i + 3333])
+    segments += vad.flush()
+
+    assert [segment.speaker for segment in segments] == ["나", "파트너", "나"]
+    assert abs(segments[0].start_seconds - 0.5) < 0.25
+    assert abs(segments[0].duration - 1.0) < 0.3
+
+
+def test_audio_endpoint_adds_transcribed_messages(monkeypatch):
+    monkeypatch.setattr(clients, "async_openai_client", StubAsyncOpenAI(latency_scale=0.0, seed=0))
+    backend = speech.LocalSpeechToText(["안녕하세요.", "저는 부산에서 왔어요.", "반가워요!"])
+    monkeypatch.setattr(speech, "get_stt_backend", lambda: backend)
+    scopes = []
+    run_pipelines = cancellation.pipeline_tracker.run
+
+    async def tracked_run(scope, **kwargs):
+        scopes.append(scope)
+        return await run_pipelines(scope, **kwargs)
+
+    monkeypatch.setattr(cancellation.pipeline_tracker, "run", tracked_run)
+
+    async def body():
+        for i in range(0, len(AUDIO), 4096):
+            yield AUDIO[i:i + 4096]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            await client.post("/conversation/audio-test")
+            response = await client.post(
+                "/conversation/audio-test/audio",
+                params={"channels": 2, "sample_rate": SAMPLE_RATE},
+                content=body(),
+            )
+            mono = await client.post("/conversation/audio-test/audio", content=b"")
+            return response, mono
+
+    response, mono = asyncio.run(run())
+    assert response.status_code == 200
+    messages = response.json()["messages"]
+    assert [(m["role"], m["content"]) for m in messages] == [
+        ("나", "안녕하세요."), ("파트너", "저는 부산에서 왔어요."), ("나", "반가워요!"),
+    ]
+    # 클라이언트 메시지 ID와 겹치지 않는 ID를 쓰고, /messages와 같은 scope로 취소 가능한 파이프라인을 실행
+    assert len({m["message_id"] for m in messages}) == 3 and all(m["message_id"].startswith("audio-") for m in messages)
+    assert scopes == ["audio-test"] * 3
+    # 모노 입력은 화자를 지정해야 함
+    assert mono.status_code == 422